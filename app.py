@@ -4,7 +4,28 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+import functools
 import io
+import os
+
+from pennystock.backtest import PointInTimePanel, backtest, bucket_returns, sweep, weight_grid
+from pennystock.cube import SectorCube
+from pennystock.rankings import RankingBook
+from pennystock.data import create_comprehensive_data
+from pennystock.downsample import lttb
+from pennystock.export import EXPORT_FORMATS, ExportCache, export_formats, export_key, universe_chunks
+from pennystock.persistence import UserDataStore
+from pennystock.portfolio import PortfolioBook
+from pennystock.profiling import RenderProfiler
+from pennystock.quotes import QuoteRefresher, feed_from_source
+from pennystock.rules import SPEC_DIR, load_specs, score_profiles, spec_hash
+from pennystock.risk import RiskModel
+from pennystock.scoring import get_risk_profile
+from pennystock.screener import Screener
+from pennystock.similarity import SimilarityIndex
+from pennystock.simulation import simulate
+from pennystock.snapshot import load_snapshot, snapshot_version
+from pennystock.universe import build_universe, content_hash
 
 # Complete professional application
 st.set_page_config(
@@ -14,6 +35,28 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# RENDER PROFILING
+if 'profiler' not in st.session_state:
+    st.session_state.profiler = RenderProfiler(os.environ.get("PENNYSTOCK_PROFILE") == "1",
+                                               log_path=os.environ.get("PENNYSTOCK_PROFILE_LOG"),
+                                               memory=os.environ.get("PENNYSTOCK_PROFILE_MEMORY") == "1")
+    st.session_state.profiling = st.session_state.profiler.enabled
+profiler = st.session_state.profiler
+profiler.enable(st.session_state.profiling)
+profiler.begin()
+span = profiler.span
+
+def lazy_section(name):
+    """Render a section as a fragment: its widgets rerun only the section, which is timed"""
+    def decorate(render):
+        @st.fragment
+        @functools.wraps(render)
+        def section(*args, **kwargs):
+            with st.session_state.profiler.fragment(name, st.session_state.get('page')):
+                return render(*args, **kwargs)
+        return section
+    return decorate
+
 # Custom CSS for professional look
 st.markdown("""
 <style>
@@ -93,218 +136,377 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# COMPREHENSIVE DATA STRUCTURE
-def create_comprehensive_data():
-    sectors_data = {
-        'Capital Goods - Electrical Equipment': {
-            'companies': {
-                'Edvenswa Enter': {
-                    'prices': [15.31, 14.05, 26.00, 78.55, 44.90],
-                    'stats': {
-                        '2018-19': {'mean': 12.759, 'sd': 13.908, 'skewness': 1.235, 'kurtosis': 0.389},
-                        '2019-20': {'mean': 17.716, 'sd': 12.350, 'skewness': 1.033, 'kurtosis': -0.030},
-                        '2020-21': {'mean': 26.290, 'sd': 15.911, 'skewness': 1.228, 'kurtosis': 0.681},
-                        '2021-22': {'mean': 30.844, 'sd': 24.810, 'skewness': 0.833, 'kurtosis': -0.699},
-                        '2022-23': {'mean': 25.215, 'sd': 15.650, 'skewness': 0.239, 'kurtosis': -1.297}
-                    },
-                    'expected_return': 1.933,
-                    'beta': 1.2,
-                    'sharpe_ratio': 0.85,
-                    'market_cap': 450,
-                    'volume': 125000,
-                    'interpretation': "High growth potential with moderate risk. Strong bullish sentiment."
-                },
-                'Dhanashree Elect': {
-                    'prices': [16.00, 17.35, 17.60, 21.10, 23.50],
-                    'stats': {
-                        '2018-19': {'mean': 12.759, 'sd': 13.908, 'skewness': 1.235, 'kurtosis': 0.389},
-                        '2019-20': {'mean': 17.716, 'sd': 12.350, 'skewness': 1.033, 'kurtosis': -0.030},
-                        '2020-21': {'mean': 26.290, 'sd': 15.911, 'skewness': 1.228, 'kurtosis': 0.681},
-                        '2021-22': {'mean': 30.844, 'sd': 24.810, 'skewness': 0.833, 'kurtosis': -0.699},
-                        '2022-23': {'mean': 25.215, 'sd': 15.650, 'skewness': 0.239, 'kurtosis': -1.297}
-                    },
-                    'expected_return': 0.469,
-                    'beta': 0.8,
-                    'sharpe_ratio': 1.2,
-                    'market_cap': 320,
-                    'volume': 89000,
-                    'interpretation': "Stable growth stock with low volatility. Ideal for conservative investors."
-                }
-            }
-        },
-        'Cement': {
-            'companies': {
-                'Shiva Cement': {
-                    'prices': [13.60, 19.43, 35.10, 55.90, 46.93],
-                    'stats': {
-                        '2018-19': {'mean': 12.419, 'sd': 12.784, 'skewness': 1.205, 'kurtosis': 0.139},
-                        '2019-20': {'mean': 21.694, 'sd': 20.612, 'skewness': 1.281, 'kurtosis': 0.370},
-                        '2020-21': {'mean': 31.416, 'sd': 22.339, 'skewness': 0.819, 'kurtosis': -0.577},
-                        '2021-22': {'mean': 30.569, 'sd': 19.313, 'skewness': 0.522, 'kurtosis': -1.037},
-                        '2022-23': {'mean': 26.315, 'sd': 16.286, 'skewness': 0.600, 'kurtosis': -1.086}
-                    },
-                    'expected_return': 2.451,
-                    'beta': 1.5,
-                    'sharpe_ratio': 1.1,
-                    'market_cap': 1200,
-                    'volume': 450000,
-                    'interpretation': "Exceptional returns with moderate risk. Strong sector momentum."
-                }
-            }
-        },
-        'Chemicals': {
-            'companies': {
-                'Pentokey Organy': {
-                    'prices': [7.98, 5.61, 21.40, 21.00, 48.00],
-                    'stats': {
-                        '2018-19': {'mean': 25.399, 'sd': 26.923, 'skewness': 1.660, 'kurtosis': 1.853},
-                        '2019-20': {'mean': 32.509, 'sd': 44.583, 'skewness': 2.313, 'kurtosis': 4.388},
-                        '2020-21': {'mean': 48.465, 'sd': 53.592, 'skewness': 0.464, 'kurtosis': -1.784},
-                        '2021-22': {'mean': 31.896, 'sd': 25.853, 'skewness': 0.367, 'kurtosis': -1.392},
-                        '2022-23': {'mean': 22.503, 'sd': 19.720, 'skewness': 0.433, 'kurtosis': -1.719}
-                    },
-                    'expected_return': 5.015,
-                    'beta': 1.8,
-                    'sharpe_ratio': 1.4,
-                    'market_cap': 850,
-                    'volume': 320000,
-                    'interpretation': "Extreme growth stock with high volatility. For aggressive investors only."
-                }
-            }
-        },
-        'IT - Software': {
-            'companies': {
-                'Cressanda Solns': {
-                    'prices': [0.19, 0.27, 6.47, 26.75, 23.91],
-                    'stats': {
-                        '2018-19': {'mean': 11.006, 'sd': 14.517, 'skewness': 0.647, 'kurtosis': -1.112},
-                        '2019-20': {'mean': 17.818, 'sd': 19.053, 'skewness': 0.517, 'kurtosis': -1.475},
-                        '2020-21': {'mean': 62.194, 'sd': 42.936, 'skewness': 0.848, 'kurtosis': -0.783},
-                        '2021-22': {'mean': 32.249, 'sd': 20.749, 'skewness': 0.054, 'kurtosis': -1.627},
-                        '2022-23': {'mean': 27.544, 'sd': 15.520, 'skewness': 0.624, 'kurtosis': -1.171}
-                    },
-                    'expected_return': 124.842,
-                    'beta': 2.2,
-                    'sharpe_ratio': 2.8,
-                    'market_cap': 1500,
-                    'volume': 2800000,
-                    'interpretation': "Mega multi-bagger with extreme risk. Purely speculative investment."
-                }
-            }
-        },
-        'Pharmaceuticals': {
-            'companies': {
-                'Syschem (India)': {
-                    'prices': [6.43, 7.13, 16.51, 46.10, 47.84],
-                    'stats': {
-                        '2018-19': {'mean': 14.959, 'sd': 8.472, 'skewness': 0.176, 'kurtosis': -1.971},
-                        '2019-20': {'mean': 33.859, 'sd': 25.855, 'skewness': 0.469, 'kurtosis': -1.034},
-                        '2020-21': {'mean': 50.570, 'sd': 25.830, 'skewness': 0.239, 'kurtosis': -1.911},
-                        '2021-22': {'mean': 37.924, 'sd': 19.807, 'skewness': 0.647, 'kurtosis': -1.285},
-                        '2022-23': {'mean': 28.040, 'sd': 14.670, 'skewness': 0.239, 'kurtosis': -1.065}
-                    },
-                    'expected_return': 6.440,
-                    'beta': 1.4,
-                    'sharpe_ratio': 1.8,
-                    'market_cap': 920,
-                    'volume': 180000,
-                    'interpretation': "Strong growth with good risk-reward ratio. Sector tailwinds from healthcare."
-                }
-            }
+# PORTFOLIO TRACKING
+def initialize_portfolio(store, user):
+    if st.session_state.get('user') != user:
+        # New session or analyst switch: reload saved lots and watchlist
+        book = PortfolioBook(store)
+        book.add_lots(user_store.load_lots(user))
+        st.session_state.portfolio = book
+        saved = user_store.load_watchlist(user)
+        st.session_state.watchlist = {
+            company: {'company': company, 'sector': sector, 'date_added': date_added}
+            for company, sector, date_added in saved.itertuples(index=False)
         }
-    }
-    return sectors_data
+        st.session_state.user = user
+        st.session_state.quote_version = None
+    elif st.session_state.portfolio.version != store.version:
+        st.session_state.portfolio.bind(store)
+        st.session_state.quote_version = None
+    st.session_state.portfolio.attach_risk(load_risk_model(store.version, store))
+    if quotes is not None and st.session_state.get('quote_version') != quotes.version:
+        # Mark positions to the latest quotes
+        st.session_state.portfolio.mark(quotes.merged(np.round(store.table['current_price'].to_numpy(np.float64), 2)))
+        st.session_state.quote_version = quotes.version
 
-# PSR SCORING ALGORITHM
-def calculate_psr_score(company_data):
-    """Calculate Penny Stock Score (0-100)"""
-    
-    # Return Potential Score (RPS) - 50 points
-    expected_return = company_data['expected_return']
-    if expected_return <= 0:
-        rps = 0
-    else:
-        rps = min(50, (expected_return / 10.0) * 50)
-    
-    # Risk & Volatility Score (RVS) - 30 points
-    latest_sd = company_data['stats']['2022-23']['sd']
-    latest_mean = company_data['stats']['2022-23']['mean']
-    
-    if 'sharpe_ratio' in company_data:
-        sharpe = company_data['sharpe_ratio']
-        rvs = min(30, max(0, sharpe * 12))
-    else:
-        if latest_mean > 0:
-            cv = latest_sd / latest_mean
-            rvs = max(0, 30 - (cv * 8))
-        else:
-            rvs = 10
-    
-    # Beta adjustment
-    if 'beta' in company_data:
-        beta = company_data['beta']
-        beta_penalty = max(0, (beta - 1) * 4)
-        rvs = max(0, rvs - beta_penalty)
-    
-    # Stability & Distribution Score (SDS) - 20 points
-    latest_skewness = abs(company_data['stats']['2022-23']['skewness'])
-    latest_kurtosis = abs(company_data['stats']['2022-23']['kurtosis'])
-    
-    skewness_score = max(0, 10 - (latest_skewness * 3))
-    kurtosis_score = max(0, 10 - (latest_kurtosis * 2))
-    sds = skewness_score + kurtosis_score
-    
-    total_psr = rps + rvs + sds
-    
-    return {
-        'total_score': round(total_psr, 1),
-        'components': {
-            'rps': round(rps, 1),
-            'rvs': round(rvs, 1),
-            'sds': round(sds, 1)
-        }
-    }
+def live_prices(universe, rows=None):
+    """'Current Price' for `rows` of the store (default: universe's index), quoted where the feed has one"""
+    prices = universe['current_price']
+    if quotes is None:
+        return prices
+    live = quotes.prices[universe.index.to_numpy() if rows is None else rows]
+    return pd.Series(np.where(np.isnan(live), prices, live), index=universe.index)
 
-def get_risk_profile(psr_score):
-    """Determine risk profile based on PSR score"""
-    if psr_score >= 80:
-        return "High Growth, Low Risk", "✓", "risk-green", "Excellent investment"
-    elif psr_score >= 65:
-        return "Balanced Performer", "•", "risk-yellow", "Good risk-reward balance"
-    elif psr_score >= 50:
-        return "Speculative Opportunity", "▲", "risk-orange", "High risk, high reward"
-    elif psr_score >= 35:
-        return "High Risk, Caution", "⚠", "risk-red", "Very risky, experienced only"
-    else:
-        return "Avoid - Extreme Risk", "✗", "risk-black", "Not recommended"
+def add_to_portfolio(company, quantity, price):
+    sector = store.table['sector'].iat[store.row(company)]
+    lot_id = user_store.add_lot(st.session_state.user, company, sector, quantity, price)
+    st.session_state.portfolio.add(company, quantity, price, key=lot_id)
 
-# PORTFOLIO TRACKING
-def initialize_portfolio():
-    if 'portfolio' not in st.session_state:
-        st.session_state.portfolio = []
-    if 'watchlist' not in st.session_state:
-        st.session_state.watchlist = []
-
-def add_to_portfolio(company, sector, quantity, price):
-    st.session_state.portfolio.append({
-        'company': company,
-        'sector': sector,
-        'quantity': quantity,
-        'buy_price': price,
-        'date_added': datetime.now().strftime("%Y-%m-%d")
-    })
+def remove_from_portfolio(lot):
+    book = st.session_state.portfolio
+    user_store.close_lots(st.session_state.user, [book.key(lot)])
+    book.remove(lot)
 
 def add_to_watchlist(company, sector):
-    if company not in [item['company'] for item in st.session_state.watchlist]:
-        st.session_state.watchlist.append({
+    if company not in st.session_state.watchlist:
+        date_added = datetime.now().strftime("%Y-%m-%d")
+        user_store.add_to_watchlist(st.session_state.user, [(company, sector, date_added)])
+        st.session_state.watchlist[company] = {
             'company': company,
             'sector': sector,
-            'date_added': datetime.now().strftime("%Y-%m-%d")
-        })
+            'date_added': date_added
+        }
+
+# CHART RENDERING
+# Scatter traces switch to WebGL past this many points; longer lines are LTTB-reduced
+WEBGL_THRESHOLD = int(os.environ.get("PENNYSTOCK_WEBGL_THRESHOLD", 1000))
+MAX_LINE_POINTS = 2000
+
+RISK_COLORS = {
+    '✓ High Growth, Low Risk': 'green',
+    '• Balanced Performer': 'yellow',
+    '▲ Speculative Opportunity': 'orange',
+    '⚠ High Risk, Caution': 'red',
+    '✗ Avoid - Extreme Risk': 'black'
+}
+
+@st.cache_resource(max_entries=64)
+def load_figure(page, chart, filters, data_hash, _build):
+    """A built figure, one per page, chart, filter values and data version"""
+    return _build()
+
+def render_mode(n_points):
+    return 'webgl' if n_points > WEBGL_THRESHOLD else 'svg'
+
+def downsample(x, y, max_points=MAX_LINE_POINTS):
+    """Reduce a long series to max_points with LTTB; short series pass through"""
+    if len(y) <= max_points:
+        return x, y
+    keep = lttb(y, max_points)
+    return np.asarray(x)[keep], np.asarray(y)[keep]
+
+def risk_return_figure(df):
+    return px.scatter(df, x='Expected Return %', y='PSR Score',
+                     color='Risk Profile', size='Current Price',
+                     hover_data=['Company', 'Sector', 'Volatility'],
+                     title='Risk-Return Analysis',
+                     color_discrete_map=RISK_COLORS,
+                     render_mode=render_mode(len(df)))
+
+def sector_performance_figure(sector_perf):
+    fig = px.bar(sector_perf, x='Sector', y='PSR Score',
+                 color='Expected Return %',
+                 title='Sector Performance (PSR Scores)',
+                 hover_data=['Company', 'Median PSR'])
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+def component_radar_figure(components):
+    categories = ['Return Potential', 'Risk Management', 'Stability']
+    values = [components['rps']/50, components['rvs']/30, components['sds']/20]
+    fig = go.Figure()
+    fig.add_trace(go.Scatterpolar(
+        r=values + [values[0]],
+        theta=categories + [categories[0]],
+        fill='toself',
+        fillcolor='rgba(31, 119, 180, 0.6)',
+        line=dict(color='rgb(31, 119, 180)', width=2),
+        name='PSR Components'
+    ))
+    fig.update_layout(
+        polar=dict(radialaxis=dict(visible=True, range=[0, 1])),
+        showlegend=False,
+        title="PSR Component Analysis",
+        height=300
+    )
+    return fig
+
+def price_trend_figure(dates, prices, title='5-Year Price Trend', xaxis_title='Financial Year'):
+    dates, prices = downsample(dates, prices)
+    webgl = len(prices) > WEBGL_THRESHOLD
+    fig = go.Figure()
+    fig.add_trace((go.Scattergl if webgl else go.Scatter)(x=dates, y=prices,
+                                                          mode='lines' if webgl else 'lines+markers',
+                                                          name='Stock Price',
+                                                          line=dict(width=3)))
+    fig.update_layout(title=title,
+                      xaxis_title=xaxis_title,
+                      yaxis_title='Price (₹)')
+    return fig
+
+def sector_returns_figure(sector_df, sector):
+    fig = px.bar(sector_df, x='Company', y='Expected Return %',
+                 title=f'Returns in {sector} Sector',
+                 color='PSR Score')
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+def average_price_figure(years, means, sector):
+    years, means = downsample(years, means)
+    return px.line(x=years, y=means, title=f'{sector} - Average Price Trend',
+                   labels={'x': 'Year', 'y': 'Average Price (₹)'}, render_mode=render_mode(len(means)))
+
+def growth_figure(panel, result, top_n):
+    periods = [f"{start} → {end}" for start, end in zip(panel.years[:-1], panel.years[1:])]
+    equity_df = pd.DataFrame({
+        'Period': periods,
+        f'Top {top_n} PSR': result.equity[0],
+        'Equal-Weight Universe': np.cumprod(1 + result.benchmark)
+    })
+    return px.line(equity_df, x='Period', y=equity_df.columns[1:], markers=True,
+                   title='Growth of ₹1', labels={'value': 'Value (₹)', 'variable': ''})
+
+# MONTE CARLO CHARTS
+def simulation_histogram(result, title):
+    """Binned distribution of simulated returns (bins, not raw paths, go to the browser)"""
+    returns = result.portfolio_returns * 100
+    counts, edges = np.histogram(returns, bins=60, range=tuple(np.percentile(returns, [0.5, 99.5])))
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts / len(returns) * 100,
+                           marker_color=np.where(edges[:-1] < 0, 'crimson', 'seagreen')))
+    fig.update_layout(title=title, xaxis_title='1-Year Return %', yaxis_title='Probability %',
+                      bargap=0, showlegend=False)
+    return fig
+
+# EXPORTS
+SCREENER_EXPORT_COLUMNS = {
+    'company': 'Company',
+    'sector': 'Sector',
+    'psr_score': 'PSR Score',
+    'risk_profile': 'Risk Profile',
+    'expected_return': 'Expected Return %',
+    'current_price': 'Current Price',
+    'sd': 'Volatility',
+    'market_cap': 'Market Cap (Cr)',
+    'sharpe_ratio': 'Sharpe Ratio'
+}
+
+def screener_export_chunks(rows):
+    """Screening results in the page's columns, with its live prices, one chunk at a time"""
+    offset = 0
+    for chunk in universe_chunks(store, rows, columns=list(SCREENER_EXPORT_COLUMNS)):
+        chunk['current_price'] = live_prices(chunk, rows[offset:offset + len(chunk)]).to_numpy()
+        offset += len(chunk)
+        chunk['expected_return'] *= 100
+        chunk['market_cap'] = chunk['market_cap'].fillna(0)
+        yield chunk.rename(columns=SCREENER_EXPORT_COLUMNS)
+
+def export_download(label, key, fmt, chunks, file_stem, **options):
+    """Download button whose file is written (or taken from the export cache) only on click"""
+    cache = load_export_cache()
+    def artifact():
+        with open(cache.get(key, fmt, chunks, **options), 'rb') as handle:
+            return handle.read()
+    st.download_button(
+        label=label,
+        data=artifact,
+        file_name=f"{file_stem}.{fmt}",
+        mime=EXPORT_FORMATS[fmt],
+        on_click="ignore",
+        use_container_width=True
+    )
+
+# PAGE SECTIONS
+# Fragments: a widget inside one reruns just that section, not the page
+@lazy_section("scoring profiles")
+def scoring_profiles_section():
+    st.subheader("SCORING PROFILES")
+    specs = load_specs(os.environ.get("PENNYSTOCK_SPECS", SPEC_DIR))
+    chosen = st.multiselect("Profiles", list(specs), default=list(specs))
+    if chosen:
+        chosen_specs = [specs[name] for name in chosen]
+        profile_df = load_profile_scores(store.version, tuple(spec_hash(spec) for spec in chosen_specs),
+                                         store, chosen_specs).copy()
+        profile_df.insert(0, 'Company', store.table['company'].to_numpy())
+        st.dataframe(profile_df, use_container_width=True, hide_index=True)
+
+@lazy_section("portfolio risk")
+def portfolio_risk_section(book):
+    st.subheader("PORTFOLIO RISK")
+    confidence = st.slider("VaR Confidence %", 90, 99, 95) / 100
+    risk = book.risk.summary(confidence)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Annual Volatility", f"{risk['volatility']*100:.1f}%")
+        st.metric("Weighted Beta", f"{risk['weighted_beta']:.2f}")
+    with col2:
+        st.metric("Expected Return", f"{risk['expected_return']*100:.1f}%")
+    with col3:
+        st.metric("Parametric VaR", f"₹{risk['parametric_var']:,.0f}")
+        st.metric("Parametric CVaR", f"₹{risk['parametric_cvar']:,.0f}")
+    with col4:
+        st.metric("Historical VaR", f"₹{risk['historical_var']:,.0f}")
+        st.metric("Historical CVaR", f"₹{risk['historical_cvar']:,.0f}")
+    st.caption("One-year horizon; negative VaR means no loss is expected at this confidence.")
+    
+    contributions = book.risk.contributions()
+    risk_df = pd.DataFrame({
+        'Company': store.table['company'].to_numpy()[contributions.index],
+        'Market Value': book.value[contributions.index],
+        'Risk Contribution %': contributions.to_numpy() * 100
+    }).sort_values('Risk Contribution %', ascending=False)
+    st.dataframe(risk_df, use_container_width=True, hide_index=True)
+
+@lazy_section("portfolio simulation")
+def portfolio_simulation_section(book):
+    st.subheader("MONTE CARLO SIMULATION")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        n_paths = st.selectbox("Paths", [10_000, 50_000, 100_000])
+    with col2:
+        seed = st.number_input("Seed", 0, 1_000_000, 42)
+    with col3:
+        path_stats = st.checkbox("Track drawdown (slower)")
+    held = np.flatnonzero(book.value > 0)
+    with span("portfolio monte carlo", 'simulation'):
+        result = load_portfolio_simulation(store.version, tuple(held.tolist()), tuple(book.value[held].tolist()),
+                                           int(seed), n_paths, path_stats, store)
+    outcome = result.summary()
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Probability of Loss", f"{outcome['prob_loss']*100:.1f}%")
+    with col2:
+        st.metric("Mean 1Y Return", f"{outcome['mean_return']*100:.1f}%")
+    with col3:
+        st.metric("5% Worst Case", f"{outcome['p05_return']*100:.1f}%")
+    with col4:
+        if outcome['mean_max_drawdown'] is not None:
+            st.metric("Avg Max Drawdown", f"{outcome['mean_max_drawdown']*100:.1f}%")
+    with span("Simulated 1-Year Portfolio Returns", 'figure'):
+        st.plotly_chart(simulation_histogram(result, "Simulated 1-Year Portfolio Returns"),
+                        use_container_width=True)
+
+@lazy_section("weight sweep")
+def weight_sweep_section(panel, top_n):
+    st.subheader("COMPONENT WEIGHT SWEEP")
+    step = st.selectbox("Weight Grid Step", [0.5, 0.25])
+    if st.button("RUN SWEEP"):
+        with span("weight sweep", 'scoring'):
+            results = sweep(panel, weight_grid(step), top_n=top_n)
+        st.dataframe(results.head(20), use_container_width=True, hide_index=True)
+
+# SHARED DATA LAYER
+@st.cache_resource(max_entries=1)
+def load_source_data():
+    """Bundled sample data and its content hash, built once per process"""
+    source_data = create_comprehensive_data()
+    return content_hash(source_data), source_data
+
+@st.cache_resource(show_spinner="Loading stock universe...", max_entries=2)
+def load_universe(data_hash, _sectors_data):
+    """Build and score the universe once per process and data version"""
+    return build_universe(_sectors_data, version=data_hash)
+
+@st.cache_resource(show_spinner="Loading stock universe...", max_entries=2)
+def load_snapshot_universe(data_hash, path):
+    """Memory-map a universe snapshot once per process and data version"""
+    return load_snapshot(path)
+
+@st.cache_resource(max_entries=2)
+def load_screener(data_hash, _store):
+    """Screening index over the shared universe, one per data version"""
+    return Screener(_store)
+
+@st.cache_resource(max_entries=2)
+def load_risk_model(data_hash, _store):
+    """Return history and covariance factor, one per data version"""
+    return RiskModel(_store)
+
+@st.cache_resource(max_entries=4)
+def load_backtest_panel(data_hash, static, _store):
+    """Point-in-time scores and forward returns, one per data version"""
+    return PointInTimePanel(_store, static=static)
+
+@st.cache_resource(max_entries=256)
+def load_outlook(data_hash, company, _store):
+    """Seeded one-year Monte Carlo outlook of one company, once per data version"""
+    return simulate(_store, [_store.row(company)], paths=20_000, seed=0).summary()
+
+@st.cache_resource(max_entries=16)
+def load_portfolio_simulation(data_hash, rows, values, seed, paths, path_stats, _store):
+    """Seeded Monte Carlo of one set of holdings, once per data version"""
+    return simulate(_store, list(rows), values=np.array(values), paths=paths, seed=seed,
+                    path_stats=path_stats, chunk_paths=10_000)
+
+@st.cache_resource(max_entries=2)
+def load_sector_cube(data_hash, _store):
+    """Sector x year aggregates, built once per data version"""
+    return SectorCube(_store)
+
+@st.cache_resource(max_entries=2)
+def load_rankings(data_hash, _store):
+    """Top-K rankings and threshold alerts, built once per data version"""
+    return RankingBook(_store)
+
+@st.cache_resource(max_entries=2)
+def load_similarity_index(data_hash, _store):
+    """Each company's nearest peers by price history and yearly stats, built once per data version"""
+    return SimilarityIndex(_store)
+
+@st.cache_resource(max_entries=8)
+def load_profile_scores(data_hash, spec_hashes, _store, _specs):
+    """Universe scored under each scoring profile, one per data version and spec set"""
+    return score_profiles(_store.table, _specs)
+
+@st.cache_resource
+def load_export_cache():
+    """Export files on disk, shared by every session in the process"""
+    return ExportCache(os.environ.get("PENNYSTOCK_EXPORT_DIR"))
+
+@st.cache_resource(max_entries=1, on_release=lambda refresher: refresher.stop())
+def load_quote_refresher(data_hash, source, _store):
+    """Background quote refresher over the universe, one per data version and feed"""
+    interval = float(os.environ.get("PENNYSTOCK_QUOTE_INTERVAL", 60))
+    return QuoteRefresher(_store, feed_from_source(source), interval=interval).start()
+
+@st.cache_resource
+def load_user_store(path):
+    """One connection pool to the portfolio database per process"""
+    return UserDataStore(path)
 
 # Load data and initialize
-sectors_data = create_comprehensive_data()
-initialize_portfolio()
+snapshot_path = os.environ.get("PENNYSTOCK_SNAPSHOT")
+with span("load universe", 'data'):
+    if snapshot_path:
+        store = load_snapshot_universe(snapshot_version(snapshot_path), snapshot_path)
+    else:
+        store = load_universe(*load_source_data())
+    sectors_data = store.sectors_view()
+user_store = load_user_store(os.environ.get("PENNYSTOCK_DB", "pennystock.db"))
+
+# Live quotes: one snapshot reference per rerun, swapped in by the refresher thread
+quote_source = os.environ.get("PENNYSTOCK_QUOTES")
+quotes = load_quote_refresher(store.version, quote_source, store).snapshot if quote_source else None
 
 # SIDEBAR - MAIN NAVIGATION
 st.sidebar.title("PENNYSTOCK ANALYSIS BY CMA.VIPIN MISHRA")
@@ -316,9 +518,17 @@ app_mode = st.sidebar.selectbox("Navigation", [
     "ADVANCED STOCK SCREENER",
     "PORTFOLIO MANAGER",
     "SECTOR ANALYSIS",
+    "PSR BACKTEST",
     "QUICK INSIGHTS"
 ])
 
+st.session_state.page = app_mode
+profiler.set_page(app_mode)
+
+analyst_id = st.sidebar.text_input("Analyst ID", value="default").strip() or "default"
+with span("load portfolio", 'data'):
+    initialize_portfolio(store, analyst_id)
+
 st.sidebar.markdown("---")
 st.sidebar.info("""
 **Professional Features:**
@@ -328,6 +538,10 @@ st.sidebar.info("""
 - Sector Analysis
 - Export Capabilities
 """)
+if quotes is not None:
+    as_of = datetime.fromtimestamp(quotes.as_of).strftime('%H:%M:%S') if quotes.as_of else "pending"
+    st.sidebar.caption(f"LIVE QUOTES: {quotes.quoted:,}/{len(store):,} companies, as of {as_of}")
+st.sidebar.checkbox("Render profiling", key='profiling')
 
 # Add creator info to sidebar
 st.sidebar.markdown("---")
@@ -344,25 +558,20 @@ st.sidebar.markdown("""
 if app_mode == "DASHBOARD OVERVIEW":
     st.header("EXECUTIVE DASHBOARD")
     
-    # Calculate all scores
-    all_companies_data = []
-    for sector_name, sector_data in sectors_data.items():
-        for company_name, company_data in sector_data['companies'].items():
-            psr_score = calculate_psr_score(company_data)
-            risk_profile, symbol, _, _ = get_risk_profile(psr_score['total_score'])
-            
-            all_companies_data.append({
-                'Company': company_name,
-                'Sector': sector_name,
-                'PSR Score': psr_score['total_score'],
-                'Risk Profile': f"{symbol} {risk_profile}",
-                'Expected Return %': company_data['expected_return'] * 100,
-                'Current Price': company_data['prices'][-1],
-                'Volatility': company_data['stats']['2022-23']['sd'],
-                'Market Cap (Cr)': company_data.get('market_cap', 'N/A')
-            })
+    # Scores come precomputed from the shared data layer
+    universe = store.table
     
-    df = pd.DataFrame(all_companies_data)
+    with span("dashboard frame", 'frame'):
+        df = pd.DataFrame({
+            'Company': universe['company'],
+            'Sector': universe['sector'],
+            'PSR Score': universe['psr_score'],
+            'Risk Profile': universe['risk_profile'],
+            'Expected Return %': universe['expected_return'] * 100,
+            'Current Price': live_prices(universe),
+            'Volatility': universe['sd'],
+            'Market Cap (Cr)': universe['market_cap'].fillna('N/A')
+        })
     
     # KPI Metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -381,7 +590,8 @@ if app_mode == "DASHBOARD OVERVIEW":
     
     # Top Performers
     st.subheader("TOP RATED STOCKS")
-    top_stocks = df.nlargest(5, 'PSR Score')
+    with span("top rated", 'scoring'):
+        top_stocks = df.iloc[load_rankings(store.version, store).top('top_rated', 5)]
     
     for _, stock in top_stocks.iterrows():
         risk_class = "risk-green" if stock['PSR Score'] >= 80 else "risk-yellow"
@@ -397,32 +607,29 @@ if app_mode == "DASHBOARD OVERVIEW":
     # Visualizations
     col1, col2 = st.columns(2)
     with col1:
-        fig = px.scatter(df, x='Expected Return %', y='PSR Score',
-                        color='Risk Profile', size='Current Price',
-                        hover_data=['Company', 'Sector', 'Volatility'],
-                        title='Risk-Return Analysis',
-                        color_discrete_map={
-                            '✓ High Growth, Low Risk': 'green',
-                            '• Balanced Performer': 'yellow', 
-                            '▲ Speculative Opportunity': 'orange',
-                            '⚠ High Risk, Caution': 'red',
-                            '✗ Avoid - Extreme Risk': 'black'
-                        })
-        st.plotly_chart(fig, use_container_width=True)
+        with span("Risk-Return Analysis", 'figure'):
+            fig = load_figure(app_mode, 'risk-return', (quotes and quotes.version,), store.version,
+                              lambda: risk_return_figure(df))
+            st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        sector_perf = df.groupby('Sector').agg({
-            'PSR Score': 'mean',
-            'Expected Return %': 'mean',
-            'Company': 'count'
-        }).reset_index()
+        with span("sector frame", 'frame'):
+            cube = load_sector_cube(store.version, store).sector_frame().sort_values('sector')
+            sector_perf = pd.DataFrame({
+                'Sector': cube['sector'],
+                'PSR Score': cube['mean_psr_score'],
+                'Median PSR': cube['median_psr_score'],
+                'Expected Return %': cube['mean_expected_return'] * 100,
+                'Company': cube['companies']
+            })
         
-        fig2 = px.bar(sector_perf, x='Sector', y='PSR Score',
-                     color='Expected Return %',
-                     title='Sector Performance (PSR Scores)',
-                     hover_data=['Company'])
-        fig2.update_layout(xaxis_tickangle=-45)
-        st.plotly_chart(fig2, use_container_width=True)
+        with span("Sector Performance (PSR Scores)", 'figure'):
+            fig2 = load_figure(app_mode, 'sector-performance', (), store.version,
+                               lambda: sector_performance_figure(sector_perf))
+            st.plotly_chart(fig2, use_container_width=True)
+    
+    # Scoring profiles side by side
+    scoring_profiles_section()
 
 elif app_mode == "PSR SCORING ANALYSIS":
     st.header("INTELLIGENT STOCK ANALYSIS")
@@ -435,8 +642,15 @@ elif app_mode == "PSR SCORING ANALYSIS":
         company = st.selectbox("Select Company", companies)
         
         if company:
-            company_data = sectors_data[sector]['companies'][company]
-            psr_score = calculate_psr_score(company_data)
+            company_data = store.company(company)
+            current_price = company_data['prices'][-1]
+            if quotes is not None and not np.isnan(quotes.prices[store.row(company)]):
+                current_price = quotes.prices[store.row(company)]
+            record = store.table.iloc[store.row(company)]
+            psr_score = {
+                'total_score': record['psr_score'],
+                'components': {key: record[key] for key in ('rps', 'rvs', 'sds')}
+            }
             risk_profile, symbol, risk_class, risk_desc = get_risk_profile(psr_score['total_score'])
             
             # PSR Score Card
@@ -453,7 +667,7 @@ elif app_mode == "PSR SCORING ANALYSIS":
             col1a, col1b = st.columns(2)
             with col1a:
                 if st.button("ADD TO PORTFOLIO", use_container_width=True):
-                    add_to_portfolio(company, sector, 100, company_data['prices'][-1])
+                    add_to_portfolio(company, 100, current_price)
                     st.success(f"Added {company} to portfolio!")
             with col1b:
                 if st.button("ADD TO WATCHLIST", use_container_width=True):
@@ -462,46 +676,24 @@ elif app_mode == "PSR SCORING ANALYSIS":
             
             # Quick Stats
             st.subheader("KEY METRICS")
-            st.metric("Current Price", f"₹{company_data['prices'][-1]:.2f}")
+            st.metric("Current Price", f"₹{current_price:.2f}")
             st.metric("Expected Return", f"{company_data['expected_return']*100:.1f}%")
-            st.metric("Volatility (SD)", f"₹{company_data['stats']['2022-23']['sd']:.2f}")
+            st.metric("Volatility (SD)", f"₹{record['sd']:.2f}")
             st.metric("Market Cap", f"₹{company_data.get('market_cap', 'N/A')} Cr")
     
     with col2:
         if company:
             # Radar Chart
-            components = psr_score['components']
-            categories = ['Return Potential', 'Risk Management', 'Stability']
-            values = [components['rps']/50, components['rvs']/30, components['sds']/20]
-            
-            fig = go.Figure()
-            fig.add_trace(go.Scatterpolar(
-                r=values + [values[0]],
-                theta=categories + [categories[0]],
-                fill='toself',
-                fillcolor='rgba(31, 119, 180, 0.6)',
-                line=dict(color='rgb(31, 119, 180)', width=2),
-                name='PSR Components'
-            ))
-            fig.update_layout(
-                polar=dict(radialaxis=dict(visible=True, range=[0, 1])),
-                showlegend=False,
-                title="PSR Component Analysis",
-                height=300
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            with span("PSR Component Analysis", 'figure'):
+                fig = load_figure(app_mode, 'components', (company,), store.version,
+                                  lambda: component_radar_figure(psr_score['components']))
+                st.plotly_chart(fig, use_container_width=True)
             
             # Price Performance
-            years = ['2018-19', '2019-20', '2020-21', '2021-22', '2022-23']
-            fig2 = go.Figure()
-            fig2.add_trace(go.Scatter(x=years, y=company_data['prices'],
-                                    mode='lines+markers',
-                                    name='Stock Price',
-                                    line=dict(width=3)))
-            fig2.update_layout(title='5-Year Price Trend',
-                             xaxis_title='Financial Year',
-                             yaxis_title='Price (₹)')
-            st.plotly_chart(fig2, use_container_width=True)
+            with span("5-Year Price Trend", 'figure'):
+                fig2 = load_figure(app_mode, 'price-trend', (company,), store.version,
+                                   lambda: price_trend_figure(store.years, company_data['prices']))
+                st.plotly_chart(fig2, use_container_width=True)
             
             # Detailed Analysis
             st.subheader("DETAILED ANALYSIS")
@@ -513,6 +705,32 @@ elif app_mode == "PSR SCORING ANALYSIS":
                 <strong>Sharpe Ratio:</strong> {company_data.get('sharpe_ratio', 'N/A')}</p>
             </div>
             """, unsafe_allow_html=True)
+            
+            # Monte Carlo outlook, seeded so the chart is stable across reruns
+            st.subheader("MONTE CARLO OUTLOOK")
+            with span("monte carlo outlook", 'simulation'):
+                outlook = load_outlook(store.version, company, store)
+            col2a, col2b, col2c = st.columns(3)
+            with col2a:
+                st.metric("Probability of Loss", f"{outlook['prob_loss']*100:.1f}%")
+            with col2b:
+                st.metric("Median 1Y Return", f"{outlook['median_return']*100:.1f}%")
+            with col2c:
+                st.metric("5th-95th Percentile",
+                          f"{outlook['p05_return']*100:.0f}% to {outlook['p95_return']*100:.0f}%")
+            
+            # Similar Stocks, by return history and yearly stats rather than sector label
+            st.subheader("SIMILAR STOCKS")
+            with span("similar stocks", 'frame'):
+                peers = load_similarity_index(store.version, store).similar_frame(company, k=10)
+                similar_df = pd.DataFrame({
+                    'Company': peers['company'],
+                    'Sector': peers['sector'],
+                    'Similarity': peers['similarity'].round(3),
+                    'PSR Score': peers['psr_score'],
+                    'Expected Return %': peers['expected_return'] * 100
+                })
+            st.dataframe(similar_df, use_container_width=True, hide_index=True)
 
 elif app_mode == "ADVANCED STOCK SCREENER":
     st.header("ADVANCED STOCK SCREENING")
@@ -533,47 +751,43 @@ elif app_mode == "ADVANCED STOCK SCREENER":
     # Screening Results
     st.subheader("SCREENING RESULTS")
     
-    results = []
-    for sector in sector_filter:
-        for company, data in sectors_data[sector]['companies'].items():
-            psr_score = calculate_psr_score(data)
-            latest_sd = data['stats']['2022-23']['sd']
-            market_cap = data.get('market_cap', 0)
-            
-            if (psr_score['total_score'] >= min_psr and 
-                data['expected_return'] >= min_return/100 and 
-                latest_sd <= max_volatility and
-                market_cap >= market_cap_min):
-                
-                risk_cat, symbol, _, _ = get_risk_profile(psr_score['total_score'])
-                
-                if risk_filter == "All" or risk_cat.startswith(risk_filter):
-                    results.append({
-                        'Company': company,
-                        'Sector': sector,
-                        'PSR Score': psr_score['total_score'],
-                        'Risk Profile': f"{symbol} {risk_cat}",
-                        'Expected Return %': data['expected_return'] * 100,
-                        'Current Price': data['prices'][-1],
-                        'Volatility': latest_sd,
-                        'Market Cap (Cr)': market_cap,
-                        'Sharpe Ratio': data.get('sharpe_ratio', 'N/A')
-                    })
-    
-    if results:
-        results_df = pd.DataFrame(results)
+    with span("screen", 'scoring'):
+        rows = load_screener(store.version, store).query(
+            min_psr=min_psr, min_return=min_return/100, max_volatility=max_volatility,
+            market_cap_min=market_cap_min, sectors=sector_filter, risk_filter=risk_filter)
+    
+    if len(rows):
+        with span("screening results frame", 'frame'):
+            universe = store.table.iloc[rows]
+            results_df = pd.DataFrame({
+                'Company': universe['company'],
+                'Sector': universe['sector'],
+                'PSR Score': universe['psr_score'],
+                'Risk Profile': universe['risk_profile'],
+                'Expected Return %': universe['expected_return'] * 100,
+                'Current Price': live_prices(universe),
+                'Volatility': universe['sd'],
+                'Market Cap (Cr)': universe['market_cap'].fillna(0),
+                'Sharpe Ratio': universe['sharpe_ratio'].astype(object).where(universe['sharpe_ratio'].notna(), 'N/A')
+            }).reset_index(drop=True)
         st.dataframe(results_df.sort_values('PSR Score', ascending=False), 
                     use_container_width=True)
         
-        # Export Results
-        csv = results_df.to_csv(index=False)
-        st.download_button(
-            label="EXPORT RESULTS AS CSV",
-            data=csv,
-            file_name=f"stock_screening_results_{datetime.now().strftime('%Y%m%d')}.csv",
-            mime="text/csv",
-            use_container_width=True
-        )
+        # Export Results, streamed to disk only when a download is clicked
+        export_format = st.selectbox("Export Format", export_formats(), format_func=str.upper)
+        filters = (min_psr, min_return, max_volatility, market_cap_min, tuple(sector_filter), risk_filter)
+        today = datetime.now().strftime('%Y%m%d')
+        col1, col2 = st.columns(2)
+        with col1:
+            export_download(f"EXPORT RESULTS AS {export_format.upper()}",
+                            export_key(store.version, quotes and quotes.version, 'screener', filters,
+                                       export_format), export_format,
+                            lambda: screener_export_chunks(rows), f"stock_screening_results_{today}",
+                            **({'na_rep': 'N/A'} if export_format == 'csv' else {}))
+        with col2:
+            export_download("EXPORT FULL UNIVERSE WITH YEARLY STATS",
+                            export_key(store.version, 'universe', export_format), export_format,
+                            lambda: universe_chunks(store, per_year=True), f"pennystock_universe_{today}")
     else:
         st.warning("No stocks match your criteria. Try adjusting filters.")
 
@@ -582,41 +796,54 @@ elif app_mode == "PORTFOLIO MANAGER":
     
     col1, col2 = st.columns(2)
     
+    book = st.session_state.portfolio
+    
     with col1:
         st.subheader("YOUR PORTFOLIO")
-        if st.session_state.portfolio:
-            portfolio_df = pd.DataFrame(st.session_state.portfolio)
-            st.dataframe(portfolio_df, use_container_width=True)
+        if len(book):
+            with span("lots frame", 'frame'):
+                portfolio_df = book.lots_frame()
+            st.dataframe(portfolio_df, use_container_width=True, hide_index=True)
             
             # Portfolio Analytics
-            total_investment = sum(item['quantity'] * item['buy_price'] for item in st.session_state.portfolio)
-            st.metric("Total Investment", f"₹{total_investment:,.2f}")
+            st.metric("Total Investment", f"₹{book.total_cost:,.2f}")
+            st.metric("Market Value", f"₹{book.market_value:,.2f}",
+                      delta=f"₹{book.unrealized_pnl:,.2f} unrealized")
+            
+            lot_names = dict(zip(portfolio_df['lot'], portfolio_df['company']))
+            lot = st.selectbox("Select lot to close", list(lot_names),
+                               format_func=lambda lot: f"#{lot} {lot_names[lot]}")
+            if st.button("REMOVE LOT", use_container_width=True):
+                remove_from_portfolio(lot)
+                st.rerun()
         else:
             st.info("Your portfolio is empty. Add stocks from the PSR Analysis page.")
     
     with col2:
         st.subheader("WATCHLIST")
         if st.session_state.watchlist:
-            watchlist_df = pd.DataFrame(st.session_state.watchlist)
+            watchlist_df = pd.DataFrame(list(st.session_state.watchlist.values()))
             st.dataframe(watchlist_df, use_container_width=True)
         else:
             st.info("Your watchlist is empty. Add stocks to track them.")
     
     # Portfolio Analytics
-    if st.session_state.portfolio:
+    if len(book):
         st.subheader("PORTFOLIO ANALYTICS")
         
-        # Sector Distribution
-        sector_dist = {}
-        for item in st.session_state.portfolio:
-            sector = item['sector']
-            value = item['quantity'] * item['buy_price']
-            sector_dist[sector] = sector_dist.get(sector, 0) + value
+        # Sector Distribution, at market value
+        with span("Portfolio Sector Distribution", 'figure'):
+            sector_dist = book.sector_exposure()
+            if len(sector_dist):
+                fig = px.pie(values=sector_dist.to_numpy(), names=sector_dist.index,
+                            title="Portfolio Sector Distribution")
+                st.plotly_chart(fig, use_container_width=True)
         
-        if sector_dist:
-            fig = px.pie(values=list(sector_dist.values()), names=list(sector_dist.keys()),
-                        title="Portfolio Sector Distribution")
-            st.plotly_chart(fig, use_container_width=True)
+        # Risk, from the yearly price history
+        portfolio_risk_section(book)
+        
+        # Monte Carlo simulation of the whole book
+        portfolio_simulation_section(book)
 
 elif app_mode == "SECTOR ANALYSIS":
     st.header("COMPREHENSIVE SECTOR ANALYSIS")
@@ -624,76 +851,111 @@ elif app_mode == "SECTOR ANALYSIS":
     selected_sector = st.selectbox("Choose Sector for Deep Analysis", list(sectors_data.keys()))
     
     if selected_sector:
-        sector_data = sectors_data[selected_sector]
-        
         # Sector Overview
         st.subheader(f"SECTOR OVERVIEW: {selected_sector}")
         
-        companies_data = []
-        for company_name, company_data in sector_data['companies'].items():
-            psr_score = calculate_psr_score(company_data)
-            companies_data.append({
-                'Company': company_name,
-                'Expected Return %': company_data['expected_return'] * 100,
-                'PSR Score': psr_score['total_score'],
-                'Current Price': company_data['prices'][-1],
-                'Volatility': company_data['stats']['2022-23']['sd'],
-                'Market Cap': company_data.get('market_cap', 'N/A')
+        with span("sector frame", 'frame'):
+            universe = store.sector_table(selected_sector)
+            sector_df = pd.DataFrame({
+                'Company': universe['company'],
+                'Expected Return %': universe['expected_return'] * 100,
+                'PSR Score': universe['psr_score'],
+                'Current Price': live_prices(universe, store.sector_rows(selected_sector)),
+                'Volatility': universe['sd'],
+                'Market Cap': universe['market_cap'].fillna('N/A')
             })
         
-        sector_df = pd.DataFrame(companies_data)
-        
         col1, col2 = st.columns(2)
         
         with col1:
             st.dataframe(sector_df, use_container_width=True)
         
         with col2:
-            fig = px.bar(sector_df, x='Company', y='Expected Return %',
-                        title=f'Returns in {selected_sector} Sector',
-                        color='PSR Score')
-            fig.update_layout(xaxis_tickangle=-45)
-            st.plotly_chart(fig, use_container_width=True)
+            with span("Sector Returns", 'figure'):
+                fig = load_figure(app_mode, 'sector-returns', (selected_sector,), store.version,
+                                  lambda: sector_returns_figure(sector_df, selected_sector))
+                st.plotly_chart(fig, use_container_width=True)
         
         # Sector Performance Trends
         st.subheader("SECTOR PERFORMANCE TRENDS")
         
         # Calculate sector averages over years
-        years = ['2018-19', '2019-20', '2020-21', '2021-22', '2022-23']
-        sector_means = []
-        
-        for year in years:
-            year_means = [company_data['stats'][year]['mean'] for company_data in sector_data['companies'].values()]
-            sector_means.append(np.mean(year_means))
-        
-        fig = px.line(x=years, y=sector_means, title=f'{selected_sector} - Average Price Trend',
-                     labels={'x': 'Year', 'y': 'Average Price (₹)'})
-        st.plotly_chart(fig, use_container_width=True)
+        with span("Average Price Trend", 'figure'):
+            sector_means = load_sector_cube(store.version, store).trend(selected_sector, 'mean').to_numpy()
+            fig = load_figure(app_mode, 'average-price', (selected_sector,), store.version,
+                              lambda: average_price_figure(store.years, sector_means, selected_sector))
+            st.plotly_chart(fig, use_container_width=True)
+
+elif app_mode == "PSR BACKTEST":
+    st.header("PSR BACKTEST")
+    
+    if len(store.years) < 2:
+        st.info(f"Backtesting needs at least two financial years of prices; this universe has "
+                f"{len(store.years)}. Load a longer history to rebalance year to year.")
+    else:
+        col1, col2 = st.columns(2)
+        with col1:
+            if len(store) > 1:
+                top_n = st.slider("Hold Top N by PSR", 1, len(store), min(10, max(1, len(store) // 3)))
+            else:
+                # A slider needs min < max; a one-company universe can only hold that company
+                top_n = 1
+                st.caption("Holding the only company in the universe")
+        with col2:
+            static = st.checkbox("Use today's Sharpe Ratio and Beta (look-ahead)")
+    
+        with span("backtest", 'scoring'):
+            panel = load_backtest_panel(store.version, static, store)
+            result = backtest(panel, top_n=top_n)
+            summary = result.summary().iloc[0]
+    
+        col1, col2, col3, col4 = st.columns(4)
+        with col1:
+            st.metric("CAGR", f"{summary['cagr']*100:.1f}%", delta=f"{summary['excess_cagr']*100:.1f}% vs universe")
+        with col2:
+            st.metric("Total Return", f"{summary['total_return']*100:.1f}%")
+        with col3:
+            st.metric("Max Drawdown", f"{summary['max_drawdown']*100:.1f}%")
+        with col4:
+            st.metric("Avg Turnover", f"{summary['avg_turnover']*100:.0f}%")
+    
+        # Equity curves, starting from 1 at the first rebalance
+        with span("Growth of ₹1", 'figure'):
+            fig = load_figure(app_mode, 'growth', (top_n, static), store.version,
+                              lambda: growth_figure(panel, result, top_n))
+            st.plotly_chart(fig, use_container_width=True)
+    
+        st.subheader("RISK PROFILE BUCKETS")
+        with span("risk profile buckets", 'frame'):
+            buckets = bucket_returns(panel)
+            buckets['mean_forward_return'] *= 100
+        st.dataframe(buckets.rename(columns={'year': 'Scored At', 'profile': 'Risk Profile', 'companies': 'Companies',
+                                             'mean_forward_return': 'Next-Year Return %'}),
+                     use_container_width=True, hide_index=True)
+    
+        weight_sweep_section(panel, top_n)
 
 elif app_mode == "QUICK INSIGHTS":
     st.header("QUICK INSIGHTS & ALERTS")
     
     # Generate insights
-    all_companies = []
-    for sector_name, sector_data in sectors_data.items():
-        for company_name, company_data in sector_data['companies'].items():
-            psr_score = calculate_psr_score(company_data)
-            all_companies.append({
-                'Company': company_name,
-                'Sector': sector_name,
-                'PSR Score': psr_score['total_score'],
-                'Expected Return %': company_data['expected_return'] * 100,
-                'Volatility': company_data['stats']['2022-23']['sd']
-            })
-    
-    insights_df = pd.DataFrame(all_companies)
+    universe = store.table
+    with span("insights frame", 'frame'):
+        insights_df = pd.DataFrame({
+            'Company': universe['company'],
+            'Sector': universe['sector'],
+            'PSR Score': universe['psr_score'],
+            'Expected Return %': universe['expected_return'] * 100,
+            'Volatility': universe['sd']
+        })
     
     # Top Insights
+    rankings = load_rankings(store.version, store)
     col1, col2, col3 = st.columns(3)
     
     with col1:
         st.subheader("TOP OPPORTUNITIES")
-        top_opportunities = insights_df.nlargest(3, 'Expected Return %')
+        top_opportunities = insights_df.iloc[rankings.top('top_opportunities', 3)]
         for _, opp in top_opportunities.iterrows():
             st.markdown(f"""
             <div class="feature-card">
@@ -705,7 +967,7 @@ elif app_mode == "QUICK INSIGHTS":
     
     with col2:
         st.subheader("SAFEST BETS")
-        safe_bets = insights_df[insights_df['PSR Score'] >= 75].nlargest(3, 'PSR Score')
+        safe_bets = insights_df.iloc[rankings.top('safest', 3)]
         for _, safe in safe_bets.iterrows():
             st.markdown(f"""
             <div class="feature-card">
@@ -717,7 +979,7 @@ elif app_mode == "QUICK INSIGHTS":
     
     with col3:
         st.subheader("HIGH RISK ALERTS")
-        high_risk = insights_df[insights_df['PSR Score'] < 40].nsmallest(3, 'PSR Score')
+        high_risk = insights_df.iloc[rankings.top('high_risk', 3)]
         for _, risk in high_risk.iterrows():
             st.markdown(f"""
             <div class="feature-card">
@@ -727,6 +989,10 @@ elif app_mode == "QUICK INSIGHTS":
             </div>
             """, unsafe_allow_html=True)
 
+    if rankings.recent:
+        st.subheader("RECENT ALERTS")
+        st.dataframe(pd.DataFrame(list(rankings.recent)[::-1]), use_container_width=True, hide_index=True)
+
 # FOOTER
 st.markdown("---")
 st.markdown("""
@@ -741,3 +1007,18 @@ st.markdown("""
     <p>Specialized in Penny Stock Analysis, Portfolio Management, and Financial Advisory Services</p>
 </div>
 """, unsafe_allow_html=True)
+
+# RENDER PROFILE PANEL
+profiler.finish()
+if profiler.enabled:
+    with st.sidebar.expander("RENDER PROFILE", expanded=True):
+        last_run = profiler.frame(runs=1)
+        st.caption(f"Last run: {last_run['seconds'].where(last_run['depth'] == 0).sum():.3f}s in top-level spans")
+        st.dataframe(last_run[['name', 'kind', 'seconds', 'alloc_kb', 'peak_kb']], hide_index=True)
+        if not profiler.memory:
+            st.caption("Memory columns need PENNYSTOCK_PROFILE_MEMORY=1 at server start")
+        st.caption("All runs this session")
+        st.dataframe(profiler.summary(), hide_index=True)
+        st.download_button("DOWNLOAD PROFILE JSON", profiler.to_json(),
+                           file_name=f"render_profile_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+                           mime="application/json")
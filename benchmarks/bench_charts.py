@@ -0,0 +1,54 @@
+"""Chart payloads: SVG vs WebGL scatter, and raw vs LTTB-reduced price lines.
+
+WebGL does not shrink the payload; it keeps the browser responsive once
+the points are there.  LTTB is what bounds the size of long series.
+
+Run from the repo root:  python benchmarks/bench_charts.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pennystock.downsample import lttb
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+MAX_LINE_POINTS = 2000
+
+def payload(build):
+    start = time.perf_counter()
+    spec = pio.to_json(build(), validate=False)
+    return time.perf_counter() - start, len(spec)
+
+def main():
+    print(f"{'chart':>22} {'points':>10} {'seconds':>8} {'payload KB':>11}")
+    for n in (2_000, 20_000):
+        table = build_universe(synthetic_universe(n, seed=5)).table
+        df = table.assign(expected_return=table['expected_return'] * 100)
+        for mode in ('svg', 'webgl'):
+            seconds, size = payload(lambda: px.scatter(df, x='expected_return', y='psr_score',
+                                                       color='risk_profile', size='current_price',
+                                                       hover_data=['company', 'sector', 'sd'],
+                                                       render_mode=mode))
+            print(f"{'risk-return ' + mode:>22} {n:>10,} {seconds:>8.2f} {size / 1024:>11,.0f}")
+
+    rng = np.random.default_rng(0)
+    for n in (50_000, 1_000_000):
+        prices = 20 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+        seconds, size = payload(lambda: go.Figure(go.Scattergl(y=prices, mode='lines')))
+        print(f"{'price line raw':>22} {n:>10,} {seconds:>8.2f} {size / 1024:>11,.0f}")
+        start = time.perf_counter()
+        keep = lttb(prices, MAX_LINE_POINTS)
+        reduce = time.perf_counter() - start
+        seconds, size = payload(lambda: go.Figure(go.Scattergl(x=keep, y=prices[keep], mode='lines')))
+        print(f"{'price line lttb':>22} {n:>10,} {reduce + seconds:>8.2f} {size / 1024:>11,.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Window metrics from daily closes: StatsEngine kernels vs a per-ticker pandas rolling loop.
+
+Run from the repo root:  python benchmarks/bench_metrics.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pennystock.metrics import WINDOWS, StatsEngine, daily_returns
+
+DAYS = 1_250
+LOOP_TICKERS = 200
+
+def daily_closes(n, seed=0):
+    rng = np.random.default_rng(seed)
+    closes = 10 * np.exp(np.cumsum(rng.normal(0, 0.03, (n, DAYS)), axis=1))
+    closes[rng.random(closes.shape) < 0.2] = np.nan
+    index = 1_000 * np.exp(np.cumsum(rng.normal(0, 0.01, DAYS)))
+    return closes, index
+
+def pandas_loop(closes, window):
+    # One rolling() per ticker, as a straightforward implementation would do
+    returns = daily_returns(closes)
+    for row in returns:
+        rolling = pd.Series(row).rolling(window, min_periods=2)
+        rolling.std(), rolling.skew(), rolling.kurt()
+
+def main():
+    dates = pd.bdate_range('2018-04-02', periods=DAYS)
+    print(f"{'companies':>10} {'all windows s':>14} {'rolling 3M ms':>14} {'cached us':>10} {'pandas loop s':>14}")
+    for n in (500, 5_000):
+        closes, index = daily_closes(n)
+        engine = StatsEngine(closes, dates, index=index)
+        start = time.perf_counter()
+        for window in WINDOWS:
+            engine.metrics(window)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        engine.rolling(0, '3M')
+        series = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(1_000):
+            engine.rolling(0, '3M')
+        cached = (time.perf_counter() - start) / 1_000
+
+        start = time.perf_counter()
+        pandas_loop(closes[:LOOP_TICKERS], WINDOWS['3M'])
+        loop = (time.perf_counter() - start) * n / LOOP_TICKERS
+
+        print(f"{n:>10,} {build:>14.2f} {series * 1e3:>14.1f} {cached * 1e6:>10.1f} {loop:>14.2f}")
+
+if __name__ == '__main__':
+    main()
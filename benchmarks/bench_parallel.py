@@ -0,0 +1,44 @@
+"""Speedup of sharded year-moment computation versus worker count.
+
+Run from the repo root:  python benchmarks/bench_parallel.py [n_companies] [n_years]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pennystock.ingest import financial_year
+from pennystock.parallel import year_moments
+
+def synthetic_closes(n_companies, n_years, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2009-04-01', periods=250 * n_years)
+    returns = rng.normal(0, 0.03, (n_companies, len(dates)))
+    closes = 10 * np.exp(np.cumsum(returns, axis=1))
+    closes[rng.random(closes.shape) < 0.05] = np.nan
+    return closes, financial_year(dates)
+
+def main():
+    n_companies = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    n_years = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+    closes, day_years = synthetic_closes(n_companies, n_years)
+    print(f"{n_companies} companies x {closes.shape[1]} days ({closes.nbytes / 1e6:.0f} MB), "
+          f"{os.cpu_count()} CPUs")
+    cpus = os.cpu_count() or 1
+    counts = sorted({2 ** k for k in range(cpus.bit_length()) if 2 ** k <= cpus} | {cpus})
+    baseline = None
+    print(f"{'workers':>8} {'time (s)':>10} {'speedup':>9}")
+    for workers in counts:
+        start = time.perf_counter()
+        year_moments(closes, day_years, workers=workers)
+        elapsed = time.perf_counter() - start
+        if baseline is None:
+            baseline = elapsed
+        print(f"{workers:>8} {elapsed:>10.3f} {baseline / elapsed:>8.2f}x")
+
+if __name__ == '__main__':
+    main()
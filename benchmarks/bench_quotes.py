@@ -0,0 +1,38 @@
+"""Quote refresh time for a 5,000-company universe against the local mock feed.
+
+Run from the repo root:  python benchmarks/bench_quotes.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pennystock.quotes import HTTPFeed, MockQuoteServer, QuoteRefresher
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+COMPANIES = 5_000
+LATENCY = 0.1
+FAILURE_RATE = 0.05
+
+def main():
+    store = build_universe(synthetic_universe(COMPANIES, seed=6))
+    base = dict(zip(store.table['company'].astype(str), store.table['current_price'].astype(float)))
+    server = MockQuoteServer(base, latency=LATENCY, failure_rate=FAILURE_RATE, seed=0).start()
+    print(f"{'batch':>6} {'concurrency':>12} {'seconds':>8} {'quoted':>7} {'failed':>7} {'requests':>9}")
+    try:
+        for batch_size, concurrency in ((50, 1), (50, 16), (200, 16), (200, 32)):
+            refresher = QuoteRefresher(store, HTTPFeed(server.url, connections=concurrency),
+                                       batch_size=batch_size, concurrency=concurrency, backoff=0.05)
+            requests = server.requests
+            start = time.perf_counter()
+            snapshot = asyncio.run(refresher.refresh())
+            print(f"{batch_size:>6} {concurrency:>12} {time.perf_counter() - start:>8.2f} "
+                  f"{snapshot.quoted:>7,} {snapshot.failed_batches:>7} {server.requests - requests:>9}")
+    finally:
+        server.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+"""Top-K reads and incremental re-ranking vs a pandas nlargest rescan.
+
+Run from the repo root:  python benchmarks/bench_rankings.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pennystock.rankings import RankingBook
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+READS = 1_000
+BATCH = 100
+
+def per_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+def main():
+    print(f"{'companies':>10} {'nlargest us':>12} {'top-3 us':>9} {'update us/row':>14}")
+    for n in (2_000, 20_000, 200_000):
+        store = build_universe(synthetic_universe(n, seed=4))
+        table = store.table
+        book = RankingBook(store)
+        scan = per_call(lambda: table[table['psr_score'] >= 75].nlargest(3, 'psr_score'), 20)
+        read = per_call(lambda: book.top('safest', 3), READS)
+
+        rng = np.random.default_rng(0)
+        column = table.columns.get_loc('psr_score')
+        batches = [rng.choice(n, BATCH, replace=False) for _ in range(50)]
+        for rows in batches:
+            table.iloc[rows, column] = np.round(rng.uniform(0, 100, BATCH), 1)
+        update = per_call(lambda: [book.update(rows) for rows in batches], 1) / (len(batches) * BATCH)
+
+        print(f"{n:>10,} {scan * 1e6:>12,.0f} {read * 1e6:>9,.1f} {update * 1e6:>14,.1f}")
+
+if __name__ == '__main__':
+    main()
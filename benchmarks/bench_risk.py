@@ -0,0 +1,51 @@
+"""Portfolio risk: full recompute vs incremental updates on one position.
+
+Run from the repo root:  python benchmarks/bench_risk.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pennystock.risk import RiskModel
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+UNIVERSE = 20_000
+HOLDINGS = [100, 500, 2_000]
+REPEATS = 200
+
+def dense_volatility(model, values):
+    # Reference: explicit covariance matrix of the held rows
+    held = np.flatnonzero(values)
+    v = values[held]
+    return np.sqrt(v @ np.cov(model.returns(held)) @ v) / v.sum()
+
+def timed(function, repeats=REPEATS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        function()
+    return (time.perf_counter() - start) / repeats * 1000
+
+def main():
+    store = build_universe(synthetic_universe(UNIVERSE, seed=1))
+    model = RiskModel(store)
+    rng = np.random.default_rng(0)
+    print(f"{'holdings':>8} {'dense (ms)':>11} {'reset (ms)':>11} {'shift (ms)':>11} {'summary (ms)':>13}")
+    for holdings in HOLDINGS:
+        values = np.zeros(len(store))
+        values[rng.choice(len(store), holdings, replace=False)] = rng.uniform(1e3, 1e5, holdings)
+        state = model.track(values)
+
+        rows = np.flatnonzero(values)
+        dense = timed(lambda: dense_volatility(model, values), 20)
+        reset = timed(lambda: state.reset(values))
+        shift = timed(lambda: state.shift(int(rng.choice(rows)), 100.0))
+        summary = timed(lambda: state.summary())
+        print(f"{holdings:>8} {dense:>11.3f} {reset:>11.3f} {shift:>11.4f} {summary:>13.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""Compare per-row calculate_psr_score against the vectorized score_batch.
+
+Run from the repo root:  python benchmarks/bench_scoring.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pennystock.scoring import calculate_psr_score, score_batch, universe_table
+from pennystock.synthetic import synthetic_universe
+
+SIZES = [1_000, 10_000, 100_000]
+
+def best_of(fn, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def main():
+    print(f"{'rows':>8} {'loop (s)':>10} {'batch (s)':>10} {'speedup':>9}")
+    for n in SIZES:
+        sectors_data = synthetic_universe(n, seed=n)
+        companies = [c for s in sectors_data.values() for c in s['companies'].values()]
+        table = universe_table(sectors_data)
+
+        loop_time, _ = best_of(lambda: [calculate_psr_score(c) for c in companies])
+        batch_time, _ = best_of(lambda: score_batch(table))
+
+        print(f"{n:>8} {loop_time:>10.4f} {batch_time:>10.4f} {loop_time / batch_time:>8.1f}x")
+
+if __name__ == '__main__':
+    main()
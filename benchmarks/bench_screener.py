@@ -0,0 +1,53 @@
+"""Latency of Screener.query for typical and worst-case filter sets.
+
+Run from the repo root:  python benchmarks/bench_screener.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pennystock.screener import Screener
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+SIZES = [5_000, 50_000]
+QUERIES = 500
+
+def typical_filters(rng, sectors):
+    # Slider drags around the page defaults, most sectors selected
+    return dict(min_psr=int(rng.integers(40, 80)), min_return=int(rng.integers(0, 300)) / 100,
+                max_volatility=float(rng.uniform(10, 40)), market_cap_min=int(rng.integers(0, 1000)),
+                sectors=sectors, risk_filter="All")
+
+def worst_case_filters(rng, sectors):
+    # Nothing filtered out, sectors in shuffled order, never a cache hit
+    return dict(min_psr=0, min_return=0.0, max_volatility=float(50 + rng.random()),
+                market_cap_min=0, sectors=list(rng.permutation(sectors)), risk_filter="All")
+
+def measure(screener, make_filters, rng, sectors):
+    timings = []
+    for _ in range(QUERIES):
+        filters = make_filters(rng, sectors)
+        start = time.perf_counter()
+        screener.query(**filters)
+        timings.append(time.perf_counter() - start)
+    return np.percentile(timings, [50, 99]) * 1000
+
+def main():
+    print(f"{'rows':>8} {'filters':>12} {'p50 (ms)':>10} {'p99 (ms)':>10}")
+    for n in SIZES:
+        store = build_universe(synthetic_universe(n, seed=n))
+        screener = Screener(store)
+        rng = np.random.default_rng(0)
+        sectors = store.sectors
+
+        for label, make_filters in (('typical', typical_filters), ('worst-case', worst_case_filters)):
+            p50, p99 = measure(screener, make_filters, rng, sectors)
+            print(f"{n:>8} {label:>12} {p50:>10.3f} {p99:>10.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""Peer-similarity index: blocked top-k build and lookups vs the full correlation matrix.
+
+Run from the repo root:  python benchmarks/bench_similarity.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pennystock.similarity import SimilarityIndex
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+LOOKUPS = 200
+
+def main():
+    print(f"{'companies':>10} {'build s':>8} {'index MB':>9} {'full MB':>8} {'lookup ms':>10}")
+    for n in (1_000, 5_000, 20_000):
+        store = build_universe(synthetic_universe(n, seed=4))
+        start = time.perf_counter()
+        index = SimilarityIndex(store, k=20)
+        build = time.perf_counter() - start
+
+        companies = store.table['company'].astype(str).to_numpy()
+        picks = np.random.default_rng(0).choice(companies, LOOKUPS)
+        start = time.perf_counter()
+        for company in picks:
+            index.similar_frame(company, k=10)
+        lookup = (time.perf_counter() - start) / LOOKUPS
+
+        size = (index.neighbours.nbytes + index.scores.nbytes) / 2**20
+        print(f"{n:>10,} {build:>8.2f} {size:>9.1f} {n * n * 4 / 2**20:>8.0f} {lookup * 1e3:>10.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""Monte Carlo throughput: terminal-only vs stepped paths, and worker scaling.
+
+Run from the repo root:  python benchmarks/bench_simulation.py
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pennystock.simulation import simulate
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+NAMES = 300
+STEPS = 250
+
+def timed(**kwargs):
+    start = time.perf_counter()
+    result = simulate(**kwargs)
+    return time.perf_counter() - start, result
+
+def main():
+    store = build_universe(synthetic_universe(2_000, seed=2))
+    rows = np.arange(NAMES)
+    cpus = os.cpu_count() or 1
+    workers = sorted({1, cpus})
+
+    print(f"{'mode':>9} {'paths':>8} {'workers':>8} {'seconds':>8} {'paths/s':>10} {'p(loss)':>8}")
+    for path_stats, paths in ((False, 100_000), (True, 2_000)):
+        mode = 'stepped' if path_stats else 'terminal'
+        for n in workers:
+            seconds, result = timed(store=store, rows=rows, paths=paths, steps=STEPS, seed=0,
+                                    workers=n, path_stats=path_stats, chunk_paths=min(paths, 10_000))
+            print(f"{mode:>9} {paths:>8,} {n:>8} {seconds:>8.2f} {paths / seconds:>10,.0f} "
+                  f"{result.prob_loss:>8.3f}")
+
+if __name__ == '__main__':
+    main()
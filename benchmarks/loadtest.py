@@ -0,0 +1,239 @@
+"""Headless load test: N concurrent analyst sessions driving the app through AppTest.
+
+Every session is a Streamlit AppTest of app.py on its own thread, sharing
+the process-wide caches the way sessions on one server do.  Sessions open
+the app, then switch between the navigation pages and drag the screener
+sliders at random.  Each rerun's latency is recorded.  For every
+concurrency level the harness reports latency percentiles, throughput,
+and the process's CPU time and RSS growth divided by the number of
+sessions; sessions share one process, so these are averages, not
+per-session measurements.  The saturation point is where adding
+sessions stops adding throughput, or where p95 latency passes the SLO.
+
+Everything runs offline: the universe is a synthetic snapshot written to
+a temporary directory, and portfolios go to a temporary database.
+
+Run from the repo root:
+    python benchmarks/loadtest.py --sessions 1 2 4 8 --companies 5000 --actions 20
+    python benchmarks/loadtest.py --sessions 4 --clear-caches --output load.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from pennystock.snapshot import write_snapshot
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+APP = os.path.join(ROOT, 'app.py')
+
+SCREENER = "ADVANCED STOCK SCREENER"
+
+# Screener sliders a session drags, with their ranges on the page
+SCREENER_SLIDERS = {
+    "Minimum PSR Score": (0, 100),
+    "Minimum Return %": (0, 1000),
+    "Max Volatility": (0.0, 50.0)
+}
+
+# A level saturates once throughput grows less than this over the previous level
+PLATEAU_GAIN = 0.10
+
+# ENVIRONMENT
+def prepare_environment(companies, seed, directory):
+    """Point the app at a synthetic snapshot and a scratch portfolio database"""
+    path = os.path.join(directory, f'universe-{companies}.arrow')
+    write_snapshot(build_universe(synthetic_universe(companies, seed=seed)), path)
+    os.environ['PENNYSTOCK_SNAPSHOT'] = path
+    os.environ['PENNYSTOCK_DB'] = os.path.join(directory, 'loadtest.db')
+    return path
+
+def rss_kb():
+    """Current resident set size of this process"""
+    try:
+        with open('/proc/self/statm') as handle:
+            return int(handle.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+def clear_caches():
+    import streamlit as st
+    st.cache_resource.clear()
+    st.cache_data.clear()
+
+# SESSIONS
+class Session:
+    """One simulated analyst: an AppTest driven through random page and slider actions"""
+
+    def __init__(self, number, actions, think, seed, timeout):
+        from streamlit.testing.v1 import AppTest
+        self.number = number
+        self.actions = actions
+        self.think = think
+        self.timeout = timeout
+        self.random = random.Random(seed)
+        self.app = AppTest.from_file(APP, default_timeout=timeout)
+        self.records = []
+        self.page = None
+
+    def _rerun(self, action, element=None):
+        start = time.perf_counter()
+        error = None
+        try:
+            if element is None:
+                self.app.run(timeout=self.timeout)
+            else:
+                element.run(timeout=self.timeout)
+            if self.app.exception:
+                error = self.app.exception[0].message
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        self.records.append({'session': self.number, 'action': action, 'page': self.page,
+                             'seconds': time.perf_counter() - start, 'error': error})
+
+    def _navigation(self):
+        return next(box for box in self.app.sidebar.selectbox if box.label == "Navigation")
+
+    def run(self):
+        self._rerun('open')
+        if self.records[-1]['error']:
+            return
+        self.page = self._navigation().value
+        pages = list(self._navigation().options)
+        for _ in range(self.actions):
+            if self.think:
+                time.sleep(self.random.expovariate(1 / self.think))
+            sliders = [slider for slider in self.app.slider if slider.label in SCREENER_SLIDERS]
+            if self.page == SCREENER and sliders and self.random.random() < 0.6:
+                slider = self.random.choice(sliders)
+                low, high = SCREENER_SLIDERS[slider.label]
+                value = (self.random.randint(low, high) if isinstance(low, int)
+                         else round(self.random.uniform(low, high), 1))
+                self._rerun('slider', slider.set_value(value))
+            else:
+                self.page = self.random.choice(pages)
+                self._rerun('page', self._navigation().set_value(self.page))
+
+# LOAD LEVELS
+def run_level(sessions, actions, think, seed, timeout):
+    """Run `sessions` concurrent sessions to completion; returns (records, summary)"""
+    # AppTest objects are built up front so construction doesn't count as load
+    drivers = [Session(i, actions, think, seed * 1_000 + i, timeout) for i in range(sessions)]
+    threads = [threading.Thread(target=driver.run, name=f'session-{i}') for i, driver in enumerate(drivers)]
+    rss_before, cpu_before = rss_kb(), time.process_time()
+    peak_rss = rss_before
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads):
+        peak_rss = max(peak_rss, rss_kb())
+        time.sleep(0.05)
+    wall = time.perf_counter() - start
+    cpu = time.process_time() - cpu_before
+
+    records = pd.DataFrame([record for driver in drivers for record in driver.records])
+    records['sessions'] = sessions
+    ok = records[records['error'].isna()]
+    reruns = ok[ok['action'] != 'open']['seconds'].to_numpy()
+    opens = ok[ok['action'] == 'open']['seconds'].to_numpy()
+    percentiles = np.percentile(reruns, [50, 90, 95, 99]) if len(reruns) else [np.nan] * 4
+    summary = {
+        'sessions': sessions,
+        'reruns': int(len(ok)),
+        'errors': int(records['error'].notna().sum()),
+        'wall_s': wall,
+        'throughput_per_s': len(ok) / wall if wall > 0 else np.nan,
+        'open_p50_s': float(np.median(opens)) if len(opens) else np.nan,
+        'p50_s': percentiles[0], 'p90_s': percentiles[1], 'p95_s': percentiles[2], 'p99_s': percentiles[3],
+        'max_s': float(reruns.max()) if len(reruns) else np.nan,
+        # Process totals divided by sessions; threads can't be metered apart
+        'process_cpu_s_per_session': cpu / sessions,
+        'cpu_utilisation': cpu / (wall * (os.cpu_count() or 1)) if wall > 0 else np.nan,
+        'rss_mb': peak_rss / 1024,
+        'process_rss_mb_per_session': max(peak_rss - rss_before, 0) / 1024 / sessions
+    }
+    return records, summary
+
+def saturation(levels, slo):
+    """First level past which throughput stops growing, and the largest level within the p95 SLO"""
+    plateau = None
+    for previous, level in zip(levels, levels[1:]):
+        if level['throughput_per_s'] < previous['throughput_per_s'] * (1 + PLATEAU_GAIN):
+            plateau = previous['sessions']
+            break
+    within = [level['sessions'] for level in levels if level['p95_s'] <= slo and not level['errors']]
+    return {'throughput_plateau_sessions': plateau, 'max_sessions_within_slo': max(within) if within else None,
+            'slo_p95_s': slo}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8], help="concurrency levels to run")
+    parser.add_argument('--companies', type=int, default=5_000, help="size of the synthetic universe")
+    parser.add_argument('--actions', type=int, default=20, help="page switches and slider drags per session")
+    parser.add_argument('--think', type=float, default=0.0, help="mean think time between actions, seconds")
+    parser.add_argument('--slo', type=float, default=2.0, help="p95 rerun latency target, seconds")
+    parser.add_argument('--timeout', type=float, default=300.0, help="seconds before a rerun counts as failed")
+    parser.add_argument('--clear-caches', action='store_true',
+                        help="start every level with empty Streamlit caches, to measure what caching saves")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="also write levels and every rerun to this JSON file")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='pennystock-load-') as directory:
+        start = time.perf_counter()
+        prepare_environment(args.companies, args.seed, directory)
+        print(f"Synthetic universe of {args.companies:,} companies ready in {time.perf_counter() - start:.1f}s",
+              flush=True)
+        if not args.clear_caches:
+            # One unmeasured session warms the shared caches, as a running server would have
+            warm = Session(-1, 0, 0.0, args.seed, args.timeout)
+            warm.run()
+            if warm.records[-1]['error']:
+                print(f"App failed to start: {warm.records[-1]['error']}")
+                return 1
+
+        levels, reruns = [], []
+        for sessions in args.sessions:
+            if args.clear_caches:
+                clear_caches()
+            records, summary = run_level(sessions, args.actions, args.think, args.seed, args.timeout)
+            levels.append(summary)
+            reruns.append(records)
+            print(f"{sessions:>4} sessions: {summary['throughput_per_s']:6.2f} reruns/s, "
+                  f"p50 {summary['p50_s']:.2f}s p95 {summary['p95_s']:.2f}s, "
+                  f"process total / sessions {summary['process_cpu_s_per_session']:.1f} CPU s "
+                  f"{summary['process_rss_mb_per_session']:.0f} MB, "
+                  f"{summary['errors']} errors", flush=True)
+
+    frame = pd.DataFrame(levels)
+    verdict = saturation(levels, args.slo)
+    with pd.option_context('display.width', 200, 'display.max_columns', None, 'display.float_format', '{:,.3f}'.format):
+        print()
+        print(frame.to_string(index=False))
+    plateau, within = verdict['throughput_plateau_sessions'], verdict['max_sessions_within_slo']
+    print()
+    print(f"Throughput stops scaling after {plateau} sessions" if plateau
+          else "Throughput still scales at the highest level tested")
+    print(f"p95 latency stays within {args.slo:g}s up to {within} sessions" if within
+          else f"p95 latency is over {args.slo:g}s at every level tested")
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump({'config': vars(args), 'levels': levels, 'saturation': verdict,
+                       'reruns': pd.concat(reruns).to_dict('records')}, handle, indent=1, default=str)
+        print(f"Wrote results -> {args.output}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
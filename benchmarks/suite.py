@@ -0,0 +1,254 @@
+"""Regression suite: time and peak memory of the scoring, screening and page-build paths.
+
+Every case runs on synthetic universes (create_comprehensive_data schema)
+of each size and is recorded in a JSON file; `compare` checks a run against
+a baseline and exits 1 when any case got slower, or needed more peak
+memory, by more than the threshold.
+
+Run from the repo root:
+    python benchmarks/suite.py run --output benchmarks/baselines/main.json
+    python benchmarks/suite.py run --output current.json --compare benchmarks/baselines/main.json
+    python benchmarks/suite.py compare benchmarks/baselines/main.json current.json --threshold 0.25
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pennystock.cube import SectorCube
+from pennystock.scoring import calculate_psr_score, get_risk_profile, score_batch
+from pennystock.screener import Screener
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+SIZES = [100, 1_000, 10_000, 100_000]
+
+# Timings shorter than this are repeated in a loop and divided, as timeit does
+MIN_SAMPLE_SECONDS = 0.05
+
+# Differences below these floors are noise, whatever the ratio
+NOISE_SECONDS = 1e-4
+NOISE_KB = 64.0
+
+# CASES
+# Each case takes the prepared universe and returns a callable to time
+def case_build_universe(universe):
+    return lambda: build_universe(universe['sectors_data'])
+
+def case_calculate_psr_score(universe):
+    companies = universe['companies']
+    return lambda: [calculate_psr_score(company_data) for company_data in companies]
+
+def case_get_risk_profile(universe):
+    scores = universe['store'].table['psr_score'].tolist()
+    return lambda: [get_risk_profile(score) for score in scores]
+
+def case_score_batch(universe):
+    table = universe['store'].table
+    return lambda: score_batch(table)
+
+def case_screener_query(universe):
+    store = universe['store']
+    screener = Screener(store, cache_size=0)
+    sectors = store.sectors
+    volatility = iter(np.linspace(20.0, 30.0, 1_000_000))
+
+    def query():
+        # A new max volatility on every call, like a slider drag, so nothing is memoized
+        return screener.query(min_psr=60, min_return=1.0, max_volatility=next(volatility),
+                              market_cap_min=0, sectors=sectors, risk_filter="All")
+    return query
+
+def case_dashboard_frame(universe):
+    table = universe['store'].table
+
+    def dashboard():
+        df = pd.DataFrame({
+            'Company': table['company'],
+            'Sector': table['sector'],
+            'PSR Score': table['psr_score'],
+            'Risk Profile': table['risk_profile'],
+            'Expected Return %': table['expected_return'] * 100,
+            'Current Price': table['current_price'],
+            'Volatility': table['sd'],
+            'Market Cap (Cr)': table['market_cap'].fillna('N/A')
+        })
+        return (len(df), df['PSR Score'].mean(), len(df[df['PSR Score'] >= 65]), len(df[df['PSR Score'] < 50]),
+                df['Expected Return %'].mean(), df['Expected Return %'].max())
+    return dashboard
+
+def case_sector_aggregation(universe):
+    store = universe['store']
+    return lambda: SectorCube(store).sector_frame()
+
+CASES = {
+    'build_universe': case_build_universe,
+    'calculate_psr_score': case_calculate_psr_score,
+    'get_risk_profile': case_get_risk_profile,
+    'score_batch': case_score_batch,
+    'screener_query': case_screener_query,
+    'dashboard_frame': case_dashboard_frame,
+    'sector_aggregation': case_sector_aggregation
+}
+
+# MEASUREMENT
+def prepare(n, seed=0):
+    sectors_data = synthetic_universe(n, seed=seed)
+    return {
+        'sectors_data': sectors_data,
+        'companies': [company_data for sector_data in sectors_data.values()
+                      for company_data in sector_data['companies'].values()],
+        'store': build_universe(sectors_data)
+    }
+
+def time_call(fn, repeat, budget):
+    """Seconds per call: min and median over `repeat` samples, fewer if a call is slow.
+
+    The garbage collector is off while sampling, as in timeit.
+    """
+    start = time.perf_counter()
+    fn()
+    first = time.perf_counter() - start
+    number = max(1, int(MIN_SAMPLE_SECONDS / first)) if first < MIN_SAMPLE_SECONDS else 1
+    repeat = max(1, min(repeat, int(budget / max(first * number, 1e-9))))
+    samples = []
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            samples.append((time.perf_counter() - start) / number)
+    finally:
+        if collecting:
+            gc.enable()
+    return {'min_s': min(samples), 'median_s': float(np.median(samples)), 'samples': len(samples),
+            'number': number}
+
+def peak_memory(fn):
+    """Peak KB allocated by one call, traced separately so it doesn't skew the timings"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(sizes, cases, repeat=5, budget=20.0, seed=0):
+    results = {}
+    for n in sizes:
+        universe = prepare(n, seed=seed)
+        for name in cases:
+            fn = CASES[name](universe)
+            result = time_call(fn, repeat, budget)
+            result['peak_kb'] = peak_memory(fn)
+            results[f'{name}[{n}]'] = result
+            print(f"{name:>20} {n:>8,} {result['min_s'] * 1e3:>11.3f} ms {result['peak_kb']:>12,.0f} KB",
+                  flush=True)
+    return {
+        'meta': {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.platform(),
+            'cpus': os.cpu_count(),
+            'repeat': repeat
+        },
+        'results': results
+    }
+
+# COMPARISON
+def compare(baseline, current, threshold=0.25, memory_threshold=0.25, metric='min_s'):
+    """Per-case ratios of current to baseline; `regressions` lists the cases past a threshold"""
+    rows, regressions = [], []
+    for key, new in current['results'].items():
+        old = baseline['results'].get(key)
+        if old is None:
+            rows.append((key, None, new[metric], None, None, new['peak_kb'], None, 'new'))
+            continue
+        time_ratio = new[metric] / old[metric] if old[metric] > 0 else np.inf
+        memory_ratio = new['peak_kb'] / old['peak_kb'] if old['peak_kb'] > 0 else np.inf
+        slower = time_ratio > 1 + threshold and new[metric] - old[metric] > NOISE_SECONDS
+        bigger = memory_ratio > 1 + memory_threshold and new['peak_kb'] - old['peak_kb'] > NOISE_KB
+        status = 'SLOWER' if slower else 'MORE MEMORY' if bigger else 'ok'
+        if slower or bigger:
+            regressions.append(key)
+        rows.append((key, old[metric], new[metric], time_ratio, old['peak_kb'], new['peak_kb'], memory_ratio,
+                     status))
+    frame = pd.DataFrame(rows, columns=['case', f'base {metric}', f'new {metric}', 'time x',
+                                        'base peak_kb', 'new peak_kb', 'memory x', 'status'])
+    return frame, regressions
+
+def report(frame, regressions, threshold):
+    with pd.option_context('display.max_rows', None, 'display.width', 160, 'display.float_format', '{:,.4g}'.format):
+        print(frame.to_string(index=False))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) past {threshold:.0%}: {', '.join(regressions)}")
+    else:
+        print(f"\nNo regressions past {threshold:.0%}")
+
+def load(path):
+    with open(path, encoding='utf-8') as handle:
+        return json.load(handle)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="run the suite and write a JSON result file")
+    run.add_argument('--output', required=True, help="JSON file to write, e.g. benchmarks/baselines/main.json")
+    run.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    run.add_argument('--cases', nargs='+', choices=list(CASES), default=list(CASES))
+    run.add_argument('--repeat', type=int, default=5, help="timing samples per case")
+    run.add_argument('--budget', type=float, default=20.0, help="seconds of timing per case before cutting samples")
+    run.add_argument('--compare', metavar='BASELINE', help="also compare against this baseline")
+
+    check = commands.add_parser('compare', help="compare a result file against a baseline")
+    check.add_argument('baseline')
+    check.add_argument('current')
+
+    for command in (run, check):
+        command.add_argument('--threshold', type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+        command.add_argument('--memory-threshold', type=float, default=0.25, help="allowed peak memory growth")
+        command.add_argument('--metric', choices=['min_s', 'median_s'], default='min_s')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        current = run_suite(args.sizes, args.cases, repeat=args.repeat, budget=args.budget)
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(current, handle, indent=1)
+        print(f"Wrote {len(current['results'])} results -> {args.output}")
+        if not args.compare:
+            return 0
+        baseline = load(args.compare)
+    else:
+        baseline, current = load(args.baseline), load(args.current)
+
+    frame, regressions = compare(baseline, current, args.threshold, args.memory_threshold, args.metric)
+    report(frame, regressions, args.threshold)
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,47 @@
+"""Scoring and data core for the PennyStock Analysis app.
+
+Nothing in this package imports streamlit or plotly, so it can be used from
+batch jobs as well as from app.py.  Snapshots (pyarrow), exports, live quotes
+and scoring specs are imported on first use, so `import pennystock` and the
+CLI stay light.
+"""
+import importlib
+
+from .scoring import (calculate_psr_score, get_risk_profile, risk_buckets, risk_profile_labels,
+                      risk_profiles, score_batch, universe_table)
+from .store import STAT_FIELDS, CompanyStore
+from .universe import build_universe, content_hash, refresh_companies, score_store
+from .ingest import BhavcopyIngestor, ingest_bhavcopies
+from .screener import Screener
+from .parallel import build_store_from_closes, year_moments
+from .portfolio import PortfolioBook
+from .persistence import UserDataStore
+from .risk import RiskModel, RiskState
+from .simulation import SimulationResult, simulate
+from .backtest import PointInTimePanel, backtest, bucket_returns, sweep, weight_grid
+from .cube import SectorCube
+from .rankings import RankedIndex, RankingBook
+from .profiling import RenderProfiler
+from .downsample import lttb
+from .similarity import SimilarityIndex, top_k_correlations
+from .metrics import StatsEngine
+
+# Names resolved from their module on first access
+_LAZY = {
+    'load_snapshot': 'snapshot', 'write_snapshot': 'snapshot',
+    'ScoringPlan': 'rules', 'compile_spec': 'rules', 'load_spec': 'rules', 'load_specs': 'rules',
+    'score_profiles': 'rules',
+    'ExportCache': 'export', 'universe_chunks': 'export', 'write_export': 'export',
+    'FileDropFeed': 'quotes', 'HTTPFeed': 'quotes', 'MockQuoteServer': 'quotes', 'QuoteRefresher': 'quotes',
+    'QuoteSnapshot': 'quotes'
+}
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{_LAZY[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
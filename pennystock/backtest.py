@@ -0,0 +1,161 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .scoring import RISK_PROFILES, risk_buckets, score_batch
+from .store import STAT_FIELDS
+
+COMPONENTS = ('rps', 'rvs', 'sds')
+
+# POINT-IN-TIME PANEL
+class PointInTimePanel:
+    """Scoring inputs and forward returns as they stood at each year end.
+
+    Everything is laid out year-major, (n_years, n_companies), so a whole
+    history is scored with one score_batch call and every rebalance is a
+    slice.  As of year t, expected_return is the first-to-t annual close
+    return (as BhavcopyIngestor.to_sectors_data defines it) and the stats
+    are year t's.  Sharpe ratio and beta have no history in the store, so
+    they are left out unless `static=True`, which uses today's values and
+    therefore looks ahead.
+    """
+
+    def __init__(self, store, static=False):
+        self.years = list(store.years)
+        self.companies = store.table['company'].astype(str).to_numpy()
+        prices = np.round(np.asarray(store.prices, dtype=np.float64), 2).T
+        n_years, n = prices.shape
+
+        first = prices[np.argmax(~np.isnan(prices), axis=0), np.arange(n)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            expected_return = np.where(first > 0, prices / first - 1, np.nan)
+            forward = prices[1:] / prices[:-1] - 1
+        forward[~np.isfinite(forward)] = np.nan
+        self.forward = forward
+
+        stats = np.asarray(store.stats, dtype=np.float64).transpose(1, 0, 2)
+        inputs = {name: stats[..., k].ravel() for k, name in enumerate(STAT_FIELDS)}
+        inputs['expected_return'] = expected_return.ravel()
+        if static:
+            for name in ('sharpe_ratio', 'beta'):
+                inputs[name] = np.tile(store.table[name].to_numpy(np.float64), n_years)
+        scores = score_batch(inputs)
+        self.total = scores['total_score'].reshape(n_years, n)
+        self.components = np.stack([scores[name].reshape(n_years, n) for name in COMPONENTS], axis=-1)
+        # Scorable at t and priced at t and t+1
+        self.eligible = ~np.isnan(stats[:-1, :, 0]) & ~np.isnan(forward)
+
+    def scores(self, weights):
+        """(n_weightings, n_years, n) totals for rows of RPS/RVS/SDS weights"""
+        weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+        totals = np.einsum('ynk,wk->wyn', self.components, weights)
+        # The default weighting is exactly the app's PSR score
+        totals[np.all(weights == 1, axis=1)] = self.total
+        return totals
+
+# VECTORIZED REBALANCING
+def _drawdown(returns):
+    equity = np.cumprod(1 + returns, axis=-1)
+    peak = np.maximum.accumulate(np.maximum(equity, 1.0), axis=-1)
+    return equity, (1 - equity / peak).max(axis=-1)
+
+def _top_n_weights(scores, eligible, top_n):
+    # Equal weights on the top_n eligible scores of every (weighting, year)
+    ranked = np.where(eligible, scores, -np.inf)
+    count = min(top_n, ranked.shape[-1])
+    picks = np.argpartition(-ranked, count - 1, axis=-1)[..., :count]
+    chosen = np.take_along_axis(ranked, picks, axis=-1) > -np.inf
+    weights = np.zeros(ranked.shape)
+    np.put_along_axis(weights, picks, chosen.astype(np.float64), axis=-1)
+    held = weights.sum(axis=-1, keepdims=True)
+    return np.divide(weights, held, out=np.zeros_like(weights), where=held > 0)
+
+class BacktestResult:
+    """Yearly returns, turnover and drawdown of each weighting's top-N book"""
+
+    def __init__(self, years, weightings, returns, turnover, benchmark):
+        self.years = years
+        self.weightings = np.atleast_2d(weightings)
+        self.returns = returns
+        self.turnover = turnover
+        self.benchmark = benchmark
+        self.equity, self.max_drawdown = _drawdown(returns)
+
+    def summary(self):
+        n_years = self.returns.shape[-1]
+        bench_equity = _drawdown(self.benchmark)[0]
+        frame = pd.DataFrame(self.weightings, columns=[f'w_{name}' for name in COMPONENTS])
+        frame['cagr'] = self.equity[:, -1] ** (1 / n_years) - 1
+        frame['total_return'] = self.equity[:, -1] - 1
+        frame['max_drawdown'] = self.max_drawdown
+        frame['avg_turnover'] = self.turnover.mean(axis=1)
+        frame['hit_rate'] = (self.returns > self.benchmark).mean(axis=1)
+        frame['excess_cagr'] = frame['cagr'] - (bench_equity[-1] ** (1 / n_years) - 1)
+        return frame
+
+def backtest(panel, weights=(1, 1, 1), top_n=10):
+    """Hold the top_n PSR names, equal weight, from each year end to the next.
+
+    `weights` is one RPS/RVS/SDS weighting or a (k, 3) array of them; all
+    are rebalanced together as array operations over (weighting, year,
+    company).  Turnover is the one-way trade needed at each rebalance
+    against the previous book drifted by its returns; the benchmark is the
+    equal-weighted eligible universe.  At least two financial years are
+    needed for one rebalance period.
+    """
+    if len(panel.years) < 2:
+        raise ValueError(f"Backtesting needs at least two financial years, got {len(panel.years)}")
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    scores = panel.scores(weights)[:, :-1]
+    held = _top_n_weights(scores, panel.eligible, top_n)
+    forward = np.nan_to_num(panel.forward)
+    returns = (held * forward).sum(axis=-1)
+
+    drifted = held * (1 + forward) / (1 + returns)[..., None]
+    previous = np.concatenate([np.zeros_like(held[:, :1]), drifted[:, :-1]], axis=1)
+    turnover = 0.5 * np.abs(held - previous).sum(axis=-1)
+    turnover[:, 0] = 1.0
+
+    universe = panel.eligible.sum(axis=1)
+    benchmark = np.where(universe > 0, (forward * panel.eligible).sum(axis=1) / np.maximum(universe, 1), 0.0)
+    return BacktestResult(panel.years[:-1], weights, returns, turnover, benchmark)
+
+def bucket_returns(panel):
+    """Mean forward return and count per risk-profile bucket and year"""
+    scores = panel.total[:-1]
+    bucket = risk_buckets(scores)
+    n_buckets = len(RISK_PROFILES)
+    rows = []
+    for t, year in enumerate(panel.years[:-1]):
+        eligible = panel.eligible[t]
+        counts = np.bincount(bucket[t][eligible], minlength=n_buckets)
+        sums = np.bincount(bucket[t][eligible], weights=panel.forward[t][eligible], minlength=n_buckets)
+        for b, (profile, symbol, _, _) in enumerate(RISK_PROFILES):
+            rows.append({'year': year, 'profile': f'{symbol} {profile}', 'companies': int(counts[b]),
+                         'mean_forward_return': sums[b] / counts[b] if counts[b] else np.nan})
+    return pd.DataFrame(rows)
+
+# PARAMETER SWEEPS
+def weight_grid(step=0.25, low=0.0, high=2.0):
+    """Every RPS/RVS/SDS weighting on a grid, excluding all-zero"""
+    axis = np.arange(low, high + step / 2, step)
+    grid = np.stack(np.meshgrid(axis, axis, axis, indexing='ij'), axis=-1).reshape(-1, 3)
+    return grid[grid.sum(axis=1) > 0]
+
+def _sweep_chunk(task):
+    panel, weights, top_n = task
+    return backtest(panel, weights, top_n).summary()
+
+def sweep(panel, weightings, top_n=10, workers=1, chunk_size=64):
+    """Backtest many weightings, chunked across a process pool; one summary row each"""
+    weightings = np.atleast_2d(np.asarray(weightings, dtype=np.float64))
+    tasks = [(panel, weightings[i:i + chunk_size], top_n) for i in range(0, len(weightings), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(tasks) == 1:
+        parts = [_sweep_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_sweep_chunk, tasks))
+    return pd.concat(parts, ignore_index=True).sort_values('cagr', ascending=False, ignore_index=True)
@@ -0,0 +1,183 @@
+"""Headless entry point: python -m pennystock <command> ...
+
+    score     score a universe and write PSR components and risk profiles
+    ingest    build a universe snapshot from BSE bhavcopy files
+    backtest  backtest top-N PSR portfolios, optionally sweeping component weights
+    export    stream the scored universe to CSV, Parquet or XLSX
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .scoring import RISK_THRESHOLDS, SCORE_COLUMNS, risk_profiles, score_batch
+
+# BATCH SCORING
+def read_universe(path):
+    """Flat scoring table from a snapshot or a CSV/Parquet file.
+
+    Snapshots written by write_snapshot (.arrow, or .parquet carrying the
+    snapshot metadata) use their table; other files must hold company,
+    sector and the SCORE_COLUMNS, with blank sharpe_ratio/beta for
+    companies that lack them.
+    """
+    path = str(path)
+    if path.endswith('.csv'):
+        return pd.read_csv(path)
+    import pyarrow.parquet as pq
+    from .snapshot import load_snapshot
+    if path.endswith('.parquet') and b'pennystock.format' not in (pq.read_schema(path).metadata or {}):
+        return pd.read_parquet(path)
+    return load_snapshot(path).table
+
+def write_table(frame, path):
+    if str(path).endswith('.csv'):
+        frame.to_csv(path, index=False)
+    else:
+        frame.to_parquet(path, index=False)
+
+def _score_chunk(task):
+    chunk, spec = task
+    if spec is None:
+        return score_batch(chunk)
+    from .rules import compile_spec
+    return compile_spec(spec).evaluate(chunk)
+
+def score_frame(frame, workers=1, chunk_size=250_000, spec=None):
+    """Score every row of `frame`, splitting it across `workers` processes.
+
+    `spec` is an optional scoring spec (see pennystock.rules) used instead
+    of the built-in PSR score.
+    """
+    missing = [column for column in ('expected_return', 'sd', 'mean', 'skewness', 'kurtosis')
+               if column not in frame]
+    if missing:
+        raise ValueError(f"Universe is missing scoring columns: {missing}")
+    inputs = frame[[column for column in SCORE_COLUMNS if column in frame]]
+    if workers <= 1 or len(inputs) <= chunk_size:
+        scores = _score_chunk((inputs, spec))
+    else:
+        bounds = range(0, len(inputs), chunk_size)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_score_chunk, ((inputs.iloc[i:i + chunk_size], spec) for i in bounds)))
+        scores = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+    thresholds = RISK_THRESHOLDS
+    if spec is not None:
+        from .rules import compile_spec
+        thresholds = compile_spec(spec).thresholds
+    profiles = risk_profiles(scores['total_score'], thresholds).rename(columns={'profile': 'risk_profile'})
+    result = pd.DataFrame({
+        'company': frame['company'].astype(str).to_numpy() if 'company' in frame else np.arange(len(frame)),
+        'sector': frame['sector'].astype(str).to_numpy() if 'sector' in frame else '',
+        'psr_score': scores.pop('total_score'),
+        **scores
+    })
+    return pd.concat([result, profiles], axis=1)
+
+def cmd_score(args):
+    start = time.perf_counter()
+    frame = read_universe(args.input)
+    spec = None
+    if args.spec:
+        from .rules import load_spec
+        spec = load_spec(args.spec)
+    result = score_frame(frame, workers=args.workers, chunk_size=args.chunk_size, spec=spec)
+    write_table(result, args.output)
+    print(f"Scored {len(result):,} companies in {time.perf_counter() - start:.2f}s -> {args.output}")
+
+def cmd_ingest(args):
+    from .ingest import ingest_bhavcopies, load_sector_map
+    from .snapshot import write_snapshot
+    from .universe import build_universe
+
+    start = time.perf_counter()
+    ingestor = ingest_bhavcopies(args.input, chunksize=args.chunk_size)
+    if args.state:
+        ingestor.save(args.state)
+    sectors = load_sector_map(args.sectors) if args.sectors else None
+    store = build_universe(ingestor.to_sectors_data(sectors=sectors))
+    write_snapshot(store, args.output)
+    print(f"Ingested {len(store):,} companies over {len(store.years)} years "
+          f"in {time.perf_counter() - start:.2f}s -> {args.output}")
+
+def cmd_backtest(args):
+    from .backtest import PointInTimePanel, backtest, bucket_returns, sweep, weight_grid
+    from .snapshot import load_snapshot
+
+    start = time.perf_counter()
+    panel = PointInTimePanel(load_snapshot(args.input), static=args.static)
+    if args.sweep:
+        result = sweep(panel, weight_grid(args.sweep), top_n=args.top_n, workers=args.workers)
+    else:
+        result = backtest(panel, top_n=args.top_n).summary()
+    write_table(result, args.output)
+    if args.buckets:
+        write_table(bucket_returns(panel), args.buckets)
+    print(f"Backtested {len(result):,} weighting(s) over {len(panel.years) - 1} years "
+          f"in {time.perf_counter() - start:.2f}s -> {args.output}")
+
+def cmd_export(args):
+    from .export import universe_chunks, write_export
+    from .snapshot import load_snapshot
+
+    start = time.perf_counter()
+    store = load_snapshot(args.input)
+    fmt = args.format or os.path.splitext(args.output)[1].lstrip('.').lower()
+    chunks = universe_chunks(store, per_year=args.per_year, chunk_size=args.chunk_size)
+    with open(args.output, 'wb') as sink:
+        write_export(chunks, sink, fmt)
+    print(f"Exported {len(store):,} companies in {time.perf_counter() - start:.2f}s -> {args.output}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m pennystock', description="PennyStock batch tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    score = commands.add_parser('score', help="score a universe and write PSR results")
+    score.add_argument('--input', required=True, help="snapshot (.arrow/.parquet) or flat .csv/.parquet table")
+    score.add_argument('--output', required=True, help="output .parquet or .csv")
+    score.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    score.add_argument('--chunk-size', type=int, default=250_000, help="rows per worker task")
+    score.add_argument('--spec', help="scoring spec (.yaml/.json) to use instead of the built-in PSR score")
+    score.set_defaults(func=cmd_score)
+
+    ingest = commands.add_parser('ingest', help="build a snapshot from bhavcopy files")
+    ingest.add_argument('--input', required=True, nargs='+', help="bhavcopy files, directories or globs")
+    ingest.add_argument('--output', required=True, help="snapshot path (.arrow or .parquet)")
+    ingest.add_argument('--sectors', help="CSV mapping scrip code or name to sector")
+    ingest.add_argument('--state', help="also save the moment state here for daily updates")
+    ingest.add_argument('--chunk-size', type=int, default=500_000, help="rows per ingestion batch")
+    ingest.set_defaults(func=cmd_ingest)
+
+    backtest = commands.add_parser('backtest', help="backtest top-N PSR portfolios on a snapshot")
+    backtest.add_argument('--input', required=True, help="snapshot path (.arrow or .parquet)")
+    backtest.add_argument('--output', required=True, help="summary .parquet or .csv")
+    backtest.add_argument('--top-n', type=int, default=10)
+    backtest.add_argument('--static', action='store_true',
+                          help="score with today's sharpe_ratio/beta (look-ahead)")
+    backtest.add_argument('--sweep', type=float, metavar='STEP',
+                          help="sweep RPS/RVS/SDS weights on a 0-2 grid with this step")
+    backtest.add_argument('--buckets', help="also write per-year risk-profile bucket returns here")
+    backtest.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    backtest.set_defaults(func=cmd_backtest)
+
+    export = commands.add_parser('export', help="stream a snapshot's scored universe to a file")
+    export.add_argument('--input', required=True, help="snapshot path (.arrow or .parquet)")
+    export.add_argument('--output', required=True, help="output .csv, .parquet or .xlsx")
+    export.add_argument('--format', choices=['csv', 'parquet', 'xlsx'], help="default: from the output extension")
+    export.add_argument('--per-year', action='store_true', help="add price and stats columns for every year")
+    export.add_argument('--chunk-size', type=int, default=50_000, help="rows written per chunk")
+    export.set_defaults(func=cmd_export)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
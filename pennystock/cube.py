@@ -0,0 +1,159 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Percentiles kept per sector for the PSR score and expected return
+PERCENTILES = (10, 25, 50, 75, 90)
+
+# Per-(company, year) values summed into the cube
+YEAR_FIELDS = ('price', 'mean', 'sd')
+
+# Per-company (latest) values summed into the cube
+SECTOR_FIELDS = ('psr_score', 'expected_return', 'sd', 'current_price')
+
+# SECTOR AGGREGATE CUBE
+class SectorCube:
+    """Sector x year aggregates kept as running sums and counts.
+
+    Built with a few bincounts at load time; update(rows) subtracts the
+    old contribution of each touched company and adds the new one, so a
+    nightly refresh costs O(touched companies x years).  Percentiles are
+    not decomposable, so they are recomputed only for sectors whose
+    members changed, on the next read.  Reads are O(sectors x years).
+    Missing values (NaN) are left out of both sums and counts.
+    """
+
+    def __init__(self, store):
+        self.years = list(store.years)
+        self.sectors = []
+        self._codes = {}
+        n_years = len(self.years)
+        self._row_sector = np.zeros(0, dtype=np.intp)
+        self._present = np.zeros(0, dtype=bool)
+        self._row_year = np.zeros((0, len(YEAR_FIELDS), n_years))
+        self._row_latest = np.zeros((0, len(SECTOR_FIELDS)))
+        self.year_sum = np.zeros((0, len(YEAR_FIELDS), n_years))
+        self.year_count = np.zeros((0, len(YEAR_FIELDS), n_years), dtype=np.int64)
+        self.latest_sum = np.zeros((0, len(SECTOR_FIELDS)))
+        self.latest_count = np.zeros((0, len(SECTOR_FIELDS)), dtype=np.int64)
+        self.count = np.zeros(0, dtype=np.int64)
+        self._percentiles = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self.update(np.arange(len(store.table)), store)
+
+    def _sector_code(self, name):
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.sectors)
+            self.sectors.append(name)
+        return code
+
+    def _grow(self, n_rows):
+        def grow(values, shape):
+            grown = np.zeros(shape, dtype=values.dtype)
+            grown[tuple(slice(0, k) for k in values.shape)] = values
+            return grown
+        n_sectors = len(self.sectors)
+        if n_rows > len(self._row_sector):
+            self._row_sector = grow(self._row_sector, (n_rows,))
+            self._present = grow(self._present, (n_rows,))
+            self._row_year = grow(self._row_year, (n_rows,) + self._row_year.shape[1:])
+            self._row_latest = grow(self._row_latest, (n_rows,) + self._row_latest.shape[1:])
+        if n_sectors > len(self.count):
+            self.year_sum = grow(self.year_sum, (n_sectors,) + self.year_sum.shape[1:])
+            self.year_count = grow(self.year_count, (n_sectors,) + self.year_count.shape[1:])
+            self.latest_sum = grow(self.latest_sum, (n_sectors,) + self.latest_sum.shape[1:])
+            self.latest_count = grow(self.latest_count, (n_sectors,) + self.latest_count.shape[1:])
+            self.count = grow(self.count, (n_sectors,))
+
+    def _accumulate(self, sectors, year_values, latest_values, sign):
+        n_sectors = len(self.sectors)
+        for target, counts, values in ((self.year_sum, self.year_count, year_values),
+                                       (self.latest_sum, self.latest_count, latest_values)):
+            flat = values.reshape(len(values), -1)
+            present = ~np.isnan(flat)
+            for k in range(flat.shape[1]):
+                target.reshape(n_sectors, -1)[:, k] += sign * np.bincount(
+                    sectors, weights=np.where(present[:, k], flat[:, k], 0.0), minlength=n_sectors)
+                counts.reshape(n_sectors, -1)[:, k] += sign * np.bincount(
+                    sectors, weights=present[:, k], minlength=n_sectors).astype(np.int64)
+        self.count += sign * np.bincount(sectors, minlength=n_sectors)
+
+    def update(self, rows, store):
+        """Re-read `rows` from `store` (new rows are added) and adjust the sums"""
+        rows = np.unique(np.asarray(rows, dtype=np.intp))
+        if not len(rows):
+            return
+        with self._lock:
+            self._update(rows, store)
+
+    def _update(self, rows, store):
+        table = store.table
+        sectors = table['sector'].astype('category')
+        found, inverse = np.unique(sectors.cat.codes.to_numpy()[rows], return_inverse=True)
+        names = sectors.cat.categories[found]
+        codes = np.array([self._sector_code(name) for name in names], dtype=np.intp)[inverse]
+        self._grow(len(table))
+
+        old = rows[self._present[rows]]
+        if len(old):
+            self._accumulate(self._row_sector[old], self._row_year[old], self._row_latest[old], -1)
+            self._dirty.update(np.unique(self._row_sector[old]).tolist())
+
+        year_values = np.stack([np.asarray(store.prices, dtype=np.float64)[rows],
+                                store.stats[rows, :, 0], store.stats[rows, :, 1]], axis=1)
+        latest_values = np.column_stack([table[field].to_numpy(np.float64)[rows] for field in SECTOR_FIELDS])
+        self._row_sector[rows] = codes
+        self._row_year[rows] = year_values
+        self._row_latest[rows] = latest_values
+        self._present[rows] = True
+        self._accumulate(codes, year_values, latest_values, +1)
+        self._dirty.update(np.unique(codes).tolist())
+
+    def _refresh_percentiles(self):
+        psr = SECTOR_FIELDS.index('psr_score')
+        returns = SECTOR_FIELDS.index('expected_return')
+        for code in self._dirty:
+            members = np.flatnonzero(self._present & (self._row_sector == code))
+            values = self._row_latest[members][:, [psr, returns]]
+            if len(members):
+                self._percentiles[code] = np.nanpercentile(values, PERCENTILES, axis=0).T
+            else:
+                self._percentiles[code] = np.full((2, len(PERCENTILES)), np.nan)
+        self._dirty.clear()
+
+    def _means(self, sums, counts):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+
+    def year_frame(self, field='mean'):
+        """Sector x year mean of a YEAR_FIELDS value, one row per populated sector"""
+        k = YEAR_FIELDS.index(field)
+        live = np.flatnonzero(self.count)
+        means = self._means(self.year_sum[live, k], self.year_count[live, k])
+        return pd.DataFrame(means, index=[self.sectors[i] for i in live], columns=self.years)
+
+    def trend(self, sector, field='mean'):
+        """One sector's yearly mean of a YEAR_FIELDS value"""
+        k = YEAR_FIELDS.index(field)
+        code = self._codes[sector]
+        return pd.Series(self._means(self.year_sum[code, k], self.year_count[code, k]), index=self.years)
+
+    def sector_frame(self):
+        """Latest per-sector aggregates: counts, means and PSR/return percentiles"""
+        with self._lock:
+            if self._dirty:
+                self._refresh_percentiles()
+        live = np.flatnonzero(self.count)
+        means = self._means(self.latest_sum[live], self.latest_count[live])
+        columns = {'sector': [self.sectors[i] for i in live], 'companies': self.count[live]}
+        for k, field in enumerate(SECTOR_FIELDS):
+            columns[f'mean_{field}'] = means[:, k]
+        percentiles = (np.stack([self._percentiles[i] for i in live]) if len(live)
+                       else np.zeros((0, 2, len(PERCENTILES))))
+        for j, field in enumerate(('psr_score', 'expected_return')):
+            for p, q in enumerate(PERCENTILES):
+                columns[f'median_{field}' if q == 50 else f'p{q}_{field}'] = percentiles[:, j, p]
+        return pd.DataFrame(columns)
@@ -0,0 +1,123 @@
+YEARS = ['2018-19', '2019-20', '2020-21', '2021-22', '2022-23']
+
+# COMPREHENSIVE DATA STRUCTURE
+def create_comprehensive_data():
+    sectors_data = {
+        'Capital Goods - Electrical Equipment': {
+            'companies': {
+                'Edvenswa Enter': {
+                    'prices': [15.31, 14.05, 26.00, 78.55, 44.90],
+                    'stats': {
+                        '2018-19': {'mean': 12.759, 'sd': 13.908, 'skewness': 1.235, 'kurtosis': 0.389},
+                        '2019-20': {'mean': 17.716, 'sd': 12.350, 'skewness': 1.033, 'kurtosis': -0.030},
+                        '2020-21': {'mean': 26.290, 'sd': 15.911, 'skewness': 1.228, 'kurtosis': 0.681},
+                        '2021-22': {'mean': 30.844, 'sd': 24.810, 'skewness': 0.833, 'kurtosis': -0.699},
+                        '2022-23': {'mean': 25.215, 'sd': 15.650, 'skewness': 0.239, 'kurtosis': -1.297}
+                    },
+                    'expected_return': 1.933,
+                    'beta': 1.2,
+                    'sharpe_ratio': 0.85,
+                    'market_cap': 450,
+                    'volume': 125000,
+                    'interpretation': "High growth potential with moderate risk. Strong bullish sentiment."
+                },
+                'Dhanashree Elect': {
+                    'prices': [16.00, 17.35, 17.60, 21.10, 23.50],
+                    'stats': {
+                        '2018-19': {'mean': 12.759, 'sd': 13.908, 'skewness': 1.235, 'kurtosis': 0.389},
+                        '2019-20': {'mean': 17.716, 'sd': 12.350, 'skewness': 1.033, 'kurtosis': -0.030},
+                        '2020-21': {'mean': 26.290, 'sd': 15.911, 'skewness': 1.228, 'kurtosis': 0.681},
+                        '2021-22': {'mean': 30.844, 'sd': 24.810, 'skewness': 0.833, 'kurtosis': -0.699},
+                        '2022-23': {'mean': 25.215, 'sd': 15.650, 'skewness': 0.239, 'kurtosis': -1.297}
+                    },
+                    'expected_return': 0.469,
+                    'beta': 0.8,
+                    'sharpe_ratio': 1.2,
+                    'market_cap': 320,
+                    'volume': 89000,
+                    'interpretation': "Stable growth stock with low volatility. Ideal for conservative investors."
+                }
+            }
+        },
+        'Cement': {
+            'companies': {
+                'Shiva Cement': {
+                    'prices': [13.60, 19.43, 35.10, 55.90, 46.93],
+                    'stats': {
+                        '2018-19': {'mean': 12.419, 'sd': 12.784, 'skewness': 1.205, 'kurtosis': 0.139},
+                        '2019-20': {'mean': 21.694, 'sd': 20.612, 'skewness': 1.281, 'kurtosis': 0.370},
+                        '2020-21': {'mean': 31.416, 'sd': 22.339, 'skewness': 0.819, 'kurtosis': -0.577},
+                        '2021-22': {'mean': 30.569, 'sd': 19.313, 'skewness': 0.522, 'kurtosis': -1.037},
+                        '2022-23': {'mean': 26.315, 'sd': 16.286, 'skewness': 0.600, 'kurtosis': -1.086}
+                    },
+                    'expected_return': 2.451,
+                    'beta': 1.5,
+                    'sharpe_ratio': 1.1,
+                    'market_cap': 1200,
+                    'volume': 450000,
+                    'interpretation': "Exceptional returns with moderate risk. Strong sector momentum."
+                }
+            }
+        },
+        'Chemicals': {
+            'companies': {
+                'Pentokey Organy': {
+                    'prices': [7.98, 5.61, 21.40, 21.00, 48.00],
+                    'stats': {
+                        '2018-19': {'mean': 25.399, 'sd': 26.923, 'skewness': 1.660, 'kurtosis': 1.853},
+                        '2019-20': {'mean': 32.509, 'sd': 44.583, 'skewness': 2.313, 'kurtosis': 4.388},
+                        '2020-21': {'mean': 48.465, 'sd': 53.592, 'skewness': 0.464, 'kurtosis': -1.784},
+                        '2021-22': {'mean': 31.896, 'sd': 25.853, 'skewness': 0.367, 'kurtosis': -1.392},
+                        '2022-23': {'mean': 22.503, 'sd': 19.720, 'skewness': 0.433, 'kurtosis': -1.719}
+                    },
+                    'expected_return': 5.015,
+                    'beta': 1.8,
+                    'sharpe_ratio': 1.4,
+                    'market_cap': 850,
+                    'volume': 320000,
+                    'interpretation': "Extreme growth stock with high volatility. For aggressive investors only."
+                }
+            }
+        },
+        'IT - Software': {
+            'companies': {
+                'Cressanda Solns': {
+                    'prices': [0.19, 0.27, 6.47, 26.75, 23.91],
+                    'stats': {
+                        '2018-19': {'mean': 11.006, 'sd': 14.517, 'skewness': 0.647, 'kurtosis': -1.112},
+                        '2019-20': {'mean': 17.818, 'sd': 19.053, 'skewness': 0.517, 'kurtosis': -1.475},
+                        '2020-21': {'mean': 62.194, 'sd': 42.936, 'skewness': 0.848, 'kurtosis': -0.783},
+                        '2021-22': {'mean': 32.249, 'sd': 20.749, 'skewness': 0.054, 'kurtosis': -1.627},
+                        '2022-23': {'mean': 27.544, 'sd': 15.520, 'skewness': 0.624, 'kurtosis': -1.171}
+                    },
+                    'expected_return': 124.842,
+                    'beta': 2.2,
+                    'sharpe_ratio': 2.8,
+                    'market_cap': 1500,
+                    'volume': 2800000,
+                    'interpretation': "Mega multi-bagger with extreme risk. Purely speculative investment."
+                }
+            }
+        },
+        'Pharmaceuticals': {
+            'companies': {
+                'Syschem (India)': {
+                    'prices': [6.43, 7.13, 16.51, 46.10, 47.84],
+                    'stats': {
+                        '2018-19': {'mean': 14.959, 'sd': 8.472, 'skewness': 0.176, 'kurtosis': -1.971},
+                        '2019-20': {'mean': 33.859, 'sd': 25.855, 'skewness': 0.469, 'kurtosis': -1.034},
+                        '2020-21': {'mean': 50.570, 'sd': 25.830, 'skewness': 0.239, 'kurtosis': -1.911},
+                        '2021-22': {'mean': 37.924, 'sd': 19.807, 'skewness': 0.647, 'kurtosis': -1.285},
+                        '2022-23': {'mean': 28.040, 'sd': 14.670, 'skewness': 0.239, 'kurtosis': -1.065}
+                    },
+                    'expected_return': 6.440,
+                    'beta': 1.4,
+                    'sharpe_ratio': 1.8,
+                    'market_cap': 920,
+                    'volume': 180000,
+                    'interpretation': "Strong growth with good risk-reward ratio. Sector tailwinds from healthcare."
+                }
+            }
+        }
+    }
+    return sectors_data
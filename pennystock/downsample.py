@@ -0,0 +1,36 @@
+import numpy as np
+
+# SERIES DOWNSAMPLING
+def lttb(y, threshold, x=None):
+    """Indices of `threshold` points that keep the visual shape of (x, y).
+
+    Largest-Triangle-Three-Buckets: the first and last points are kept
+    and every bucket in between contributes the point that makes the
+    largest triangle with the point kept from the previous bucket and the
+    mean of the next one, so peaks and troughs survive.  x defaults to the
+    positions; points where x or y is NaN are dropped.  A series that
+    already fits is returned whole.
+    """
+    if threshold < 3:
+        raise ValueError(f"threshold must be at least 3, got {threshold}")
+    y = np.asarray(y, dtype=np.float64)
+    x = np.arange(len(y), dtype=np.float64) if x is None else np.asarray(x, dtype=np.float64)
+    valid = np.flatnonzero(~np.isnan(x) & ~np.isnan(y))
+    if len(valid) <= threshold:
+        return valid
+    xs, ys = x[valid], y[valid]
+    last = len(valid) - 1
+    edges = np.linspace(1, last, threshold - 1).astype(np.intp)
+    # Mean of each bucket, and of the final point standing in for the one after the last bucket
+    counts = np.diff(edges)
+    next_x = np.append(np.add.reduceat(xs[:last], edges[:-1]) / counts, xs[last])[1:]
+    next_y = np.append(np.add.reduceat(ys[:last], edges[:-1]) / counts, ys[last])[1:]
+
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, last
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((xs[a] - next_x[i]) * (ys[lo:hi] - ys[a]) - (xs[a] - xs[lo:hi]) * (next_y[i] - ys[a]))
+        a = selected[i + 1] = lo + int(np.argmax(area))
+    return valid[selected]
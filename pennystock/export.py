@@ -0,0 +1,157 @@
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .store import STAT_FIELDS
+
+# Per-company columns of a universe export, in order
+EXPORT_COLUMNS = ('company', 'sector', 'psr_score', 'rps', 'rvs', 'sds', 'risk_profile', 'expected_return',
+                  'current_price', 'mean', 'sd', 'skewness', 'kurtosis', 'sharpe_ratio', 'beta',
+                  'market_cap', 'volume')
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+}
+
+# Data rows that fit on one Excel sheet under the header
+XLSX_MAX_ROWS = 1_048_575
+
+# CHUNKED SOURCES
+def universe_chunks(store, rows=None, columns=EXPORT_COLUMNS, per_year=False, chunk_size=50_000):
+    """The scored universe (or `rows` of it, in that order) as DataFrames of chunk_size rows.
+
+    With per_year, every chunk also carries price_<year> and <stat>_<year>
+    columns for each of the store's years.  At least one chunk, possibly
+    empty, is always produced so writers can emit a header.
+    """
+    rows = np.arange(len(store.table)) if rows is None else np.asarray(rows, dtype=np.intp)
+    for start in range(0, max(len(rows), 1), chunk_size):
+        part = rows[start:start + chunk_size]
+        frame = store.table.iloc[part][list(columns)].reset_index(drop=True)
+        for column in frame.columns:
+            if isinstance(frame[column].dtype, pd.CategoricalDtype):
+                frame[column] = frame[column].astype(str)
+        if per_year:
+            history = {}
+            for j, year in enumerate(store.years):
+                history[f'price_{year}'] = store.prices[part, j]
+                for k, field in enumerate(STAT_FIELDS):
+                    history[f'{field}_{year}'] = store.stats[part, j, k]
+            frame = pd.concat([frame, pd.DataFrame(history)], axis=1)
+        yield frame
+
+# STREAMING WRITERS
+def write_csv(chunks, sink, na_rep=''):
+    text = io.TextIOWrapper(sink, encoding='utf-8', newline='', write_through=True)
+    try:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(text, index=False, header=i == 0, na_rep=na_rep)
+    finally:
+        text.detach()
+
+def write_parquet(chunks, sink):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(sink, table.schema)
+            elif table.schema != writer.schema:
+                table = table.cast(writer.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def write_xlsx(chunks, sink, sheet='Export'):
+    from openpyxl import Workbook
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(sheet)
+    written = 0
+    for i, chunk in enumerate(chunks):
+        if i == 0:
+            worksheet.append(list(chunk.columns))
+        written += len(chunk)
+        if written > XLSX_MAX_ROWS:
+            raise ValueError(f"XLSX holds at most {XLSX_MAX_ROWS:,} rows; export as CSV or Parquet")
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            worksheet.append(row)
+    workbook.save(sink)
+
+WRITERS = {'csv': write_csv, 'parquet': write_parquet, 'xlsx': write_xlsx}
+
+def export_formats():
+    """Formats whose writer can run here (XLSX needs openpyxl)"""
+    return [fmt for fmt in EXPORT_FORMATS if fmt != 'xlsx' or importlib.util.find_spec('openpyxl')]
+
+def write_export(chunks, sink, fmt, **options):
+    """Stream DataFrame chunks to a binary file object in `fmt`"""
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {list(WRITERS)}")
+    WRITERS[fmt](chunks, sink, **options)
+
+# EXPORT CACHE
+def export_key(*parts):
+    """Content hash of whatever decides an export's contents (data version, filters, format)"""
+    payload = json.dumps(parts, sort_keys=True, default=str).encode()
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+class ExportCache:
+    """Finished export files on disk, one per key.
+
+    get() writes the file on first request only, streaming chunks to a
+    temporary file renamed into place, so a half-written export is never
+    served.  The least recently used files beyond max_files are deleted.
+    """
+
+    def __init__(self, directory=None, max_files=16):
+        self.directory = directory or os.path.join(tempfile.gettempdir(), 'pennystock-exports')
+        self.max_files = max_files
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._building = {}
+
+    def path(self, key, fmt):
+        return os.path.join(self.directory, f'{key}.{fmt}')
+
+    def get(self, key, fmt, chunks, **options):
+        """Path of the export for `key`, writing it from `chunks()` if missing"""
+        path = self.path(key, fmt)
+        with self._lock:
+            lock = self._building.setdefault(path, threading.Lock())
+        with lock:
+            if os.path.exists(path):
+                os.utime(path)
+                return path
+            handle, partial = tempfile.mkstemp(dir=self.directory, suffix='.part')
+            try:
+                with os.fdopen(handle, 'wb') as sink:
+                    write_export(chunks(), sink, fmt, **options)
+                os.replace(partial, path)
+            except BaseException:
+                os.unlink(partial)
+                raise
+        self._evict()
+        return path
+
+    def _evict(self):
+        files = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                 if name.rsplit('.', 1)[-1] in EXPORT_FORMATS]
+        files.sort(key=os.path.getmtime, reverse=True)
+        for stale in files[self.max_files:]:
+            try:
+                os.unlink(stale)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,264 @@
+import glob
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from .moments import combine_moments, finalize_moments, group_moments, update_moments
+
+# Accepted spellings of each field across the legacy BSE equity bhavcopy
+# (EQddmmyy.CSV) and the newer UDiFF common bhavcopy
+COLUMN_ALIASES = {
+    'code': ['SC_CODE', 'FinInstrmId', 'SYMBOL'],
+    'name': ['SC_NAME', 'FinInstrmNm', 'TckrSymb'],
+    'close': ['CLOSE', 'ClsPric', 'CLOSE_PRICE'],
+    'volume': ['NO_OF_SHRS', 'TtlTradgVol', 'TOTTRDQTY'],
+    'date': ['TRADING_DATE', 'TradDt', 'TIMESTAMP', 'DATE']
+}
+
+_FILENAME_DATE = re.compile(r'(\d{2})(\d{2})(\d{2})(?!\d)')
+
+# BHAVCOPY INGESTION
+def financial_year(dates):
+    """Indian financial year label ('2022-23') for each date (April-March)"""
+    dates = pd.DatetimeIndex(dates)
+    start = dates.year - (dates.month < 4)
+    return pd.Index(start.astype(str) + '-' + ((start + 1) % 100).astype(str).str.zfill(2))
+
+def _resolve_columns(header):
+    header = [column.strip() for column in header]
+    resolved = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in header:
+                resolved[field] = alias
+                break
+    missing = {'code', 'close'} - set(resolved)
+    if missing:
+        raise ValueError(f"Bhavcopy is missing required columns: {sorted(missing)}")
+    return resolved
+
+def _filename_date(path):
+    """Trade date encoded in a legacy EQddmmyy.CSV file name"""
+    match = _FILENAME_DATE.search(os.path.basename(path))
+    if not match:
+        raise ValueError(f"No trade date column and none in file name: {path}")
+    day, month, year = match.groups()
+    return pd.Timestamp(2000 + int(year), int(month), int(day))
+
+def _parse_dates(values):
+    # ISO dates (UDiFF) first; anything else is day-first as BSE prints it
+    dates = pd.to_datetime(values, format='ISO8601', errors='coerce')
+    rest = dates.isna()
+    if rest.any():
+        dates[rest] = pd.to_datetime(values[rest], format='mixed', dayfirst=True)
+    return dates
+
+def read_bhavcopy(path, chunksize=500_000):
+    """Stream one bhavcopy file as normalized chunks.
+
+    Yields frames with columns code, name, close, volume and date.  Plain
+    and compressed (.zip/.gz) CSVs are read through pandas in `chunksize`
+    rows at a time.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    resolved = _resolve_columns(header)
+    rename = {alias: field for field, alias in resolved.items()}
+    fixed_date = None if 'date' in resolved else _filename_date(path)
+
+    reader = pd.read_csv(path, usecols=lambda c: c.strip() in rename, chunksize=chunksize,
+                         skipinitialspace=True, dtype={resolved['code']: str})
+    for chunk in reader:
+        chunk.columns = [rename[c.strip()] for c in chunk.columns]
+        chunk['code'] = chunk['code'].str.strip()
+        chunk['name'] = chunk['name'].str.strip() if 'name' in chunk else chunk['code']
+        chunk['close'] = pd.to_numeric(chunk['close'], errors='coerce')
+        chunk['volume'] = pd.to_numeric(chunk['volume'], errors='coerce') if 'volume' in chunk else np.nan
+        chunk['date'] = _parse_dates(chunk['date']) if fixed_date is None else fixed_date
+        yield chunk[['code', 'name', 'close', 'volume', 'date']].dropna(subset=['close'])
+
+class BhavcopyIngestor:
+    """One-pass accumulator of per-scrip, per-financial-year statistics.
+
+    Feed it normalized bhavcopy chunks with `add`; it keeps only a moment
+    state and the last close per (code, year), so memory is bounded by the
+    number of scrips times years, not by the number of trading days.
+    """
+
+    def __init__(self):
+        self.moments = None
+        self.closes = None
+        self.volumes = None
+        self.names = {}
+        self._name_counts = None
+
+    def add(self, chunk):
+        if len(chunk) == 0:
+            return
+        chunk = chunk.assign(year=financial_year(chunk['date']))
+        self.moments = combine_moments(self.moments, group_moments(chunk, ['code', 'year'], 'close'))
+
+        last = chunk.sort_values('date').groupby(['code', 'year'], sort=False).tail(1)
+        last = last.set_index(['code', 'year'])[['date', 'close']]
+        self.closes = last if self.closes is None else (
+            pd.concat([self.closes, last]).sort_values('date', kind='stable')
+            .groupby(level=['code', 'year']).tail(1))
+
+        volume = chunk.groupby(['code', 'year'], sort=False)['volume'].agg(['sum', 'count'])
+        self.volumes = volume if self.volumes is None else self.volumes.add(volume, fill_value=0)
+
+        self._update_names(chunk)
+
+    def add_day(self, chunk):
+        """Fold in one or a few new trading days in O(new rows).
+
+        Unlike `add`, which rebuilds the state frames, this updates only
+        the (code, year) rows the new days touch.  Returns their index so
+        callers can refresh just those companies.
+        """
+        if self.moments is None:
+            self.add(chunk)
+            return self.moments.index
+        chunk = chunk.assign(year=financial_year(chunk['date']))
+        delta = group_moments(chunk, ['code', 'year'], 'close')
+        self.moments = update_moments(self.moments, delta)
+
+        last = chunk.sort_values('date').groupby(['code', 'year'], sort=False).tail(1)
+        last = last.set_index(['code', 'year'])[['date', 'close']].reindex(delta.index)
+        pos = self.closes.index.get_indexer(last.index)
+        known = pos >= 0
+        newer = known.copy()
+        newer[known] = last['date'].to_numpy()[known] >= self.closes['date'].to_numpy()[pos[known]]
+        if newer.any():
+            self.closes.iloc[pos[newer]] = last[newer][['date', 'close']].to_numpy()
+        if not known.all():
+            self.closes = pd.concat([self.closes, last[~known]])
+
+        volume = chunk.groupby(['code', 'year'], sort=False)['volume'].agg(['sum', 'count']).reindex(delta.index)
+        pos = self.volumes.index.get_indexer(volume.index)
+        known = pos >= 0
+        if known.any():
+            self.volumes.iloc[pos[known]] = self.volumes.iloc[pos[known]].to_numpy() + volume[known].to_numpy()
+        if not known.all():
+            self.volumes = pd.concat([self.volumes, volume[~known]])
+
+        self._update_names(chunk)
+        return delta.index
+
+    def _update_names(self, chunk):
+        latest = chunk.drop_duplicates('code', keep='last').set_index('code')['name'].to_dict()
+        changed = {code: name for code, name in latest.items() if self.names.get(code) != name}
+        if changed:
+            self.names.update(changed)
+            self._name_counts = None
+
+    def year_stats(self, keys=None):
+        """Frame indexed by (code, year) with close, mean, sd, skewness, kurtosis.
+
+        `keys` restricts the result to those (code, year) rows.
+        """
+        moments = self.moments if keys is None else self.moments.loc[keys]
+        stats = finalize_moments(moments)
+        stats['close'] = self.closes['close'].reindex(stats.index)
+        stats['volume'] = (self.volumes['sum'] / self.volumes['count']).reindex(stats.index)
+        return stats if keys is not None else stats.sort_index()
+
+    def company_key(self, code):
+        """Company name used in to_sectors_data, disambiguated by code"""
+        if self._name_counts is None:
+            self._name_counts = pd.Series(list(self.names.values())).value_counts().to_dict()
+        name = self.names.get(code, code)
+        return name if self._name_counts.get(name, 0) <= 1 else f"{name} ({code})"
+
+    def save(self, path):
+        """Persist the accumulator state (count, mean, M2, M3, M4 per row)"""
+        pd.to_pickle({'moments': self.moments, 'closes': self.closes,
+                      'volumes': self.volumes, 'names': self.names}, path)
+
+    @classmethod
+    def load(cls, path):
+        state = pd.read_pickle(path)
+        ingestor = cls()
+        ingestor.moments = state['moments']
+        ingestor.closes = state['closes']
+        ingestor.volumes = state['volumes']
+        ingestor.names = state['names']
+        return ingestor
+
+    def to_sectors_data(self, sectors=None, years=None, default_sector='Unclassified'):
+        """Nested create_comprehensive_data dict built from the ingested days.
+
+        `sectors` maps scrip code (or name) to sector.  `years` limits the
+        output to those financial years; by default every ingested year is
+        kept.  expected_return is the total return between the first and
+        last traded annual close, as in the hand-entered universe; beta and
+        sharpe_ratio are left out so the scorer falls back to the
+        coefficient of variation.  Prices are aligned with `years`, NaN for
+        a year the scrip did not trade, so a delisted scrip keeps its
+        history where it was.  Moments a year has too few trading days for
+        are reported as 0.
+        """
+        sectors = sectors or {}
+        stats = self.year_stats()
+        if years is None:
+            years = sorted(stats.index.get_level_values('year').unique())
+        sectors_data = {}
+        for code, company_stats in stats.groupby(level='code', sort=False):
+            aligned = company_stats.droplevel('code').reindex(years)
+            company_stats = aligned.dropna(subset=['close'])
+            if company_stats.empty:
+                continue
+            name = self.names.get(code, code)
+            sector = sectors.get(code, sectors.get(name, default_sector))
+            prices = aligned['close'].round(2).tolist()
+            traded = company_stats['close'].round(2)
+            companies = sectors_data.setdefault(sector, {'companies': {}})['companies']
+            companies[self.company_key(code)] = {
+                'prices': prices,
+                'stats': {
+                    year: {field: float(row[field]) if np.isfinite(row[field]) else 0.0
+                           for field in ('mean', 'sd', 'skewness', 'kurtosis')}
+                    for year, row in company_stats.iterrows()
+                },
+                'expected_return': traded.iloc[-1] / traded.iloc[0] - 1 if traded.iloc[0] > 0 else 0.0,
+                'volume': int(company_stats['volume'].iloc[-1]) if np.isfinite(company_stats['volume'].iloc[-1]) else 0,
+                'interpretation': f"Ingested from BSE bhavcopy ({code})."
+            }
+        return sectors_data
+
+def ingest_bhavcopies(paths, chunksize=500_000):
+    """Stream every bhavcopy in `paths` (files, directories or globs)"""
+    ingestor = BhavcopyIngestor()
+    buffered, buffered_rows = [], 0
+    for path in expand_paths(paths):
+        for chunk in read_bhavcopy(path, chunksize=chunksize):
+            # Daily files are small; batch them up so each merge covers
+            # many trading days instead of one.
+            buffered.append(chunk)
+            buffered_rows += len(chunk)
+            if buffered_rows >= chunksize:
+                ingestor.add(pd.concat(buffered, ignore_index=True))
+                buffered, buffered_rows = [], 0
+    if buffered:
+        ingestor.add(pd.concat(buffered, ignore_index=True))
+    return ingestor
+
+def expand_paths(paths):
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    files = []
+    for path in map(str, paths):
+        if os.path.isdir(path):
+            files.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path)
+                if name.lower().endswith(('.csv', '.zip', '.gz'))
+            ))
+        else:
+            files.extend(sorted(glob.glob(path)) or [path])
+    return files
+
+def load_sector_map(path):
+    """Read a code/name -> sector mapping from a two-column CSV"""
+    frame = pd.read_csv(path, dtype=str)
+    return dict(zip(frame.iloc[:, 0].str.strip(), frame.iloc[:, 1].str.strip()))
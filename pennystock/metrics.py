@@ -0,0 +1,217 @@
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from .moments import sample_stats
+from .simulation import TRADING_DAYS
+
+# Named look-back windows in trading days; None is the whole history
+WINDOWS = {'1M': 21, '3M': 63, '1Y': TRADING_DAYS, '3Y': 3 * TRADING_DAYS, 'ALL': None}
+
+# Columns of StatsEngine.metrics, per company and window
+METRIC_COLUMNS = ['observations', 'return', 'volatility', 'sharpe_ratio', 'beta', 'max_drawdown',
+                  'skewness', 'kurtosis']
+
+# DAILY SERIES
+def forward_fill(closes):
+    """Carry the last traded close over non-trading (NaN) days along the last axis"""
+    closes = np.asarray(closes, dtype=np.float64)
+    positions = np.where(~np.isnan(closes), np.arange(closes.shape[-1]), 0)
+    np.maximum.accumulate(positions, axis=-1, out=positions)
+    return np.take_along_axis(closes, positions, axis=-1)
+
+def daily_returns(closes):
+    """Simple returns aligned with the closes; NaN on days without a trade.
+
+    A return after a gap runs from the last traded close, so illiquid
+    scrips are not credited with zero-return days they never traded.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    previous = forward_fill(closes)[..., :-1]
+    returns = np.full(closes.shape, np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns[..., 1:] = np.where(previous > 0, closes[..., 1:] / previous - 1, np.nan)
+    return returns
+
+# WINDOW KERNELS
+def _window_sums(values, window, rolling):
+    # Trailing-window sums along the last axis, one per day from cumulative
+    # sums; without rolling the values are already cut to the last window
+    if not rolling:
+        return values.sum(axis=-1)
+    sums = np.cumsum(values, axis=-1)
+    if window and window < sums.shape[-1]:
+        sums[..., window:] -= sums[..., :-window].copy()
+    return sums
+
+def window_moments(returns, window=None, rolling=False):
+    """Count, mean, SD, skewness and excess kurtosis of returns over a window.
+
+    With rolling, every day gets the moments of the `window` days ending
+    on it, computed from cumulative power sums in O(days) whatever the
+    window; otherwise only the window ending on the last day is computed.
+    Returns are shifted by each row's mean first, which leaves the
+    moments unchanged but keeps the power sums well conditioned.
+    """
+    returns = np.asarray(returns, dtype=np.float64)
+    if window and not rolling:
+        returns = returns[..., -window:]
+    valid = ~np.isnan(returns)
+    with np.errstate(invalid='ignore'):
+        shift = np.nan_to_num(np.nanmean(np.where(valid, returns, np.nan), axis=-1, keepdims=True))
+    x = np.where(valid, returns - shift, 0.0)
+    x2 = x * x
+    n = _window_sums(valid.astype(np.float64), window, rolling)
+    s1, s2, s3, s4 = (_window_sums(power, window, rolling) for power in (x, x2, x2 * x, x2 * x2))
+    if not rolling:
+        shift = shift[..., 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mu = np.where(n > 0, s1 / n, np.nan)
+    m2 = np.maximum(s2 - n * mu ** 2, 0.0)
+    m3 = s3 - 3 * mu * s2 + 2 * n * mu ** 3
+    m4 = s4 - 4 * mu * s3 + 6 * mu ** 2 * s2 - 3 * n * mu ** 4
+    sd, skewness, kurtosis = sample_stats(n, m2, m3, m4)
+    return {'n': n, 'mean': mu + shift, 'sd': sd, 'skewness': skewness, 'kurtosis': kurtosis}
+
+def window_beta(returns, market, window=None, rolling=False):
+    """Beta of each row's returns on `market` over days both have a return"""
+    returns = np.asarray(returns, dtype=np.float64)
+    market = np.broadcast_to(np.asarray(market, dtype=np.float64), returns.shape)
+    if window and not rolling:
+        returns, market = returns[..., -window:], market[..., -window:]
+    valid = ~np.isnan(returns) & ~np.isnan(market)
+    with np.errstate(invalid='ignore'):
+        x = np.where(valid, returns - np.nan_to_num(np.nanmean(returns, axis=-1, keepdims=True)), 0.0)
+        y = np.where(valid, market - np.nan_to_num(np.nanmean(market, axis=-1, keepdims=True)), 0.0)
+    n, sx, sy, sxy, syy = (_window_sums(values, window, rolling)
+                           for values in (valid.astype(np.float64), x, y, x * y, y * y))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariance = sxy - sx * sy / n
+        variance = syy - sy * sy / n
+        return np.where((n > 1) & (variance > 0), covariance / variance, np.nan)
+
+def max_drawdown(closes, window=None):
+    """Largest peak-to-trough fall of each row's closes within the last `window` days"""
+    filled = forward_fill(closes)[..., -window:] if window else forward_fill(closes)
+    peaks = np.fmax.accumulate(filled, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdowns = np.where(peaks > 0, filled / peaks - 1, np.nan)
+    drawdowns[np.isnan(drawdowns)] = 0.0
+    return drawdowns.min(axis=-1)
+
+def rolling_drawdown(closes, window=None):
+    """Fall of each day's close from the highest close of the `window` days ending on it"""
+    filled = forward_fill(closes)
+    if window and window < filled.shape[-1]:
+        padded = np.concatenate([np.full(filled.shape[:-1] + (window - 1,), np.nan), filled], axis=-1)
+        windows = np.lib.stride_tricks.sliding_window_view(padded, window, axis=-1)
+        with np.errstate(invalid='ignore'):
+            peaks = np.where(np.isnan(windows), -np.inf, windows).max(axis=-1)
+    else:
+        peaks = np.fmax.accumulate(filled, axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(peaks > 0, filled / peaks - 1, np.nan)
+
+# STATISTICS ENGINE
+class StatsEngine:
+    """Return, risk and distribution metrics derived from daily closes.
+
+    `closes` is (n_companies, n_days) with NaN on non-trading days and
+    `dates` their dates in order.  `index` is a benchmark close series
+    (e.g. the BSE Sensex), aligned with `dates` or a Series indexed by
+    date, that beta is measured against; without one beta is NaN.
+    Windows are names from `windows` or a number of trading days.
+
+    metrics(window) computes one window for every company at once and is
+    cached per window; company(name, window) reads from that frame.
+    rolling(name, window) is the daily series of one company, cached per
+    (company, window) up to cache_size entries.
+    """
+
+    def __init__(self, closes, dates, companies=None, index=None, windows=WINDOWS, risk_free=0.0,
+                 cache_size=256):
+        self.closes = np.asarray(closes, dtype=np.float64)
+        self.dates = pd.DatetimeIndex(dates)
+        if self.closes.shape[-1] != len(self.dates):
+            raise ValueError(f"closes have {self.closes.shape[-1]} days but {len(self.dates)} dates were given")
+        self.companies = list(companies) if companies is not None else list(range(len(self.closes)))
+        self.windows = dict(windows)
+        self.risk_free = risk_free
+        self.cache_size = cache_size
+        self.filled = forward_fill(self.closes)
+        self.returns = daily_returns(self.closes)
+        self.index_returns = None
+        if index is not None:
+            if isinstance(index, pd.Series):
+                index = index.reindex(self.dates)
+            self.index_returns = daily_returns(np.asarray(index, dtype=np.float64))
+        self._rows = {company: i for i, company in enumerate(self.companies)}
+        self._frames = {}
+        self._series = OrderedDict()
+
+    def window_days(self, window):
+        """Trading days in a named or numeric window, None for the whole history"""
+        if window in self.windows:
+            return self.windows[window]
+        if isinstance(window, (int, np.integer)) and window > 1:
+            return int(window)
+        raise ValueError(f"Unknown window {window!r}; expected one of {list(self.windows)} or a day count")
+
+    def _beta(self, returns, days, rolling):
+        if self.index_returns is None:
+            return np.full(returns.shape if rolling else returns.shape[:-1], np.nan)
+        return window_beta(returns, self.index_returns, days, rolling=rolling)
+
+    def metrics(self, window='1Y'):
+        """One row per company: observations, return, annualised volatility and
+        Sharpe ratio, beta, max drawdown, skewness and excess kurtosis"""
+        days = self.window_days(window)
+        if days not in self._frames:
+            moments = window_moments(self.returns, days)
+            # Window return from the first close traded in it (the close before its first day)
+            span = self.filled[:, -days - 1:] if days else self.filled
+            start = span[np.arange(len(span)), np.argmax(~np.isnan(span), axis=1)]
+            with np.errstate(divide='ignore', invalid='ignore'):
+                total = np.where(start > 0, self.filled[:, -1] / start - 1, np.nan)
+                sharpe = (moments['mean'] - self.risk_free / TRADING_DAYS) / moments['sd'] * np.sqrt(TRADING_DAYS)
+            self._frames[days] = pd.DataFrame({
+                'observations': moments['n'].astype(np.int64),
+                'return': total,
+                'volatility': moments['sd'] * np.sqrt(TRADING_DAYS),
+                'sharpe_ratio': np.where(np.isfinite(sharpe), sharpe, np.nan),
+                'beta': self._beta(self.returns, days, rolling=False),
+                'max_drawdown': max_drawdown(span),
+                'skewness': moments['skewness'],
+                'kurtosis': moments['kurtosis']
+            }, index=pd.Index(self.companies, name='company'), columns=METRIC_COLUMNS)
+        return self._frames[days]
+
+    def company(self, company, window='1Y'):
+        """Metrics of one company over one window, as a dict"""
+        return self.metrics(window).iloc[self._rows[company]].to_dict()
+
+    def rolling(self, company, window='3M'):
+        """Daily series of one company's trailing-window metrics, indexed by date"""
+        days = self.window_days(window)
+        key = (company, days)
+        if key in self._series:
+            self._series.move_to_end(key)
+            return self._series[key]
+        rows = [self._rows[company]]
+        moments = window_moments(self.returns[rows], days, rolling=True)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sharpe = (moments['mean'] - self.risk_free / TRADING_DAYS) / moments['sd'] * np.sqrt(TRADING_DAYS)
+        series = pd.DataFrame({
+            'observations': moments['n'][0].astype(np.int64),
+            'volatility': moments['sd'][0] * np.sqrt(TRADING_DAYS),
+            'sharpe_ratio': np.where(np.isfinite(sharpe[0]), sharpe[0], np.nan),
+            'beta': self._beta(self.returns[rows], days, rolling=True)[0],
+            'drawdown': rolling_drawdown(self.closes[rows], days)[0],
+            'skewness': moments['skewness'][0],
+            'kurtosis': moments['kurtosis'][0]
+        }, index=self.dates)
+        self._series[key] = series
+        if len(self._series) > self.cache_size:
+            self._series.popitem(last=False)
+        return series
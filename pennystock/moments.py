@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+# Columns of a moment state frame: count, mean and central moment sums
+MOMENT_COLUMNS = ['n', 'mean', 'm2', 'm3', 'm4']
+
+# ONLINE MOMENT ACCUMULATORS
+def group_moments(frame, by, value):
+    """Moment state of frame[value] grouped by the `by` columns.
+
+    Returns a frame indexed by the group keys with MOMENT_COLUMNS, where
+    m2..m4 are sums of powered deviations from the group mean.
+    """
+    values = frame[value].astype(np.float64)
+    mean = values.groupby([frame[key] for key in by], sort=False).transform('mean')
+    dev = values - mean
+    dev2 = dev * dev
+    powers = pd.DataFrame({'n': 1.0, 'mean': values, 'm2': dev2, 'm3': dev2 * dev, 'm4': dev2 * dev2})
+    for key in by:
+        powers[key] = frame[key]
+    state = powers.groupby(by, sort=False).agg(
+        n=('n', 'sum'), mean=('mean', 'mean'), m2=('m2', 'sum'), m3=('m3', 'sum'), m4=('m4', 'sum'))
+    return state
+
+def combine_moments(a, b):
+    """Merge two moment states (Pebay's pairwise update), aligned on index"""
+    if a is None or len(a) == 0:
+        return b.copy()
+    if b is None or len(b) == 0:
+        return a.copy()
+    index = a.index.union(b.index)
+    a = a.reindex(index, fill_value=0.0)
+    b = b.reindex(index, fill_value=0.0)
+    na, nb = a['n'].to_numpy(), b['n'].to_numpy()
+    n = na + nb
+    safe_n = np.where(n > 0, n, 1.0)
+    delta = b['mean'].to_numpy() - a['mean'].to_numpy()
+    m2a, m2b = a['m2'].to_numpy(), b['m2'].to_numpy()
+    m3a, m3b = a['m3'].to_numpy(), b['m3'].to_numpy()
+
+    mean = a['mean'].to_numpy() + delta * nb / safe_n
+    m2 = m2a + m2b + delta ** 2 * na * nb / safe_n
+    m3 = (m3a + m3b
+          + delta ** 3 * na * nb * (na - nb) / safe_n ** 2
+          + 3 * delta * (na * m2b - nb * m2a) / safe_n)
+    m4 = (a['m4'].to_numpy() + b['m4'].to_numpy()
+          + delta ** 4 * na * nb * (na * na - na * nb + nb * nb) / safe_n ** 3
+          + 6 * delta ** 2 * (na * na * m2b + nb * nb * m2a) / safe_n ** 2
+          + 4 * delta * (na * m3b - nb * m3a) / safe_n)
+    return pd.DataFrame({'n': n, 'mean': mean, 'm2': m2, 'm3': m3, 'm4': m4}, index=index)
+
+def finalize_moments(state):
+    """Mean, SD, skewness and excess kurtosis from a moment state.
+
+    Uses the sample estimators (as Excel's STDEV.S, SKEW and KURT), which
+    is how the hard-coded yearly stats were produced.  Groups too small for
+    an estimator get NaN.
+    """
+    sd, skewness, kurtosis = sample_stats(*(state[c].to_numpy() for c in ('n', 'm2', 'm3', 'm4')))
+    return pd.DataFrame({'mean': state['mean'].to_numpy(), 'sd': sd,
+                         'skewness': skewness, 'kurtosis': kurtosis}, index=state.index)
+
+def sample_stats(n, m2, m3, m4):
+    """Array form of finalize_moments: (sd, skewness, kurtosis)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sd = np.where(n > 1, np.sqrt(m2 / (n - 1)), np.nan)
+        skewness = np.where((n > 2) & (m2 > 0),
+                            n * np.sqrt(n - 1) / (n - 2) * m3 / m2 ** 1.5, np.nan)
+        kurtosis = np.where((n > 3) & (m2 > 0),
+                            n * (n + 1) * (n - 1) * m4 / ((n - 2) * (n - 3) * m2 ** 2)
+                            - 3 * (n - 1) ** 2 / ((n - 2) * (n - 3)), np.nan)
+    return sd, skewness, kurtosis
+
+def array_moments(values):
+    """NaN-aware moment state along the last axis: (n, mean, m2, m3, m4)"""
+    valid = ~np.isnan(values)
+    n = valid.sum(axis=-1).astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(valid, values, 0.0).sum(axis=-1) / n
+    dev = np.where(valid, values - mean[..., None], 0.0)
+    dev2 = dev * dev
+    return n, mean, dev2.sum(axis=-1), (dev2 * dev).sum(axis=-1), (dev2 * dev2).sum(axis=-1)
+
+def update_moments(state, delta):
+    """Fold `delta` into `state` touching only the rows delta covers.
+
+    Known keys are updated in place; unseen keys are appended.  Cost is
+    proportional to len(delta), which keeps daily updates cheap however
+    large the accumulated state is.
+    """
+    if state is None or len(state) == 0:
+        return delta.copy()
+    pos = state.index.get_indexer(delta.index)
+    known = pos >= 0
+    if known.any():
+        keys = delta.index[known]
+        merged = combine_moments(state.iloc[pos[known]], delta[known]).reindex(keys)
+        state.iloc[pos[known], [state.columns.get_loc(c) for c in MOMENT_COLUMNS]] = merged[MOMENT_COLUMNS].to_numpy()
+    if not known.all():
+        state = pd.concat([state, delta[~known]])
+    return state
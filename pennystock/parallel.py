@@ -0,0 +1,149 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .ingest import financial_year
+from .metrics import StatsEngine, forward_fill
+from .moments import array_moments, sample_stats
+from .store import CompanyStore
+from .universe import score_store
+
+# Fields of the per-(company, year) output block written by the workers
+_OUTPUT_FIELDS = ('n', 'mean', 'm2', 'm3', 'm4', 'close')
+
+# Rows a worker processes at once; bounds its temporary memory
+_BLOCK_ROWS = 256
+
+# SHARDED STATISTICS
+def close_matrix(frame):
+    """Pivot normalized bhavcopy rows into (codes, dates, closes[n_codes, n_days])"""
+    pivot = frame.pivot_table(index='code', columns='date', values='close', aggfunc='last')
+    pivot = pivot.sort_index(axis=1)
+    return pivot.index.to_numpy(), pivot.columns, pivot.to_numpy(np.float64)
+
+def shard_rows(n_rows, workers, sector_codes=None):
+    """Split row indices into shards: ticker ranges, or whole sectors.
+
+    With `sector_codes`, sectors are dealt out largest first to the
+    lightest shard so shards stay balanced without splitting a sector.
+    """
+    workers = max(1, min(workers, n_rows))
+    if sector_codes is None:
+        return [np.arange(start, stop) for start, stop in
+                zip(np.linspace(0, n_rows, workers + 1, dtype=int)[:-1],
+                    np.linspace(0, n_rows, workers + 1, dtype=int)[1:])]
+    groups = sorted((np.flatnonzero(sector_codes == code) for code in np.unique(sector_codes)),
+                    key=len, reverse=True)
+    shards = [[] for _ in range(workers)]
+    loads = np.zeros(workers, dtype=np.int64)
+    for rows in groups:
+        target = int(np.argmin(loads))
+        shards[target].append(rows)
+        loads[target] += len(rows)
+    return [np.sort(np.concatenate(shard)) for shard in shards if shard]
+
+def _attach(name, shape, dtype):
+    # Pool workers share the parent's resource tracker, so the parent's
+    # unlink() is the only cleanup needed.
+    segment = shared_memory.SharedMemory(name=name)
+    return segment, np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+
+def _shard_worker(task):
+    closes_spec, output_spec, year_bounds, rows = task
+    closes_segment, closes = _attach(*closes_spec)
+    output_segment, output = _attach(*output_spec)
+    try:
+        for start in range(0, len(rows), _BLOCK_ROWS):
+            block_rows = rows[start:start + _BLOCK_ROWS]
+            block = closes[block_rows]
+            for j, (first, last) in enumerate(year_bounds):
+                values = block[:, first:last]
+                result = array_moments(values)
+                valid = ~np.isnan(values)
+                # Last traded close of the year, NaN if the scrip never traded
+                last_idx = values.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+                close = np.where(valid.any(axis=1), values[np.arange(len(values)), last_idx], np.nan)
+                output[block_rows, j] = np.column_stack(result + (close,))
+    finally:
+        del closes, output
+        closes_segment.close()
+        output_segment.close()
+    return len(rows)
+
+def year_moments(closes, day_years, workers=None, sector_codes=None):
+    """Per-(company, year) moments and last close from a daily close matrix.
+
+    `closes` is (n_companies, n_days) with NaN on non-trading days and
+    `day_years` the financial year label of each day, in date order.  The
+    matrix is copied once into shared memory; each worker attaches to it
+    and writes its shard straight into a shared output array, so neither
+    prices nor results are pickled.  Returns (years, output) where output
+    is (n_companies, n_years, 6) over n, mean, m2, m3, m4, close.
+    """
+    workers = workers or os.cpu_count() or 1
+    day_years = pd.Index(day_years)
+    years = list(dict.fromkeys(day_years))
+    positions = np.arange(len(day_years))
+    year_bounds = [(int(positions[day_years == year].min()), int(positions[day_years == year].max()) + 1)
+                   for year in years]
+
+    closes = np.ascontiguousarray(closes, dtype=np.float64)
+    output_shape = (len(closes), len(years), len(_OUTPUT_FIELDS))
+    closes_segment = shared_memory.SharedMemory(create=True, size=max(closes.nbytes, 1))
+    output_segment = shared_memory.SharedMemory(create=True, size=max(int(np.prod(output_shape)) * 8, 1))
+    try:
+        shared_closes = np.ndarray(closes.shape, dtype=np.float64, buffer=closes_segment.buf)
+        shared_closes[:] = closes
+        closes_spec = (closes_segment.name, closes.shape, np.float64)
+        output_spec = (output_segment.name, output_shape, np.float64)
+        shards = shard_rows(len(closes), workers, sector_codes)
+        tasks = [(closes_spec, output_spec, year_bounds, rows) for rows in shards]
+        if workers == 1:
+            for task in tasks:
+                _shard_worker(task)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(_shard_worker, tasks))
+        output = np.ndarray(output_shape, dtype=np.float64, buffer=output_segment.buf).copy()
+        del shared_closes
+    finally:
+        closes_segment.close()
+        closes_segment.unlink()
+        output_segment.close()
+        output_segment.unlink()
+    return years, output
+
+def build_store_from_closes(companies, sectors, closes, dates, workers=None, shard_by_sector=False,
+                            index_closes=None, metrics_window=None):
+    """Scored CompanyStore computed from daily closes in parallel.
+
+    Annual closes become `prices` and expected_return is the first-to-last
+    annual close return, as in BhavcopyIngestor.to_sectors_data.  With a
+    `metrics_window` (e.g. '1Y'), sharpe_ratio, and beta against the
+    `index_closes` benchmark series when given, are derived from the daily
+    closes over that window by a StatsEngine instead of being left out.
+    """
+    sectors = pd.Categorical(sectors)
+    sector_codes = sectors.codes if shard_by_sector else None
+    years, output = year_moments(closes, financial_year(dates), workers=workers, sector_codes=sector_codes)
+
+    n, mean, m2, m3, m4, close = (output[..., k] for k in range(len(_OUTPUT_FIELDS)))
+    sd, skewness, kurtosis = sample_stats(n, m2, m3, m4)
+    stats = np.nan_to_num(np.stack([mean, sd, skewness, kurtosis], axis=-1), nan=0.0)
+    stats[n == 0] = np.nan
+    prices = np.round(close, 2)
+    first = prices[np.arange(len(prices)), np.argmax(~np.isnan(prices), axis=1)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected_return = np.where(first > 0, forward_fill(prices)[:, -1] / first - 1, 0.0)
+
+    ratios = {}
+    if metrics_window is not None:
+        metrics = StatsEngine(closes, dates, index=index_closes).metrics(metrics_window)
+        ratios = {'sharpe_ratio': metrics['sharpe_ratio'].to_numpy(), 'beta': metrics['beta'].to_numpy()}
+
+    store = CompanyStore.from_arrays(companies, np.asarray(sectors), prices, stats, years,
+                                     expected_return=expected_return, **ratios)
+    return score_store(store)
@@ -0,0 +1,146 @@
+import queue
+import sqlite3
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS lots (
+    id INTEGER PRIMARY KEY,
+    user TEXT NOT NULL,
+    company TEXT NOT NULL,
+    sector TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    buy_price REAL NOT NULL,
+    date_added TEXT NOT NULL,
+    closed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS lots_user_company ON lots (user, company) WHERE closed = 0;
+CREATE TABLE IF NOT EXISTS watchlist (
+    user TEXT NOT NULL,
+    company TEXT NOT NULL,
+    sector TEXT NOT NULL,
+    date_added TEXT NOT NULL,
+    PRIMARY KEY (user, company)
+);
+"""
+
+LOT_COLUMNS = ['id', 'company', 'sector', 'quantity', 'buy_price', 'date_added']
+WATCHLIST_COLUMNS = ['company', 'sector', 'date_added']
+
+def _today():
+    return datetime.now().strftime("%Y-%m-%d")
+
+# PORTFOLIO AND WATCHLIST PERSISTENCE
+class UserDataStore:
+    """SQLite-backed portfolios and watchlists, keyed by user.
+
+    The database runs in WAL mode so readers never block the single
+    writer, and a small pool of connections is shared by every session
+    in the process.  Watchlist entries are keyed on (user, company), so
+    duplicate detection is a primary-key lookup (INSERT OR IGNORE).
+    """
+
+    def __init__(self, path, pool_size=4, timeout=10.0):
+        self.path = str(path)
+        self._pool = queue.Queue()
+        for _ in range(pool_size):
+            connection = sqlite3.connect(self.path, timeout=timeout, check_same_thread=False,
+                                         isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._pool.put(connection)
+        with self._connection() as connection:
+            connection.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connection(self):
+        connection = self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+    @contextmanager
+    def _transaction(self):
+        with self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def close(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+    # Portfolio lots
+    def add_lots(self, user, lots):
+        """Insert many (company, sector, quantity, buy_price[, date_added]) lots in one transaction.
+
+        Returns the new lot ids in input order.
+        """
+        rows = [(user, lot[0], lot[1], float(lot[2]), float(lot[3]), lot[4] if len(lot) > 4 else _today())
+                for lot in lots]
+        with self._transaction() as connection:
+            ids = []
+            for row in rows:
+                cursor = connection.execute(
+                    "INSERT INTO lots (user, company, sector, quantity, buy_price, date_added) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", row)
+                ids.append(cursor.lastrowid)
+        return ids
+
+    def add_lot(self, user, company, sector, quantity, buy_price, date_added=None):
+        return self.add_lots(user, [(company, sector, quantity, buy_price, date_added or _today())])[0]
+
+    def close_lots(self, user, lot_ids):
+        with self._transaction() as connection:
+            connection.executemany("UPDATE lots SET closed = 1 WHERE id = ? AND user = ?",
+                                   [(int(lot_id), user) for lot_id in lot_ids])
+
+    def load_lots(self, user, company=None):
+        """Open lots of a user (optionally one company) as a DataFrame"""
+        query = f"SELECT {', '.join(LOT_COLUMNS)} FROM lots WHERE user = ? AND closed = 0"
+        params = [user]
+        if company is not None:
+            query += " AND company = ?"
+            params.append(company)
+        with self._connection() as connection:
+            rows = connection.execute(query + " ORDER BY id", params).fetchall()
+        return pd.DataFrame.from_records(rows, columns=LOT_COLUMNS)
+
+    # Watchlist
+    def add_to_watchlist(self, user, entries):
+        """Add (company, sector[, date_added]) entries, skipping ones already listed.
+
+        Returns the number of entries actually added.
+        """
+        rows = [(user, entry[0], entry[1], entry[2] if len(entry) > 2 else _today()) for entry in entries]
+        with self._transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO watchlist (user, company, sector, date_added) VALUES (?, ?, ?, ?)",
+                rows)
+            return connection.total_changes - before
+
+    def remove_from_watchlist(self, user, companies):
+        with self._transaction() as connection:
+            connection.executemany("DELETE FROM watchlist WHERE user = ? AND company = ?",
+                                   [(user, company) for company in companies])
+
+    def in_watchlist(self, user, company):
+        with self._connection() as connection:
+            row = connection.execute("SELECT 1 FROM watchlist WHERE user = ? AND company = ?",
+                                     (user, company)).fetchone()
+        return row is not None
+
+    def load_watchlist(self, user):
+        with self._connection() as connection:
+            rows = connection.execute(
+                f"SELECT {', '.join(WATCHLIST_COLUMNS)} FROM watchlist WHERE user = ? ORDER BY rowid",
+                (user,)).fetchall()
+        return pd.DataFrame.from_records(rows, columns=WATCHLIST_COLUMNS)
@@ -0,0 +1,184 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# PORTFOLIO ENGINE
+class PortfolioBook:
+    """Lots and per-company positions held in arrays indexed by store row.
+
+    Adding or removing a lot updates quantities, cost, market value and
+    sector exposure in O(1); re-marking against new prices is one vector
+    pass over the companies.  Lots are stored column-wise and only turned
+    into a DataFrame when the page displays them.
+    """
+
+    def __init__(self, store, capacity=64):
+        self._lots = {
+            'row': np.zeros(capacity, dtype=np.int64),
+            'quantity': np.zeros(capacity),
+            'buy_price': np.zeros(capacity),
+            'date_added': np.zeros(capacity, dtype='datetime64[D]'),
+            'key': np.full(capacity, -1, dtype=np.int64),
+            'live': np.zeros(capacity, dtype=bool)
+        }
+        self._size = 0
+        self._live = 0
+        self.risk = None
+        self.bind(store)
+
+    def bind(self, store):
+        """Attach to a (new) store version, carrying positions over by company name"""
+        old_names = getattr(self, '_names', None)
+        self.store = store
+        self.version = store.version
+        if self.risk is not None and self.risk.model.version != store.version:
+            self.risk = None
+        self._names = store.table['company'].astype(str).to_numpy()
+        self._sectors = store.table['sector'].cat.codes.to_numpy()
+        self._sector_names = list(store.table['sector'].cat.categories)
+        if old_names is not None and self._size:
+            rows = self._lots['row'][:self._size]
+            known = {name: i for i, name in enumerate(self._names)}
+            remapped = np.array([known.get(old_names[row], -1) for row in rows], dtype=np.int64)
+            # Companies dropped from the universe lose their lots
+            self._lots['live'][:self._size] &= remapped >= 0
+            self._lots['row'][:self._size] = np.maximum(remapped, 0)
+            self._live = int(self._lots['live'][:self._size].sum())
+        self._rebuild()
+
+    def _rebuild(self):
+        n = len(self._names)
+        live = self._lots['live'][:self._size]
+        rows = self._lots['row'][:self._size][live]
+        quantity = self._lots['quantity'][:self._size][live]
+        self.quantity = np.bincount(rows, weights=quantity, minlength=n)
+        self.cost = np.bincount(rows, weights=quantity * self._lots['buy_price'][:self._size][live], minlength=n)
+        self.total_cost = float(self.cost.sum())
+        self.mark(np.round(self.store.table['current_price'].to_numpy(np.float64), 2))
+
+    def mark(self, prices):
+        """Mark every position to `prices` (one per store row)"""
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.value = self.quantity * self.prices
+        self.market_value = float(self.value.sum())
+        self.sector_value = np.bincount(self._sectors, weights=self.value, minlength=len(self._sector_names))
+        if self.risk is not None:
+            self.risk.reset(self.value)
+
+    def attach_risk(self, model):
+        """Track portfolio risk against `model` (a RiskModel of the bound store)"""
+        if self.risk is None or self.risk.model is not model:
+            self.risk = model.track(self.value)
+        return self.risk
+
+    def __len__(self):
+        return self._live
+
+    def _grow(self, needed=1):
+        capacity = len(self._lots['row'])
+        while capacity < self._size + needed:
+            capacity *= 2
+        for name, values in self._lots.items():
+            grown = np.zeros(capacity, dtype=values.dtype)
+            grown[:len(values)] = values
+            self._lots[name] = grown
+
+    def _apply(self, row, quantity, price, sign):
+        value = quantity * self.prices[row]
+        self.quantity[row] += sign * quantity
+        self.cost[row] += sign * quantity * price
+        self.value[row] += sign * value
+        self.total_cost += sign * quantity * price
+        self.market_value += sign * value
+        self.sector_value[self._sectors[row]] += sign * value
+        if self.risk is not None:
+            self.risk.shift(row, sign * value)
+
+    def add(self, company, quantity, price, date=None, key=-1):
+        """Add a lot; returns its lot id.
+
+        `key` is an optional external id (e.g. the database row) kept with
+        the lot.
+        """
+        row = self.store.row(company)
+        if self._size == len(self._lots['row']):
+            self._grow()
+        lot = self._size
+        self._lots['row'][lot] = row
+        self._lots['quantity'][lot] = quantity
+        self._lots['buy_price'][lot] = price
+        self._lots['date_added'][lot] = np.datetime64(date or datetime.now().strftime("%Y-%m-%d"), 'D')
+        self._lots['key'][lot] = key
+        self._lots['live'][lot] = True
+        self._size += 1
+        self._live += 1
+        self._apply(row, quantity, price, +1)
+        return lot
+
+    def add_lots(self, lots):
+        """Bulk-load a lots frame (company, quantity, buy_price, date_added[, id]).
+
+        Lots of companies missing from the store are skipped.  One vector
+        pass, then positions are rebuilt.
+        """
+        rows = np.array([self.store._rows.get(company, -1) for company in lots['company']], dtype=np.int64)
+        keep = rows >= 0
+        count = int(keep.sum())
+        if count == 0:
+            return
+        self._grow(count)
+        span = slice(self._size, self._size + count)
+        self._lots['row'][span] = rows[keep]
+        self._lots['quantity'][span] = np.asarray(lots['quantity'], dtype=np.float64)[keep]
+        self._lots['buy_price'][span] = np.asarray(lots['buy_price'], dtype=np.float64)[keep]
+        self._lots['date_added'][span] = np.asarray(lots['date_added'], dtype='datetime64[D]')[keep]
+        self._lots['key'][span] = np.asarray(lots['id'], dtype=np.int64)[keep] if 'id' in lots else -1
+        self._lots['live'][span] = True
+        self._size += count
+        self._live += count
+        self._rebuild()
+
+    def key(self, lot):
+        """External id stored with a lot"""
+        return int(self._lots['key'][lot])
+
+    def remove(self, lot):
+        """Close a lot by id"""
+        if not (0 <= lot < self._size) or not self._lots['live'][lot]:
+            raise KeyError(lot)
+        self._lots['live'][lot] = False
+        self._live -= 1
+        self._apply(self._lots['row'][lot], self._lots['quantity'][lot], self._lots['buy_price'][lot], -1)
+
+    @property
+    def unrealized_pnl(self):
+        return self.market_value - self.total_cost
+
+    def weights(self):
+        """Market-value weight of each held company, as a Series"""
+        held = np.flatnonzero(self.quantity)
+        total = self.market_value or 1.0
+        return pd.Series(self.value[held] / total, index=self._names[held])
+
+    def sector_exposure(self):
+        """Market value per sector with a non-zero position"""
+        held = np.flatnonzero(self.sector_value)
+        return pd.Series(self.sector_value[held], index=[self._sector_names[i] for i in held])
+
+    def lots_frame(self):
+        """Live lots for display, marked to the current prices"""
+        live = np.flatnonzero(self._lots['live'][:self._size])
+        rows = self._lots['row'][live]
+        quantity = self._lots['quantity'][live]
+        buy_price = self._lots['buy_price'][live]
+        return pd.DataFrame({
+            'lot': live,
+            'company': self._names[rows],
+            'sector': [self._sector_names[code] for code in self._sectors[rows]],
+            'quantity': quantity,
+            'buy_price': buy_price,
+            'current_price': self.prices[rows],
+            'unrealized_pnl': quantity * (self.prices[rows] - buy_price),
+            'date_added': self._lots['date_added'][live].astype(str)
+        })
@@ -0,0 +1,149 @@
+import json
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+SPAN_COLUMNS = ['run', 'page', 'trigger', 'name', 'kind', 'depth', 'seconds', 'alloc_kb', 'peak_kb']
+
+_log_lock = threading.Lock()
+
+# RENDER PROFILING
+class RenderProfiler:
+    """Time and memory of named spans, grouped into script runs.
+
+    A run is one rerun of the app (or of a single fragment); spans nest
+    inside it.  Memory comes from tracemalloc and is only measured with
+    `memory=True`: tracemalloc traces the whole process and slows every
+    session, so it is a process-level choice, started by the first
+    enabled profiler and left running.  alloc_kb is the net change over
+    the span and peak_kb the high-water mark above its starting point,
+    both process-wide: they include allocations by concurrent sessions,
+    which also reset the shared peak, so they are only exact with one
+    session.  Without memory they are NaN.  A disabled profiler's span()
+    costs one attribute check.  Finished runs are kept
+    in a bounded history and, given a `log_path`, appended to it as JSON
+    lines.
+    """
+
+    def __init__(self, enabled=False, history=50, log_path=None, memory=False):
+        self.enabled = False
+        self.memory = memory
+        self.log_path = log_path
+        self.history = deque(maxlen=history)
+        self.current = None
+        self._peaks = []
+        self._runs = 0
+        self.enable(enabled)
+
+    def enable(self, enabled=True):
+        self.enabled = bool(enabled)
+        if self.enabled and self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _enter(self):
+        # _peaks is the span stack: one running peak per open span
+        current = None
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            tracemalloc.reset_peak()
+        self._peaks.append(0)
+        return time.perf_counter(), current
+
+    def _exit(self, started, start_memory):
+        seconds = time.perf_counter() - started
+        if not self._peaks:
+            return seconds, float('nan'), float('nan')
+        peak = self._peaks.pop()
+        if start_memory is None or not tracemalloc.is_tracing():
+            return seconds, float('nan'), float('nan')
+        current, traced_peak = tracemalloc.get_traced_memory()
+        peak = max(peak, traced_peak)
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        return seconds, (current - start_memory) / 1024, max(peak - start_memory, 0) / 1024
+
+    def begin(self, page=None, trigger='rerun'):
+        """Open a run; a run left open by an interrupted rerun is closed first"""
+        if self.current is not None:
+            self.finish(status='interrupted')
+        if not self.enabled:
+            return
+        self._runs += 1
+        self._peaks = []
+        self.current = {
+            'run': self._runs,
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'page': page,
+            'trigger': trigger,
+            'spans': [],
+            '_start': self._enter()
+        }
+
+    def set_page(self, page):
+        if self.current is not None:
+            self.current['page'] = page
+
+    def finish(self, status='ok'):
+        run, self.current = self.current, None
+        if run is None:
+            return None
+        run['seconds'], run['alloc_kb'], run['peak_kb'] = self._exit(*run.pop('_start'))
+        run['status'] = status
+        self.history.append(run)
+        if self.log_path:
+            with _log_lock, open(self.log_path, 'a', encoding='utf-8') as handle:
+                handle.write(json.dumps(run, default=str) + '\n')
+        return run
+
+    @contextmanager
+    def span(self, name, kind='data'):
+        run = self.current
+        if run is None:
+            yield
+            return
+        record = {'name': name, 'kind': kind, 'depth': len(self._peaks) - 1}
+        run['spans'].append(record)
+        started = self._enter()
+        try:
+            yield
+        finally:
+            record['seconds'], record['alloc_kb'], record['peak_kb'] = self._exit(*started)
+
+    @contextmanager
+    def fragment(self, name, page=None):
+        """A span inside the current run, or a run of its own on a fragment-only rerun"""
+        if self.current is not None:
+            with self.span(name, 'fragment'):
+                yield
+            return
+        self.begin(page, trigger=name)
+        try:
+            with self.span(name, 'fragment'):
+                yield
+        finally:
+            self.finish()
+
+    def frame(self, runs=None):
+        """Spans of the last `runs` finished runs, one row each"""
+        history = list(self.history)[-runs:] if runs else list(self.history)
+        rows = [{'run': run['run'], 'page': run['page'], 'trigger': run['trigger'], **span}
+                for run in history for span in run['spans']]
+        return pd.DataFrame(rows, columns=SPAN_COLUMNS)
+
+    def summary(self):
+        """Mean and worst time and peak memory per (page, span) over the history"""
+        spans = self.frame()
+        return (spans.groupby(['page', 'kind', 'name'], sort=False)
+                .agg(calls=('seconds', 'size'), mean_seconds=('seconds', 'mean'),
+                     max_seconds=('seconds', 'max'), max_peak_kb=('peak_kb', 'max'))
+                .reset_index())
+
+    def to_json(self):
+        return json.dumps(list(self.history), default=str, indent=1)
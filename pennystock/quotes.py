@@ -0,0 +1,282 @@
+import asyncio
+import glob
+import json
+import os
+import random
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+# QUOTE SNAPSHOTS
+class QuoteSnapshot:
+    """Last known quote per store row, published as a whole.
+
+    Never modified after construction: the refresher builds a new one and
+    swaps the reference, so a page reading `refresher.snapshot` once sees
+    one consistent set of prices without taking a lock.  Rows without a
+    quote are NaN in `prices` and 0 in `updated`.
+    """
+
+    def __init__(self, prices, updated, version=0, as_of=None, failed_batches=0):
+        self.prices = prices
+        self.updated = updated
+        self.version = version
+        self.as_of = as_of
+        self.failed_batches = failed_batches
+        self.prices.flags.writeable = False
+        self.updated.flags.writeable = False
+
+    @classmethod
+    def empty(cls, n):
+        return cls(np.full(n, np.nan), np.zeros(n))
+
+    @property
+    def quoted(self):
+        return int((self.updated > 0).sum())
+
+    def merged(self, fallback):
+        """Quoted prices, with `fallback` (e.g. the last yearly close) where there is no quote"""
+        return np.where(np.isnan(self.prices), np.asarray(fallback, dtype=np.float64), self.prices)
+
+# FEEDS
+class FileDropFeed:
+    """Quotes from the newest CSV or JSON file dropped into a directory.
+
+    CSV files need `symbol` and `price` columns; JSON files map symbol to
+    price.  The parsed file is reused until a newer one appears.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._loaded = (None, 0.0)
+        self._quotes = {}
+        self._lock = threading.Lock()
+
+    def _latest(self):
+        files = glob.glob(os.path.join(self.directory, '*.csv')) + glob.glob(os.path.join(self.directory, '*.json'))
+        if not files:
+            return {}
+        path = max(files, key=os.path.getmtime)
+        mtime = os.path.getmtime(path)
+        with self._lock:
+            if self._loaded != (path, mtime):
+                if path.endswith('.json'):
+                    with open(path, encoding='utf-8') as handle:
+                        quotes = {str(symbol): float(price) for symbol, price in json.load(handle).items()}
+                else:
+                    frame = pd.read_csv(path, usecols=['symbol', 'price'])
+                    quotes = dict(zip(frame['symbol'].astype(str), frame['price'].astype(float)))
+                self._quotes, self._loaded = quotes, (path, mtime)
+            return self._quotes
+
+    async def fetch(self, symbols):
+        quotes = await asyncio.to_thread(self._latest)
+        return {symbol: quotes[symbol] for symbol in symbols if symbol in quotes}
+
+    def close(self):
+        pass
+
+class HTTPFeed:
+    """Quotes from an HTTP endpoint: GET <url>?symbols=A,B,C returning {"A": price, ...}
+
+    Requests run on a pool of `connections` threads, so that many can be
+    in flight at once.
+    """
+
+    def __init__(self, url, timeout=5.0, connections=16):
+        self.url = url
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=connections, thread_name_prefix='quote-feed')
+
+    def _get(self, symbols):
+        query = urllib.parse.urlencode({'symbols': ','.join(symbols)})
+        with urllib.request.urlopen(f'{self.url}?{query}', timeout=self.timeout) as response:
+            return {str(symbol): float(price) for symbol, price in json.load(response).items()}
+
+    async def fetch(self, symbols):
+        return await asyncio.get_running_loop().run_in_executor(self._pool, self._get, symbols)
+
+    def close(self):
+        """Shut the connection pool down; requests still queued are cancelled"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+def feed_from_source(source):
+    """HTTPFeed for an http(s) URL, otherwise a FileDropFeed on a directory"""
+    if source.startswith(('http://', 'https://')):
+        return HTTPFeed(source)
+    return FileDropFeed(source)
+
+# ASYNC REFRESHER
+class QuoteRefresher:
+    """Pulls quotes for every company in `store` from `feed` in the background.
+
+    A refresh splits the symbols into batches of batch_size and fetches at
+    most `concurrency` of them at a time.  A failing batch is retried
+    `retries` times with jittered exponential backoff, then skipped: its
+    rows keep their previous quotes.  The new QuoteSnapshot replaces the
+    old one in a single assignment.  start() runs the loop on its own
+    thread and event loop, so callers never wait on the feed; stop()
+    wakes it from its wait between refreshes and the feed is closed when
+    the loop exits.
+    """
+
+    def __init__(self, store, feed, interval=60.0, batch_size=200, concurrency=16, retries=3, backoff=0.25):
+        self.symbols = store.table['company'].astype(str).tolist()
+        self.feed = feed
+        self.interval = interval
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.snapshot = QuoteSnapshot.empty(len(self.symbols))
+        self.last_error = None
+        self._rows = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._stop = threading.Event()
+        self._thread = None
+        self._loop = None
+        self._wake = None
+
+    async def _fetch_batch(self, symbols, semaphore):
+        async with semaphore:
+            for attempt in range(self.retries + 1):
+                try:
+                    return await self.feed.fetch(symbols)
+                except Exception as error:
+                    self.last_error = f"{type(error).__name__}: {error}"
+                    if attempt == self.retries:
+                        return None
+                    await asyncio.sleep(self.backoff * 2 ** attempt * (0.5 + random.random()))
+
+    async def refresh(self):
+        """Fetch every symbol once and publish the result; returns the new snapshot"""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        batches = [self.symbols[i:i + self.batch_size] for i in range(0, len(self.symbols), self.batch_size)]
+        results = await asyncio.gather(*(self._fetch_batch(batch, semaphore) for batch in batches))
+
+        current = self.snapshot
+        prices, updated = current.prices.copy(), current.updated.copy()
+        now = time.time()
+        for quotes in results:
+            if not quotes:
+                continue
+            rows = np.array([self._rows[symbol] for symbol in quotes if symbol in self._rows], dtype=np.intp)
+            values = np.array([quotes[symbol] for symbol in quotes if symbol in self._rows], dtype=np.float64)
+            prices[rows] = values
+            updated[rows] = now
+        self.snapshot = QuoteSnapshot(prices, updated, version=current.version + 1, as_of=now,
+                                      failed_batches=sum(quotes is None for quotes in results))
+        return self.snapshot
+
+    async def run(self):
+        self._wake = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        try:
+            while not self._stop.is_set():
+                started = time.monotonic()
+                try:
+                    await self.refresh()
+                except Exception as error:
+                    self.last_error = f"{type(error).__name__}: {error}"
+                try:
+                    await asyncio.wait_for(self._wake.wait(),
+                                           timeout=max(0.0, self.interval - (time.monotonic() - started)))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._loop = None
+            await self.aclose()
+
+    async def aclose(self):
+        """Release the feed's connections"""
+        await asyncio.to_thread(self.feed.close)
+
+    def start(self):
+        """Run the refresh loop on a daemon thread; returns immediately"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=asyncio.run, args=(self.run(),),
+                                            name='quote-refresher', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """End the refresh loop without waiting out the interval; closes the feed"""
+        self._stop.set()
+        loop = self._loop
+        if loop is not None:
+            try:
+                loop.call_soon_threadsafe(self._wake.set)
+            except RuntimeError:
+                # The loop closed between the check and the call
+                pass
+        elif self._thread is None or not self._thread.is_alive():
+            self.feed.close()
+
+# LOCAL STAND-IN FEED
+class MockQuoteServer:
+    """A local HTTP quote endpoint for HTTPFeed, for development and load tests.
+
+    Prices random-walk from `base_prices` (symbol -> price) on every
+    request; `latency` seconds are added per request and a `failure_rate`
+    share of requests answer 503.
+    """
+
+    def __init__(self, base_prices, port=0, latency=0.0, failure_rate=0.0, seed=None):
+        self.prices = dict(base_prices)
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                with server._lock:
+                    server.requests += 1
+                    failed = server._random.random() < server.failure_rate
+                if failed:
+                    self.send_error(503)
+                    return
+                query = urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query)
+                symbols = query.get('symbols', [''])[0].split(',')
+                body = json.dumps(server.quote(symbols)).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), Handler)
+        self._server.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self._server.server_address[1]}/quotes'
+        self._thread = None
+
+    def quote(self, symbols):
+        with self._lock:
+            quotes = {}
+            for symbol in symbols:
+                if symbol in self.prices:
+                    price = self.prices[symbol] * (1 + self._random.gauss(0, 0.01))
+                    self.prices[symbol] = quotes[symbol] = round(max(price, 0.01), 2)
+            return quotes
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='mock-quotes', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,168 @@
+import heapq
+import threading
+from collections import deque
+from datetime import datetime
+
+import numpy as np
+
+# Rankings kept for QUICK INSIGHTS and the dashboard:
+# name -> (table column, descending, threshold test or None)
+DEFAULT_RANKINGS = {
+    'top_rated': ('psr_score', True, None),
+    'top_opportunities': ('expected_return', True, None),
+    'safest': ('psr_score', True, ('>=', 75)),
+    'high_risk': ('psr_score', False, ('<', 40))
+}
+
+# Alerts raised when a company enters one of these rankings
+DEFAULT_ALERTS = {
+    'safest': "PSR rose to {value:.1f}, now a safe bet (>= 75)",
+    'high_risk': "PSR fell to {value:.1f}, now high risk (< 40)"
+}
+
+_TESTS = {
+    '>=': np.greater_equal,
+    '>': np.greater,
+    '<=': np.less_equal,
+    '<': np.less
+}
+
+# RANKED INDEXES
+class RankedIndex:
+    """Companies ordered by one value, kept in a binary heap.
+
+    Changing a value pushes a fresh entry and bumps the row's version;
+    stale entries are skipped when read and dropped when the heap is
+    compacted.  top(k) walks the heap tree best-first, so it touches about
+    k entries (O(k log k)) however large the universe is.  With a
+    threshold, only rows that pass it are in the heap.
+    """
+
+    def __init__(self, values, descending=True, threshold=None):
+        self.descending = descending
+        self.threshold = threshold
+        self.values = np.full(len(values), np.nan)
+        self._version = np.zeros(len(values), dtype=np.int64)
+        self._heap = []
+        self._live = 0
+        self.update(np.arange(len(values)), values)
+
+    def passes(self, values):
+        """Whether each value belongs in this index"""
+        values = np.asarray(values, dtype=np.float64)
+        keep = ~np.isnan(values)
+        if self.threshold is not None:
+            op, bound = self.threshold
+            keep &= _TESTS[op](np.where(keep, values, 0.0), bound)
+        return keep
+
+    def __contains__(self, row):
+        return bool(self.passes(self.values[row]))
+
+    def update(self, rows, values):
+        """Set new values for `rows`; returns the rows that entered the index"""
+        rows = np.asarray(rows, dtype=np.intp)
+        values = np.asarray(values, dtype=np.float64)
+        if len(rows) and rows.max() >= len(self.values):
+            grown = np.full(rows.max() + 1, np.nan)
+            grown[:len(self.values)] = self.values
+            self.values = grown
+            self._version = np.concatenate([self._version,
+                                            np.zeros(len(grown) - len(self._version), dtype=np.int64)])
+        was = self.passes(self.values[rows])
+        now = self.passes(values)
+        self.values[rows] = values
+        self._version[rows] += 1
+        self._live += int(now.sum()) - int(was.sum())
+
+        keys = -values if self.descending else values
+        entries = [(float(key), int(row), int(version)) for key, row, version
+                   in zip(keys[now], rows[now], self._version[rows[now]])]
+        if len(entries) > len(self._heap):
+            self._heap.extend(entries)
+            heapq.heapify(self._heap)
+        else:
+            for entry in entries:
+                heapq.heappush(self._heap, entry)
+        if len(self._heap) > 2 * self._live + 64:
+            self._compact()
+        return rows[now & ~was]
+
+    def _compact(self):
+        self._heap = [entry for entry in self._heap if self._version[entry[1]] == entry[2]]
+        heapq.heapify(self._heap)
+
+    def top(self, k):
+        """Rows of the k best values, best first (ties by row order)"""
+        heap = self._heap
+        result = []
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier and len(result) < k:
+            (key, row, version), i = heapq.heappop(frontier)
+            if self._version[row] == version:
+                result.append(row)
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return np.array(result, dtype=np.intp)
+
+    def __len__(self):
+        return self._live
+
+class RankingBook:
+    """The app's rankings plus threshold alerts over a store's table.
+
+    update(rows) re-reads those rows' values, moves them in every ranking
+    and, in the same pass, raises an alert for each company that entered
+    an alerting ranking.  Alerts go to subscribed callbacks and a bounded
+    recent-alerts queue.
+    """
+
+    def __init__(self, store, rankings=DEFAULT_RANKINGS, alerts=DEFAULT_ALERTS, history=200):
+        self.store = store
+        self.definitions = dict(rankings)
+        self.alert_messages = dict(alerts)
+        self.indexes = {
+            name: RankedIndex(store.table[column].to_numpy(np.float64), descending, threshold)
+            for name, (column, descending, threshold) in self.definitions.items()
+        }
+        self.recent = deque(maxlen=history)
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        """Call `callback(alert)` for every alert from now on"""
+        self._subscribers.append(callback)
+
+    def top(self, name, k):
+        with self._lock:
+            return self.indexes[name].top(k)
+
+    def update(self, rows, store=None):
+        """Re-rank `rows` from the store's table; returns the alerts raised"""
+        store = store or self.store
+        self.store = store
+        rows = np.unique(np.asarray(rows, dtype=np.intp))
+        table = store.table
+        raised = []
+        with self._lock:
+            for name, (column, _, _) in self.definitions.items():
+                values = table[column].iloc[rows].to_numpy(np.float64)
+                entered = self.indexes[name].update(rows, values)
+                message = self.alert_messages.get(name)
+                if message is None:
+                    continue
+                for row in entered:
+                    value = self.indexes[name].values[row]
+                    raised.append({
+                        'time': datetime.now().isoformat(timespec='seconds'),
+                        'ranking': name,
+                        'company': str(table['company'].iat[row]),
+                        'value': float(value),
+                        'message': message.format(value=value)
+                    })
+            self.recent.extend(raised)
+        for alert in raised:
+            for callback in self._subscribers:
+                callback(alert)
+        return raised
@@ -0,0 +1,132 @@
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+# PORTFOLIO RISK
+def period_returns(prices):
+    """Simple returns between consecutive yearly prices, NaN where either is missing"""
+    prices = np.round(np.asarray(prices, dtype=np.float64), 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = prices[:, 1:] / prices[:, :-1] - 1
+    returns[~np.isfinite(returns)] = np.nan
+    return returns
+
+class RiskModel:
+    """Return history and covariance factor for every company in a store.
+
+    The sample covariance is kept in factored form, Sigma = F F^T with F
+    the (n_companies, n_periods) centered returns scaled by 1/sqrt(T-1),
+    so a portfolio's variance is ||F^T v||^2 and never needs the full n x n
+    matrix.  Missing returns are filled with the company's mean, i.e. they
+    contribute nothing to the covariance.  Build one per store version.
+    """
+
+    def __init__(self, store):
+        self.version = store.version
+        self.years = list(store.years)
+        returns = period_returns(store.prices)
+        self.periods = returns.shape[1]
+        observed = (~np.isnan(returns)).sum(axis=1)
+        self.mean = np.where(observed > 0, np.nansum(returns, axis=1) / np.maximum(observed, 1), 0.0)
+        centered = np.nan_to_num(returns - self.mean[:, None], nan=0.0)
+        self.factor = centered / np.sqrt(max(self.periods - 1, 1))
+        self.beta = store.table['beta'].to_numpy(np.float64)
+
+    def returns(self, rows=None):
+        """Filled return matrix (rows, periods)"""
+        rows = slice(None) if rows is None else rows
+        return self.mean[rows, None] + self.factor[rows] * np.sqrt(max(self.periods - 1, 1))
+
+    def covariance(self, rows):
+        """Sample covariance of the given rows, one BLAS product"""
+        factor = self.factor[rows]
+        return factor @ factor.T
+
+    def track(self, values=None):
+        return RiskState(self, values)
+
+class RiskState:
+    """Risk of one set of positions (rupee value per store row).
+
+    Keeps the projections F^T v, mean.v and beta.v, so moving a single
+    position (shift) is O(n_periods) and the metrics never touch the other
+    holdings; reset() recomputes them in one pass after a full re-mark.
+    """
+
+    def __init__(self, model, values=None):
+        self.model = model
+        self.reset(np.zeros(len(model.mean)) if values is None else values)
+
+    def reset(self, values):
+        model = self.model
+        self.values = np.array(values, dtype=np.float64)
+        held = np.flatnonzero(self.values)
+        v = self.values[held]
+        self.projection = model.factor[held].T @ v
+        self.expected = float(model.mean[held] @ v)
+        has_beta = ~np.isnan(model.beta[held])
+        self.beta_value = float(model.beta[held][has_beta] @ v[has_beta])
+        self.beta_covered = float(v[has_beta].sum())
+        self.total = float(v.sum())
+
+    def shift(self, row, delta):
+        """Change the position in `row` by `delta` rupees"""
+        model = self.model
+        self.values[row] += delta
+        self.projection += delta * model.factor[row]
+        self.expected += delta * model.mean[row]
+        if not np.isnan(model.beta[row]):
+            self.beta_value += delta * model.beta[row]
+            self.beta_covered += delta
+        self.total += delta
+
+    @property
+    def volatility(self):
+        """Standard deviation of the portfolio's period return"""
+        if self.total <= 0:
+            return 0.0
+        return float(np.sqrt(self.projection @ self.projection)) / self.total
+
+    @property
+    def weighted_beta(self):
+        """Value-weighted beta over the holdings that report one"""
+        return self.beta_value / self.beta_covered if self.beta_covered > 0 else float('nan')
+
+    def pnl_history(self):
+        """Portfolio profit and loss in each historical period"""
+        scale = np.sqrt(max(self.model.periods - 1, 1))
+        return self.projection * scale + self.expected
+
+    def var(self, confidence=0.95):
+        """Parametric (normal) and historical VaR and CVaR, as rupee losses over one period"""
+        z = NormalDist().inv_cdf(confidence)
+        mean = self.expected
+        sd = self.volatility * self.total
+        tail = 1 - confidence
+        history = self.pnl_history()
+        cutoff = np.quantile(history, tail) if len(history) else 0.0
+        return {
+            'parametric_var': float(sd * z - mean),
+            'parametric_cvar': float(sd * NormalDist().pdf(z) / tail - mean),
+            'historical_var': float(-cutoff),
+            'historical_cvar': float(-history[history <= cutoff].mean()) if len(history) else 0.0
+        }
+
+    def contributions(self):
+        """Each holding's share of portfolio variance (sums to 1)"""
+        # Positions closed by shift() can leave rounding dust behind
+        held = np.flatnonzero(np.abs(self.values) > 1e-6)
+        variance = self.projection @ self.projection
+        marginal = self.model.factor[held] @ self.projection
+        share = self.values[held] * marginal / variance if variance > 0 else np.zeros(len(held))
+        return pd.Series(share, index=held)
+
+    def summary(self, confidence=0.95):
+        return {
+            'market_value': float(self.total),
+            'expected_return': float(self.expected / self.total) if self.total else 0.0,
+            'volatility': self.volatility,
+            'weighted_beta': self.weighted_beta,
+            **self.var(confidence)
+        }
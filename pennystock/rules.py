@@ -0,0 +1,190 @@
+import ast
+import hashlib
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .scoring import RISK_THRESHOLDS, SCORE_COLUMNS, _round1, risk_buckets
+from .universe import RISK_LABELS
+
+# Built-in profiles shipped with the package
+SPEC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'specs')
+
+# Functions a spec expression may call, all elementwise over arrays;
+# minimum/maximum ignore NaN like the builtin min/max in calculate_psr_score
+FUNCTIONS = {
+    'where': np.where,
+    'minimum': np.fmin,
+    'maximum': np.fmax,
+    'clip': np.clip,
+    'abs': np.abs,
+    'sqrt': np.sqrt,
+    'log': np.log,
+    'exp': np.exp,
+    'isnan': np.isnan,
+    'logical_and': np.logical_and,
+    'logical_or': np.logical_or,
+    'logical_not': np.logical_not
+}
+
+_RISK_LABELS = np.array(RISK_LABELS, dtype=object)
+
+_ALLOWED_NODES = (ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call, ast.Name, ast.Load,
+                  ast.Constant, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.USub, ast.UAdd,
+                  ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.Eq, ast.NotEq)
+
+# Largest exponent `**` accepts; exponents must be numeric constants, so
+# an expression like 9**9**9 can't stall the process building integers
+MAX_EXPONENT = 8
+
+# SPEC LOADING
+def load_spec(source):
+    """Read a scoring spec from a .json/.yaml path, or parse it from text"""
+    text = source
+    if os.path.exists(str(source)):
+        with open(source, encoding='utf-8') as handle:
+            text = handle.read()
+        if str(source).endswith('.json'):
+            return json.loads(text)
+    if text.lstrip().startswith('{'):
+        return json.loads(text)
+    import yaml
+    return yaml.safe_load(text)
+
+def load_specs(directory=SPEC_DIR):
+    """All specs in a directory, keyed by their name"""
+    specs = {}
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith(('.json', '.yaml', '.yml')):
+            spec = load_spec(os.path.join(directory, filename))
+            specs[spec['name']] = spec
+    return specs
+
+def spec_hash(spec):
+    """Content hash of a spec; equal specs share one compiled plan"""
+    payload = json.dumps(spec, sort_keys=True, default=str).encode()
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+# COMPILATION
+def _small_exponent(node):
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        node = node.operand
+    return (isinstance(node, ast.Constant) and isinstance(node.value, (int, float))
+            and not isinstance(node.value, bool) and abs(node.value) <= MAX_EXPONENT)
+
+def _compile_term(spec_name, term, expression, known):
+    try:
+        tree = ast.parse(str(expression), mode='eval')
+    except SyntaxError as error:
+        raise ValueError(f"{spec_name}.{term}: cannot parse {expression!r}: {error.msg}") from None
+    for node in ast.walk(tree):
+        if not isinstance(node, _ALLOWED_NODES):
+            raise ValueError(f"{spec_name}.{term}: {type(node).__name__} is not allowed in {expression!r}")
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow) and not _small_exponent(node.right):
+            raise ValueError(f"{spec_name}.{term}: exponents must be numeric constants up to {MAX_EXPONENT}")
+        if isinstance(node, ast.Compare) and len(node.ops) > 1:
+            raise ValueError(f"{spec_name}.{term}: chained comparisons are not supported")
+        if isinstance(node, ast.Call) and not (isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS):
+            raise ValueError(f"{spec_name}.{term}: unknown function in {expression!r}")
+        if isinstance(node, ast.Name) and node.id not in known and node.id not in FUNCTIONS:
+            raise ValueError(f"{spec_name}.{term}: unknown name {node.id!r}")
+        if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+            raise ValueError(f"{spec_name}.{term}: only numeric constants are allowed")
+    return compile(tree, f'<{spec_name}.{term}>', 'eval')
+
+class ScoringPlan:
+    """A scoring spec compiled to a sequence of vectorized array expressions.
+
+    A spec names its `terms` in evaluation order; each is an expression
+    over the SCORE_COLUMNS inputs and earlier terms, using arithmetic,
+    comparisons and the FUNCTIONS.  `total` names the term used as the
+    score, `components` the terms reported next to it, `round` their
+    decimals, and `risk_thresholds` the four bucket boundaries mapped onto
+    the get_risk_profile labels.  Missing sharpe_ratio or beta are NaN, so
+    specs test them with isnan().
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.name = spec['name']
+        self.hash = spec_hash(spec)
+        terms = spec.get('terms') or {}
+        if not terms:
+            raise ValueError(f"{self.name}: spec has no terms")
+        known = set(SCORE_COLUMNS)
+        self.steps = []
+        for term, expression in terms.items():
+            if term in FUNCTIONS or term in SCORE_COLUMNS:
+                raise ValueError(f"{self.name}.{term}: term shadows an input or function")
+            self.steps.append((term, _compile_term(self.name, term, expression, known)))
+            known.add(term)
+        self.total = spec.get('total', 'total_score')
+        self.components = list(spec.get('components', []))
+        for term in [self.total] + self.components:
+            if term not in terms:
+                raise ValueError(f"{self.name}: output {term!r} is not a term")
+        self.decimals = spec.get('round')
+        self.thresholds = [float(t) for t in spec.get('risk_thresholds', RISK_THRESHOLDS)]
+        if len(self.thresholds) != len(RISK_THRESHOLDS) or self.thresholds != sorted(self.thresholds, reverse=True):
+            raise ValueError(f"{self.name}: risk_thresholds must be {len(RISK_THRESHOLDS)} descending values")
+
+    def _round(self, values):
+        if self.decimals is None:
+            return values
+        if self.decimals == 1:
+            return _round1(values)
+        return np.round(values, self.decimals)
+
+    def evaluate(self, table):
+        """Score every row of `table`; returns total_score and the components as arrays"""
+        n = len(table['expected_return'])
+        namespace = dict(FUNCTIONS)
+        for column in SCORE_COLUMNS:
+            namespace[column] = (np.asarray(table[column], dtype=np.float64) if column in table
+                                 else np.full(n, np.nan))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for term, code in self.steps:
+                namespace[term] = np.broadcast_to(
+                    np.asarray(eval(code, {'__builtins__': {}}, namespace), dtype=np.float64), (n,))
+        result = {'total_score': self._round(np.array(namespace[self.total]))}
+        for term in self.components:
+            result[term] = self._round(np.array(namespace[term]))
+        return result
+
+    def risk_buckets(self, scores):
+        """Index into RISK_PROFILES for each score; NaN is the last bucket"""
+        return risk_buckets(scores, self.thresholds)
+
+    def risk_labels(self, scores):
+        return _RISK_LABELS[self.risk_buckets(scores)]
+
+_plans = {}
+_plans_lock = threading.Lock()
+
+def compile_spec(spec):
+    """Compiled plan for a spec (a dict, a path or spec text), cached by spec hash"""
+    if not isinstance(spec, dict):
+        spec = load_spec(spec)
+    key = spec_hash(spec)
+    with _plans_lock:
+        plan = _plans.get(key)
+        if plan is None:
+            plan = _plans[key] = ScoringPlan(spec)
+    return plan
+
+def score_profiles(table, specs):
+    """Score `table` under several specs, one vectorized pass each.
+
+    Returns a DataFrame with `<name>` score and `<name>_risk` label columns
+    per spec, in the order given.
+    """
+    columns = {}
+    for spec in specs:
+        plan = compile_spec(spec)
+        scores = plan.evaluate(table)['total_score']
+        columns[plan.name] = scores
+        columns[f'{plan.name}_risk'] = plan.risk_labels(scores)
+    return pd.DataFrame(columns, index=getattr(table, 'index', None))
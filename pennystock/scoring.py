@@ -0,0 +1,181 @@
+import numpy as np
+import pandas as pd
+
+# Columns consumed by the batch scorer
+SCORE_COLUMNS = ['expected_return', 'sharpe_ratio', 'beta', 'sd', 'mean', 'skewness', 'kurtosis']
+
+# PSR SCORING ALGORITHM
+def latest_year(stats):
+    """Most recent financial year in a company's stats ('2022-23' sorts after '2021-22')"""
+    return max(stats)
+
+def calculate_psr_score(company_data):
+    """Calculate Penny Stock Score (0-100) from the latest year with stats"""
+    latest = company_data['stats'][latest_year(company_data['stats'])]
+
+    # Return Potential Score (RPS) - 50 points
+    expected_return = company_data['expected_return']
+    if expected_return <= 0:
+        rps = 0
+    else:
+        rps = min(50, (expected_return / 10.0) * 50)
+
+    # Risk & Volatility Score (RVS) - 30 points
+    latest_sd = latest['sd']
+    latest_mean = latest['mean']
+
+    if 'sharpe_ratio' in company_data:
+        sharpe = company_data['sharpe_ratio']
+        rvs = min(30, max(0, sharpe * 12))
+    else:
+        if latest_mean > 0:
+            cv = latest_sd / latest_mean
+            rvs = max(0, 30 - (cv * 8))
+        else:
+            rvs = 10
+
+    # Beta adjustment
+    if 'beta' in company_data:
+        beta = company_data['beta']
+        beta_penalty = max(0, (beta - 1) * 4)
+        rvs = max(0, rvs - beta_penalty)
+
+    # Stability & Distribution Score (SDS) - 20 points
+    latest_skewness = abs(latest['skewness'])
+    latest_kurtosis = abs(latest['kurtosis'])
+
+    skewness_score = max(0, 10 - (latest_skewness * 3))
+    kurtosis_score = max(0, 10 - (latest_kurtosis * 2))
+    sds = skewness_score + kurtosis_score
+
+    total_psr = rps + rvs + sds
+
+    return {
+        'total_score': round(total_psr, 1),
+        'components': {
+            'rps': round(rps, 1),
+            'rvs': round(rvs, 1),
+            'sds': round(sds, 1)
+        }
+    }
+
+def get_risk_profile(psr_score):
+    """Determine risk profile based on PSR score"""
+    if psr_score >= 80:
+        return "High Growth, Low Risk", "✓", "risk-green", "Excellent investment"
+    elif psr_score >= 65:
+        return "Balanced Performer", "•", "risk-yellow", "Good risk-reward balance"
+    elif psr_score >= 50:
+        return "Speculative Opportunity", "▲", "risk-orange", "High risk, high reward"
+    elif psr_score >= 35:
+        return "High Risk, Caution", "⚠", "risk-red", "Very risky, experienced only"
+    else:
+        return "Avoid - Extreme Risk", "✗", "risk-black", "Not recommended"
+
+# Bucket boundaries used by get_risk_profile, best bucket first
+RISK_THRESHOLDS = [80, 65, 50, 35]
+RISK_PROFILES = [get_risk_profile(t) for t in RISK_THRESHOLDS] + [get_risk_profile(RISK_THRESHOLDS[-1] - 1)]
+
+# BATCH SCORING
+def _round1(values):
+    """Round to one decimal exactly like the builtin round(x, 1)"""
+    rounded = np.round(values, 1)
+    # np.round scales by 10 before rounding, which can break ties differently
+    # from round(); re-round only the handful of values sitting on a tie.
+    scaled = values * 10.0
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        idx = np.flatnonzero(near_tie)
+        rounded[idx] = [round(float(v), 1) for v in values[idx]]
+    return rounded
+
+def _column(table, name, n):
+    if name in table:
+        return np.asarray(table[name], dtype=np.float64)
+    return np.full(n, np.nan)
+
+def score_batch(table):
+    """Score a columnar universe in one vectorized pass.
+
+    `table` is a DataFrame (or dict of arrays) with the SCORE_COLUMNS; the
+    stats columns hold the latest-year values.  A NaN sharpe_ratio or beta
+    behaves like a missing key in calculate_psr_score, and other NaN
+    inputs score as they do there: the clamps use fmin/fmax, which keep
+    the bound as the builtin min/max do when compared with NaN.  Returns a dict of
+    float64 arrays: rps, rvs, sds and total_score, rounded like the scalar
+    function.
+    """
+    n = len(table['expected_return'])
+    expected_return = _column(table, 'expected_return', n)
+    sharpe = _column(table, 'sharpe_ratio', n)
+    beta = _column(table, 'beta', n)
+    latest_sd = _column(table, 'sd', n)
+    latest_mean = _column(table, 'mean', n)
+
+    # Return Potential Score (RPS) - 50 points
+    rps = np.where(expected_return <= 0, 0.0, np.fmin(50, (expected_return / 10.0) * 50))
+
+    # Risk & Volatility Score (RVS) - 30 points, CV fallback without sharpe
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cv_rvs = np.where(latest_mean > 0,
+                          np.fmax(0, 30 - (latest_sd / latest_mean) * 8),
+                          10.0)
+    rvs = np.where(np.isnan(sharpe), cv_rvs, np.fmin(30, np.fmax(0, sharpe * 12)))
+
+    # Beta adjustment
+    beta_penalty = np.fmax(0, (beta - 1) * 4)
+    rvs = np.where(np.isnan(beta), rvs, np.fmax(0, rvs - beta_penalty))
+
+    # Stability & Distribution Score (SDS) - 20 points
+    skewness_score = np.fmax(0, 10 - np.abs(_column(table, 'skewness', n)) * 3)
+    kurtosis_score = np.fmax(0, 10 - np.abs(_column(table, 'kurtosis', n)) * 2)
+    sds = skewness_score + kurtosis_score
+
+    total_psr = rps + rvs + sds
+
+    return {
+        'total_score': _round1(total_psr),
+        'rps': _round1(rps),
+        'rvs': _round1(rvs),
+        'sds': _round1(sds)
+    }
+
+def risk_buckets(scores, thresholds=RISK_THRESHOLDS):
+    """Index into RISK_PROFILES for each score; NaN falls in the last bucket, as in get_risk_profile"""
+    scores = np.asarray(scores, dtype=np.float64)
+    return sum((~(scores >= t)).astype(np.intp) for t in thresholds)
+
+def risk_profiles(scores, thresholds=RISK_THRESHOLDS):
+    """Vectorized get_risk_profile: one row per score"""
+    bucket = risk_buckets(scores, thresholds)
+    table = pd.DataFrame(RISK_PROFILES, columns=['profile', 'symbol', 'risk_class', 'description'])
+    return table.iloc[bucket].reset_index(drop=True)
+
+def risk_profile_labels(scores):
+    """Risk Profile labels ("<symbol> <profile>") as shown on the dashboard"""
+    profiles = risk_profiles(scores)
+    return profiles['symbol'] + ' ' + profiles['profile']
+
+def universe_table(sectors_data, year=None):
+    """Flatten the nested sectors_data dict into one row per company.
+
+    The stats columns are from `year`, by default each company's latest.
+    """
+    rows = []
+    for sector_name, sector_data in sectors_data.items():
+        for company_name, company_data in sector_data['companies'].items():
+            stats = company_data['stats'][year or latest_year(company_data['stats'])]
+            rows.append({
+                'company': company_name,
+                'sector': sector_name,
+                'expected_return': company_data['expected_return'],
+                'sharpe_ratio': company_data.get('sharpe_ratio', np.nan),
+                'beta': company_data.get('beta', np.nan),
+                'sd': stats['sd'],
+                'mean': stats['mean'],
+                'skewness': stats['skewness'],
+                'kurtosis': stats['kurtosis'],
+                'current_price': company_data['prices'][-1],
+                'market_cap': company_data.get('market_cap', np.nan)
+            })
+    return pd.DataFrame(rows)
@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Columns kept pre-sorted for range queries, with the value used for NaN
+# (a missing market cap screens as 0, as the original page did)
+INDEXED_COLUMNS = {'psr_score': -np.inf, 'expected_return': -np.inf, 'sd': np.inf, 'market_cap': 0.0}
+
+# STOCK SCREENER
+class Screener:
+    """Range-query index over a scored CompanyStore.
+
+    Each indexed column is argsorted once; a `>=` or `<=` bound becomes a
+    binary search plus a slice of the sort order, and filters combine as
+    boolean-mask intersections.  Recent filter combinations are memoized
+    (shared by all sessions, hence the lock).
+    """
+
+    def __init__(self, store, cache_size=256):
+        self.store = store
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._sorted = {}
+        for column, fill in INDEXED_COLUMNS.items():
+            values = np.nan_to_num(store.table[column].to_numpy(np.float64), nan=fill)
+            order = np.argsort(values, kind='stable')
+            self._sorted[column] = (values[order], order)
+        risk = store.table['risk_profile'].cat
+        self._risk_codes = risk.codes.to_numpy()
+        # Labels are "<symbol> <profile>"; the filter matches the profile
+        self._risk_names = [label.split(' ', 1)[1] for label in risk.categories]
+        self._sector_codes = store.table['sector'].cat.codes.to_numpy()
+        self._sector_index = {sector: i for i, sector in enumerate(store.table['sector'].cat.categories)}
+
+    def _at_least(self, column, bound):
+        values, order = self._sorted[column]
+        mask = np.zeros(len(order), dtype=bool)
+        mask[order[np.searchsorted(values, bound, side='left'):]] = True
+        return mask
+
+    def _at_most(self, column, bound):
+        values, order = self._sorted[column]
+        mask = np.zeros(len(order), dtype=bool)
+        mask[order[:np.searchsorted(values, bound, side='right')]] = True
+        return mask
+
+    def query(self, min_psr=0, min_return=0.0, max_volatility=np.inf, market_cap_min=0,
+              sectors=None, risk_filter="All"):
+        """Row indices matching every filter, grouped in `sectors` order.
+
+        `min_return` is a fraction (1.0 = 100%), as stored in
+        expected_return.  Rows within a sector keep store order, matching
+        the nested loop the screener page used to run.
+        """
+        sectors = tuple(sectors) if sectors is not None else tuple(self.store.sectors)
+        key = (min_psr, min_return, max_volatility, market_cap_min, sectors, risk_filter)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        mask = self._at_least('psr_score', min_psr)
+        mask &= self._at_least('expected_return', min_return)
+        mask &= self._at_most('sd', max_volatility)
+        mask &= self._at_least('market_cap', market_cap_min)
+        if risk_filter != "All":
+            matching = [i for i, name in enumerate(self._risk_names) if name.startswith(risk_filter)]
+            mask &= np.isin(self._risk_codes, matching)
+
+        # Rank rows by the position of their sector in the filter list
+        rank = np.full(len(self._sector_index), -1)
+        for position, sector in enumerate(sectors):
+            if sector in self._sector_index:
+                rank[self._sector_index[sector]] = position
+        row_rank = rank[self._sector_codes]
+        mask &= row_rank >= 0
+        rows = np.flatnonzero(mask)
+        rows = rows[np.argsort(row_rank[rows], kind='stable')]
+        rows.setflags(write=False)
+
+        with self._lock:
+            self._cache[key] = rows
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return rows
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from .risk import period_returns
+
+# FEATURES
+def _standardize(columns):
+    # Cross-sectional z-scores; a missing value becomes the column mean (0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.nanmean(columns, axis=0)
+        sd = np.nanstd(columns, axis=0)
+        scaled = (columns - mean) / np.where(sd > 0, sd, 1.0)
+    return np.nan_to_num(scaled, nan=0.0)
+
+def feature_matrix(store, return_weight=1.0, stats_weight=1.0):
+    """One unit-length, centred row per company for correlation by dot product.
+
+    The row concatenates the company's yearly returns and its per-year
+    stats (log mean and SD, skewness, kurtosis), each column z-scored
+    across the universe, with each block scaled so it carries its weight
+    whatever its width.  A dot product of two rows is then the Pearson
+    correlation of the two companies' feature vectors.
+    """
+    returns = period_returns(store.prices)
+    stats = np.array(store.stats, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        stats[..., :2] = np.log1p(np.where(stats[..., :2] >= 0, stats[..., :2], np.nan))
+    blocks = []
+    for weight, block in ((return_weight, returns), (stats_weight, stats.reshape(len(stats), -1))):
+        if weight and block.shape[1]:
+            blocks.append(_standardize(block) * (weight / np.sqrt(block.shape[1])))
+    features = np.hstack(blocks).astype(np.float32)
+    features -= features.mean(axis=1, keepdims=True)
+    norms = np.linalg.norm(features, axis=1, keepdims=True)
+    return np.divide(features, norms, out=np.zeros_like(features), where=norms > 0)
+
+# BLOCKED TOP-K CORRELATION
+def top_k_correlations(features, k=20, block_size=1024):
+    """The k most correlated other rows of every row, best first.
+
+    The n x n correlation matrix is computed one (block_size, n) slab at a
+    time and only the top k of each row are kept, so memory is
+    O(block_size * n + n * k).  Returns (neighbours, scores) as (n, k)
+    int32 and float32 arrays; rows with fewer than k others are padded
+    with -1 and NaN.
+    """
+    n = len(features)
+    k = max(0, min(k, n - 1))
+    neighbours = np.full((n, k), -1, dtype=np.int32)
+    scores = np.full((n, k), np.nan, dtype=np.float32)
+    if not k:
+        return neighbours, scores
+    for start in range(0, n, block_size):
+        stop = min(start + block_size, n)
+        slab = features[start:stop] @ features.T
+        slab[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+        top = np.argpartition(-slab, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(slab, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        neighbours[start:stop] = np.take_along_axis(top, order, axis=1)
+        scores[start:stop] = np.take_along_axis(top_scores, order, axis=1)
+    return neighbours, scores
+
+# PEER SIMILARITY INDEX
+class SimilarityIndex:
+    """Each company's k nearest peers by price-history and stats correlation.
+
+    Built once per store version with top_k_correlations, so the full
+    correlation matrix is never held; a lookup is a row slice.
+    """
+
+    def __init__(self, store, k=20, block_size=1024, return_weight=1.0, stats_weight=1.0):
+        self.store = store
+        self.k = k
+        self.neighbours, self.scores = top_k_correlations(
+            feature_matrix(store, return_weight, stats_weight), k=k, block_size=block_size)
+
+    def similar(self, row, k=10):
+        """Rows and correlations of the k companies most similar to `row`"""
+        keep = self.neighbours[row, :k] >= 0
+        return self.neighbours[row, :k][keep], self.scores[row, :k][keep]
+
+    def similar_frame(self, company, k=10):
+        """The k peers of `company` with sector, similarity, PSR score and expected return"""
+        rows, scores = self.similar(self.store.row(company), k)
+        table = self.store.table.iloc[rows]
+        return pd.DataFrame({
+            'company': table['company'].astype(str).to_numpy(),
+            'sector': table['sector'].astype(str).to_numpy(),
+            'similarity': scores,
+            'psr_score': table['psr_score'].to_numpy(),
+            'expected_return': table['expected_return'].to_numpy()
+        })
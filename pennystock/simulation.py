@@ -0,0 +1,178 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .store import latest_stats
+
+# Trading days per financial year
+TRADING_DAYS = 250
+
+# Cornish-Fisher stays monotone only for moderate shape parameters
+_MAX_SKEW = 1.0
+_KURTOSIS_RANGE = (-1.0, 4.0)
+
+# MONTE CARLO SIMULATION
+def simulation_params(store, rows, market_vol=0.2):
+    """Per-company path parameters from the yearly prices and latest stats.
+
+    Drift and volatility are the mean and sample SD of the yearly log
+    price changes; companies with fewer than two changes use the latest
+    year's SD/mean instead.  The latest skewness and excess kurtosis shape
+    the daily shocks, and beta sets each name's loading on a common market
+    shock of volatility `market_vol`.
+    """
+    rows = np.asarray(rows, dtype=np.intp)
+    prices = np.round(np.asarray(store.prices, dtype=np.float64)[rows], 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_changes = np.log(prices[:, 1:] / prices[:, :-1])
+    log_changes[~np.isfinite(log_changes)] = np.nan
+    observed = (~np.isnan(log_changes)).sum(axis=1)
+    drift = np.where(observed > 0, np.nansum(log_changes, axis=1) / np.maximum(observed, 1), 0.0)
+    centered = np.nan_to_num(log_changes - drift[:, None], nan=0.0)
+    vol = np.sqrt((centered ** 2).sum(axis=1) / np.maximum(observed - 1, 1))
+
+    latest = latest_stats(np.asarray(store.stats, dtype=np.float64)[rows])
+    mean, sd, skewness, kurtosis = (np.nan_to_num(latest[:, k]) for k in range(4))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fallback = np.where(mean > 0, sd / mean, 0.0)
+    vol = np.where(observed >= 2, vol, fallback)
+
+    beta = np.nan_to_num(store.table['beta'].to_numpy(np.float64)[rows])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        loading = np.where(vol > 0, beta * market_vol / vol, 0.0)
+    return {
+        'drift': drift,
+        'vol': vol,
+        'skewness': np.clip(skewness, -_MAX_SKEW, _MAX_SKEW),
+        'kurtosis': np.clip(kurtosis, *_KURTOSIS_RANGE),
+        'loading': np.clip(loading, -0.99, 0.99)
+    }
+
+def cornish_fisher(z, skewness, kurtosis):
+    """Skew standard normal draws towards the given skewness and excess kurtosis"""
+    z2 = z * z
+    return (z + (z2 - 1) * skewness / 6 + (z2 * z - 3 * z) * kurtosis / 24
+            - (2 * z2 * z - 5 * z) * skewness ** 2 / 36)
+
+def _shocks(rng, shape, params, skewness, kurtosis):
+    # Standard shocks with a common market factor, then shaped per name
+    market = rng.standard_normal(shape[:-1] + (1,), dtype=np.float32)
+    idio = np.sqrt(1 - params['loading'] ** 2).astype(np.float32)
+    z = params['loading'].astype(np.float32) * market + idio * rng.standard_normal(shape, dtype=np.float32)
+    return cornish_fisher(z, skewness.astype(np.float32), kurtosis.astype(np.float32))
+
+def _simulate_chunk(task):
+    params, values, n_paths, steps, horizon, step_block, seed, path_stats, keep_terminal = task
+    rng = np.random.default_rng(seed)
+    n = len(params['drift'])
+    # drift is already the mean log change, so it is the log drift as is
+    drift = params['drift'] * horizon
+    vol = params['vol'] * np.sqrt(horizon)
+
+    if not path_stats:
+        # The sum of `steps` iid shocks has skewness s/sqrt(steps) and
+        # excess kurtosis k/steps, so the terminal value is one draw per
+        # path and name with the aggregated shape.
+        z = _shocks(rng, (n_paths, n), params, params['skewness'] / np.sqrt(steps), params['kurtosis'] / steps)
+        log_growth = drift + vol * z.astype(np.float64)
+        drawdown = None
+    else:
+        step_drift = (drift / steps).astype(np.float32)
+        step_vol = (vol / np.sqrt(steps)).astype(np.float32)
+        values32 = values.astype(np.float32)
+        log_growth = np.zeros((n_paths, n), dtype=np.float32)
+        peak = np.full(n_paths, values.sum(), dtype=np.float32)
+        drawdown = np.zeros(n_paths, dtype=np.float32)
+        for start in range(0, steps, step_block):
+            block = min(step_block, steps - start)
+            z = _shocks(rng, (block, n_paths, n), params, params['skewness'], params['kurtosis'])
+            paths = log_growth + np.cumsum(step_drift + step_vol * z, axis=0)
+            portfolio = np.exp(paths) @ values32
+            running_peak = np.maximum(np.maximum.accumulate(portfolio, axis=0), peak)
+            drawdown = np.maximum(drawdown, (1 - portfolio / running_peak).max(axis=0))
+            peak = running_peak[-1]
+            log_growth = paths[-1]
+        log_growth = log_growth.astype(np.float64)
+
+    terminal = np.expm1(log_growth)
+    return {
+        'portfolio': np.exp(log_growth) @ values / values.sum() - 1,
+        'drawdown': drawdown,
+        'sum': terminal.sum(axis=0),
+        'sum_sq': (terminal ** 2).sum(axis=0),
+        'losses': (terminal < 0).sum(axis=0),
+        'terminal': terminal.astype(np.float32) if keep_terminal else None
+    }
+
+class SimulationResult:
+    """Terminal return distribution of a simulated portfolio and its names"""
+
+    def __init__(self, names, chunks, n_paths):
+        self.names = list(names)
+        self.paths = n_paths
+        self.portfolio_returns = np.concatenate([chunk['portfolio'] for chunk in chunks])
+        self.max_drawdown = (np.concatenate([chunk['drawdown'] for chunk in chunks]).astype(np.float64)
+                             if chunks[0]['drawdown'] is not None else None)
+        total = sum(chunk['sum'] for chunk in chunks)
+        self.name_mean = total / n_paths
+        self.name_sd = np.sqrt(np.maximum(sum(chunk['sum_sq'] for chunk in chunks) / n_paths
+                                          - self.name_mean ** 2, 0))
+        self.name_prob_loss = sum(chunk['losses'] for chunk in chunks) / n_paths
+        self.terminal = (np.concatenate([chunk['terminal'] for chunk in chunks])
+                         if chunks[0]['terminal'] is not None else None)
+
+    @property
+    def prob_loss(self):
+        return float((self.portfolio_returns < 0).mean())
+
+    def quantiles(self, qs=(0.05, 0.25, 0.5, 0.75, 0.95)):
+        return dict(zip(qs, np.quantile(self.portfolio_returns, qs)))
+
+    def summary(self):
+        return {
+            'paths': self.paths,
+            'mean_return': float(self.portfolio_returns.mean()),
+            'median_return': float(np.median(self.portfolio_returns)),
+            'prob_loss': self.prob_loss,
+            'p05_return': float(np.quantile(self.portfolio_returns, 0.05)),
+            'p95_return': float(np.quantile(self.portfolio_returns, 0.95)),
+            'mean_max_drawdown': float(self.max_drawdown.mean()) if self.max_drawdown is not None else None
+        }
+
+def simulate(store, rows, values=None, paths=10_000, horizon=1.0, steps=None, seed=None, workers=1,
+             path_stats=False, chunk_paths=None, max_bytes=64 << 20, market_vol=0.2, keep_terminal=False):
+    """Simulate `paths` forward price paths for the companies in `rows`.
+
+    `values` are the rupee amounts held in each (equal weights if omitted).
+    By default only the terminal value of each path is drawn, which is
+    exact in its first four cumulants; `path_stats=True` walks every step
+    and also records each path's maximum portfolio drawdown.  Paths are
+    generated in chunks of `chunk_paths`, and each chunk a block of steps
+    at a time, so no array larger than about `max_bytes` is held per
+    worker.  Every chunk draws from its own child of SeedSequence(seed), so
+    a given seed gives the same result for any number of workers.
+    """
+    rows = np.atleast_1d(np.asarray(rows, dtype=np.intp))
+    values = np.ones(len(rows)) if values is None else np.asarray(values, dtype=np.float64)
+    steps = steps or max(int(round(horizon * TRADING_DAYS)), 1)
+    params = simulation_params(store, rows, market_vol=market_vol)
+
+    # About four float32 temporaries (shocks, increments, paths, exp) per step
+    per_step = 4 * 4 * len(rows)
+    if chunk_paths is None:
+        chunk_paths = int(min(paths, max(max_bytes // (per_step * (min(steps, 64) if path_stats else 4)), 1)))
+    step_block = int(max(1, min(steps, max_bytes // (per_step * chunk_paths))))
+    sizes = [min(chunk_paths, paths - start) for start in range(0, paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    tasks = [(params, values, size, steps, horizon, step_block, child, path_stats, keep_terminal)
+             for size, child in zip(sizes, seeds)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(tasks) == 1:
+        chunks = [_simulate_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_simulate_chunk, tasks))
+    names = store.table['company'].astype(str).to_numpy()[rows]
+    return SimulationResult(names, chunks, paths)
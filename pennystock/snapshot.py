@@ -0,0 +1,101 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .store import STAT_FIELDS, CompanyStore
+from .universe import SCORE_FIELDS, score_store
+
+# Bumped whenever the on-disk layout changes
+SNAPSHOT_FORMAT = 1
+
+_ARRAY_COLUMNS = ('prices', 'stats')
+
+# UNIVERSE SNAPSHOTS
+def _store_hash(store):
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(store.table, index=False).to_numpy().tobytes())
+    digest.update(np.ascontiguousarray(store.prices).tobytes())
+    digest.update(np.ascontiguousarray(store.stats).tobytes())
+    return digest.hexdigest()[:16]
+
+def _to_arrow(store):
+    table = pa.Table.from_pandas(store.table, preserve_index=False)
+    n, n_years = store.prices.shape
+    prices = pa.FixedSizeListArray.from_arrays(
+        pa.array(np.ascontiguousarray(store.prices, dtype=np.float32).ravel()), n_years)
+    stats = pa.FixedSizeListArray.from_arrays(
+        pa.array(np.ascontiguousarray(store.stats, dtype=np.float64).ravel()), n_years * len(STAT_FIELDS))
+    table = table.append_column('prices', prices).append_column('stats', stats)
+    metadata = {
+        'pennystock.format': str(SNAPSHOT_FORMAT),
+        'pennystock.version': store.version or _store_hash(store),
+        'pennystock.years': json.dumps(store.years),
+        'pennystock.stat_fields': json.dumps(STAT_FIELDS)
+    }
+    return table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+
+def write_snapshot(store, path):
+    """Write a store to `path`.
+
+    A `.parquet` path gives a compressed Parquet file for archiving or
+    exchange; anything else an uncompressed Arrow IPC file written as a
+    single record batch, which load_snapshot can memory-map.
+    """
+    table = _to_arrow(store)
+    if str(path).endswith('.parquet'):
+        pq.write_table(table, path)
+    else:
+        with pa.OSFile(str(path), 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table, max_chunksize=max(len(table), 1))
+    return path
+
+def snapshot_version(path):
+    """Data version recorded in a snapshot, read from the schema only"""
+    if str(path).endswith('.parquet'):
+        metadata = pq.read_schema(path).metadata
+    else:
+        with pa.memory_map(str(path), 'r') as source:
+            metadata = pa.ipc.open_file(source).schema.metadata
+    return metadata[b'pennystock.version'].decode()
+
+def _array_column(table, name, shape):
+    # Single-chunk fixed-size lists expose their values buffer as-is, so
+    # this is a view onto the mapped file rather than a copy.
+    column = table.column(name)
+    values = column.chunk(0).values if column.num_chunks == 1 else column.combine_chunks().values
+    return values.to_numpy(zero_copy_only=True).reshape(shape)
+
+def load_snapshot(path):
+    """Load a snapshot into a read-only CompanyStore.
+
+    Arrow IPC files are memory-mapped: the price and stats arrays are
+    zero-copy views, so worker processes loading the same snapshot share
+    its pages through the OS cache.
+    """
+    if str(path).endswith('.parquet'):
+        table = pq.read_table(path)
+    else:
+        table = pa.ipc.open_file(pa.memory_map(str(path), 'r')).read_all()
+    metadata = table.schema.metadata
+    found = int(metadata[b'pennystock.format'])
+    if found != SNAPSHOT_FORMAT:
+        raise ValueError(f"Unsupported snapshot format {found} (expected {SNAPSHOT_FORMAT})")
+    years = json.loads(metadata[b'pennystock.years'])
+
+    n = table.num_rows
+    prices = _array_column(table, 'prices', (n, len(years)))
+    stats = _array_column(table, 'stats', (n, len(years), len(STAT_FIELDS)))
+    frame = table.drop_columns(list(_ARRAY_COLUMNS)).to_pandas()
+
+    store = CompanyStore(frame, prices, stats, years)
+    if not set(SCORE_FIELDS) <= set(frame.columns):
+        score_store(store)
+    store.prices.setflags(write=False)
+    store.stats.setflags(write=False)
+    store.version = metadata[b'pennystock.version'].decode()
+    return store
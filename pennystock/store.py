@@ -0,0 +1,203 @@
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from .data import YEARS
+
+# Order of the last axis of CompanyStore.stats
+STAT_FIELDS = ('mean', 'sd', 'skewness', 'kurtosis')
+
+# Per-company numeric columns of CompanyStore.table
+SCALAR_FIELDS = ('expected_return', 'beta', 'sharpe_ratio', 'market_cap', 'volume')
+
+def data_years(sectors_data):
+    """Sorted financial years that appear in any company's stats"""
+    years = {year for sector_data in sectors_data.values()
+             for company_data in sector_data['companies'].values()
+             for year in company_data['stats']}
+    return sorted(years) or list(YEARS)
+
+def latest_stats(stats):
+    """(n_companies, 4) stats of each company's latest year with stats, NaN if none"""
+    observed = ~np.isnan(stats[..., 0])
+    last = stats.shape[1] - 1 - np.argmax(observed[:, ::-1], axis=1)
+    return stats[np.arange(len(stats)), last]
+
+# COLUMNAR COMPANY STORE
+class CompanyStore:
+    """Array-backed universe: one row per company.
+
+    `table` holds the per-company scalars with categorical company/sector
+    columns plus the stats the scorer reads, taken from each company's
+    latest year with stats.  `prices` is a float32 (n_companies, n_years)
+    matrix and `stats` a (n_companies, n_years, 4) tensor ordered by
+    STAT_FIELDS.  Stats stay float64 so
+    scores computed from the store match calculate_psr_score exactly.
+    """
+
+    def __init__(self, table, prices, stats, years=YEARS):
+        self.table = table
+        self.prices = prices
+        self.stats = stats
+        self.years = list(years)
+        self.version = None
+        self._rows = {name: i for i, name in enumerate(table['company'])}
+        if len(self._rows) != len(table):
+            raise ValueError("Company names must be unique across sectors")
+        codes = table['sector'].cat.codes.to_numpy()
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(table['sector'].cat.categories) + 1))
+        self._sector_rows = {
+            sector: order[bounds[i]:bounds[i + 1]]
+            for i, sector in enumerate(table['sector'].cat.categories)
+            if bounds[i + 1] > bounds[i]
+        }
+
+    @classmethod
+    def from_sectors(cls, sectors_data, years=None):
+        """Build the store from the nested create_comprehensive_data dict.
+
+        `years` defaults to every financial year present in the stats.
+        """
+        years = list(years) if years is not None else data_years(sectors_data)
+        n = sum(len(sector_data['companies']) for sector_data in sectors_data.values())
+        prices = np.full((n, len(years)), np.nan, dtype=np.float32)
+        stats = np.full((n, len(years), len(STAT_FIELDS)), np.nan)
+        columns = {key: [] for key in ('company', 'sector', 'interpretation')}
+        scalars = {key: np.full(n, np.nan) for key in SCALAR_FIELDS}
+
+        row = 0
+        for sector_name, sector_data in sectors_data.items():
+            for company_name, company_data in sector_data['companies'].items():
+                columns['company'].append(company_name)
+                columns['sector'].append(sector_name)
+                columns['interpretation'].append(company_data.get('interpretation', ''))
+                for key, values in scalars.items():
+                    values[row] = company_data.get(key, np.nan)
+                history = company_data['prices'][-len(years):]
+                prices[row, len(years) - len(history):] = history
+                for j, year in enumerate(years):
+                    year_stats = company_data['stats'].get(year)
+                    if year_stats:
+                        stats[row, j] = [year_stats[field] for field in STAT_FIELDS]
+                row += 1
+
+        return cls.from_arrays(columns['company'], columns['sector'], prices, stats, years,
+                               interpretation=columns['interpretation'], **scalars)
+
+    @classmethod
+    def from_arrays(cls, companies, sectors, prices, stats, years, **columns):
+        """Build the store from per-company arrays.
+
+        `columns` supplies the scalar columns (expected_return, beta, ...);
+        scalars left out are NaN, which the scorer treats as missing.
+        """
+        n = len(companies)
+        prices = np.asarray(prices, dtype=np.float32)
+        scalars = {key: np.asarray(columns.pop(key), dtype=np.float64) if key in columns else np.full(n, np.nan)
+                   for key in SCALAR_FIELDS}
+        interpretation = columns.pop('interpretation', [''] * n)
+        sectors = list(sectors)
+        table = pd.DataFrame({
+            'company': pd.Categorical(list(companies)),
+            'sector': pd.Categorical(sectors, categories=list(dict.fromkeys(sectors))),
+            **scalars,
+            'current_price': prices[:, -1],
+            'interpretation': pd.Categorical(list(interpretation)),
+            **columns
+        })
+        latest = latest_stats(stats)
+        for k, field in enumerate(STAT_FIELDS):
+            table[field] = latest[:, k]
+        return cls(table, prices, stats, years)
+
+    def __len__(self):
+        return len(self.table)
+
+    @property
+    def sectors(self):
+        return list(self._sector_rows)
+
+    def row(self, company):
+        """Row index of a company, O(1)"""
+        return self._rows[company]
+
+    def sector_rows(self, sector):
+        """Row indices of a sector's companies, O(1)"""
+        return self._sector_rows.get(sector, np.empty(0, dtype=np.intp))
+
+    def companies_in(self, sector):
+        return list(self.table['company'].to_numpy()[self.sector_rows(sector)])
+
+    def sector_table(self, sectors):
+        """Table rows of one sector, or of a list of sectors in that order"""
+        if isinstance(sectors, str):
+            sectors = [sectors]
+        rows = [self.sector_rows(sector) for sector in sectors]
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.intp)
+        return self.table.iloc[rows].reset_index(drop=True)
+
+    def year_stats(self, year):
+        """(n_companies, 4) stats for one financial year"""
+        return self.stats[:, self.years.index(year)]
+
+    def company(self, company):
+        """Company dict in the create_comprehensive_data schema"""
+        i = self._rows[company]
+        company_data = {
+            # The shortest float32 repr recovers the quoted 2-decimal prices
+            'prices': self.prices[i].astype(str).astype(np.float64).tolist(),
+            'stats': {
+                year: dict(zip(STAT_FIELDS, self.stats[i, j].tolist()))
+                for j, year in enumerate(self.years)
+                if not np.isnan(self.stats[i, j, 0])
+            },
+            'expected_return': float(self.table['expected_return'].iat[i]),
+            'interpretation': self.table['interpretation'].iat[i]
+        }
+        for key in ('beta', 'sharpe_ratio', 'market_cap', 'volume'):
+            value = float(self.table[key].iat[i])
+            if not np.isnan(value):
+                company_data[key] = int(value) if key in ('market_cap', 'volume') else value
+        return company_data
+
+    def sectors_view(self):
+        """Read-only stand-in for the nested sectors_data dict"""
+        return _SectorsView(self)
+
+
+class _SectorsView(Mapping):
+
+    def __init__(self, store):
+        self._store = store
+
+    def __getitem__(self, sector):
+        if sector not in self._store._sector_rows:
+            raise KeyError(sector)
+        return {'companies': _CompaniesView(self._store, sector)}
+
+    def __iter__(self):
+        return iter(self._store.sectors)
+
+    def __len__(self):
+        return len(self._store._sector_rows)
+
+
+class _CompaniesView(Mapping):
+
+    def __init__(self, store, sector):
+        self._store = store
+        self._names = store.companies_in(sector)
+        self._members = set(self._names)
+
+    def __getitem__(self, company):
+        if company not in self._members:
+            raise KeyError(company)
+        return self._store.company(company)
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
@@ -0,0 +1,50 @@
+import numpy as np
+
+from .data import YEARS
+
+SECTORS = [
+    'Capital Goods - Electrical Equipment', 'Cement', 'Chemicals', 'IT - Software',
+    'Pharmaceuticals', 'Textiles', 'Finance', 'Auto Ancillaries', 'FMCG', 'Realty'
+]
+
+def synthetic_universe(n_companies, seed=0, n_sectors=len(SECTORS)):
+    """Generate a random universe in the create_comprehensive_data schema"""
+    rng = np.random.default_rng(seed)
+    n_years = len(YEARS)
+    sector_names = [SECTORS[i] if i < len(SECTORS) else f'Sector {i}' for i in range(n_sectors)]
+
+    prices = np.round(rng.lognormal(2.5, 1.0, (n_companies, n_years)), 2)
+    means = np.round(prices * rng.uniform(0.6, 1.4, (n_companies, n_years)), 3)
+    sds = np.round(means * rng.uniform(0.2, 1.2, (n_companies, n_years)), 3)
+    skews = np.round(rng.normal(0.6, 0.5, (n_companies, n_years)), 3)
+    kurts = np.round(rng.normal(-0.8, 1.0, (n_companies, n_years)), 3)
+    expected_returns = np.round(rng.lognormal(0.0, 1.2, n_companies), 3)
+    betas = np.round(rng.uniform(0.5, 2.5, n_companies), 2)
+    sharpes = np.round(rng.uniform(-0.5, 3.0, n_companies), 2)
+    market_caps = rng.integers(50, 5000, n_companies)
+    volumes = rng.integers(10_000, 5_000_000, n_companies)
+    sector_idx = rng.integers(0, n_sectors, n_companies)
+    # Leave a few companies without sharpe/beta to exercise the fallbacks
+    no_sharpe = rng.random(n_companies) < 0.05
+    no_beta = rng.random(n_companies) < 0.05
+
+    sectors_data = {name: {'companies': {}} for name in sector_names}
+    for i in range(n_companies):
+        company_data = {
+            'prices': prices[i].tolist(),
+            'stats': {
+                year: {'mean': float(means[i, j]), 'sd': float(sds[i, j]),
+                       'skewness': float(skews[i, j]), 'kurtosis': float(kurts[i, j])}
+                for j, year in enumerate(YEARS)
+            },
+            'expected_return': float(expected_returns[i]),
+            'market_cap': int(market_caps[i]),
+            'volume': int(volumes[i]),
+            'interpretation': "Synthetic company."
+        }
+        if not no_beta[i]:
+            company_data['beta'] = float(betas[i])
+        if not no_sharpe[i]:
+            company_data['sharpe_ratio'] = float(sharpes[i])
+        sectors_data[sector_names[sector_idx[i]]]['companies'][f'SYN{i:06d}'] = company_data
+    return {name: data for name, data in sectors_data.items() if data['companies']}
@@ -0,0 +1,104 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+from .metrics import forward_fill
+from .scoring import RISK_PROFILES, risk_profile_labels, score_batch
+from .store import STAT_FIELDS, CompanyStore, latest_stats
+
+# Score columns added to CompanyStore.table by score_store
+SCORE_FIELDS = ['psr_score', 'rps', 'rvs', 'sds', 'risk_profile']
+
+RISK_LABELS = [f"{symbol} {profile}" for profile, symbol, _, _ in RISK_PROFILES]
+
+def content_hash(sectors_data):
+    """Stable short hash of a sectors_data dict, used as the cache key"""
+    payload = json.dumps(sectors_data, sort_keys=True, default=float).encode()
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+def score_store(store):
+    """Append batch PSR scores and risk labels to the store table"""
+    scores = score_batch(store.table)
+    store.table['psr_score'] = scores['total_score']
+    for key in ('rps', 'rvs', 'sds'):
+        store.table[key] = scores[key]
+    store.table['risk_profile'] = pd.Categorical(risk_profile_labels(scores['total_score']),
+                                                 categories=RISK_LABELS)
+    return store
+
+def build_universe(sectors_data, version=None):
+    """Build, score and freeze a CompanyStore.
+
+    The result is meant to be shared read-only between sessions: the price
+    and stats arrays are made non-writeable, and callers must copy the
+    table before modifying it.
+    """
+    store = score_store(CompanyStore.from_sectors(sectors_data))
+    store.prices.setflags(write=False)
+    store.stats.setflags(write=False)
+    store.version = version or content_hash(sectors_data)
+    return store
+
+def refresh_companies(store, ingestor, keys, cube=None, rankings=None):
+    """Re-derive stats, prices, volume and PSR scores for the (code, year) rows in keys.
+
+    Pairs with BhavcopyIngestor.add_day for nightly updates: only the
+    touched companies are rescored.  The store must be writable, i.e. one
+    built with CompanyStore.from_sectors + score_store rather than the
+    frozen instance shared by the app.  Returns False when a key falls
+    outside the store's years or companies (e.g. a new financial year or
+    a new listing), in which case the store should be rebuilt.  A
+    SectorCube passed as `cube` is adjusted for the touched companies, and
+    a RankingBook passed as `rankings` re-ranks them and raises any
+    threshold alerts.
+    """
+    stats = ingestor.year_stats(keys)
+    codes = stats.index.get_level_values('code')
+    years = stats.index.get_level_values('year')
+    try:
+        rows = np.array([store.row(ingestor.company_key(code)) for code in codes], dtype=np.intp)
+        cols = np.array([store.years.index(year) for year in years], dtype=np.intp)
+    except (KeyError, ValueError):
+        return False
+
+    # A year without returns keeps NaN stats, as in from_sectors; moments a
+    # traded year has too few days for are 0, as to_sectors_data reports them
+    values = stats[list(STAT_FIELDS)].to_numpy(copy=True)
+    observed = ~np.isnan(values[:, 0])
+    values[observed] = np.nan_to_num(values[observed], nan=0.0)
+    store.stats[rows, cols] = values
+    store.prices[rows, cols] = stats['close'].round(2).to_numpy()
+    latest = cols == len(store.years) - 1
+    table = store.table
+
+    # volume is the mean daily volume of the company's last traded year
+    traded = store.prices[rows].shape[1] - 1 - np.argmax(~np.isnan(store.prices[rows][:, ::-1]), axis=1)
+    last = cols == traded
+    volume = np.trunc(stats['volume'].to_numpy()[last])
+    table.iloc[rows[last], table.columns.get_loc('volume')] = np.where(np.isfinite(volume), volume, 0.0)
+    stats = latest_stats(store.stats[rows])
+    for k, field in enumerate(STAT_FIELDS):
+        table.iloc[rows, table.columns.get_loc(field)] = stats[:, k]
+    table.iloc[rows[latest], table.columns.get_loc('current_price')] = store.prices[rows[latest], -1]
+
+    # expected_return is first-to-last traded annual close, as in to_sectors_data
+    prices = np.round(store.prices[rows].astype(np.float64), 2)
+    first = prices[np.arange(len(rows)), np.argmax(~np.isnan(prices), axis=1)]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = np.where(first > 0, forward_fill(prices)[:, -1] / first - 1, 0.0)
+    table.iloc[rows, table.columns.get_loc('expected_return')] = expected
+
+    scores = score_batch(table.iloc[rows])
+    table.iloc[rows, table.columns.get_loc('psr_score')] = scores['total_score']
+    for key in ('rps', 'rvs', 'sds'):
+        table.iloc[rows, table.columns.get_loc(key)] = scores[key]
+    labels = risk_profile_labels(scores['total_score'])
+    table.iloc[rows, table.columns.get_loc('risk_profile')] = labels.to_numpy()
+    if cube is not None:
+        cube.update(rows, store)
+    if rankings is not None:
+        rankings.update(rows, store)
+    store.version = None
+    return True
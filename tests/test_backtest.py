@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from pennystock.backtest import PointInTimePanel, backtest, bucket_returns, sweep, weight_grid
+from pennystock.store import CompanyStore
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe, score_store
+
+def test_top_n_book_matches_a_per_year_loop():
+    panel = PointInTimePanel(build_universe(synthetic_universe(300, seed=9)))
+    result = backtest(panel, top_n=5)
+    checked = 0
+    for t in range(len(panel.years) - 1):
+        eligible = np.flatnonzero(panel.eligible[t])
+        assert np.isclose(result.benchmark[t], panel.forward[t, eligible].mean())
+        order = eligible[np.argsort(-panel.total[t, eligible], kind='stable')]
+        if panel.total[t, order[4]] == panel.total[t, order[5]]:
+            # A tie at the cut-off makes the held set ambiguous
+            continue
+        assert np.isclose(result.returns[0, t], panel.forward[t, order[:5]].mean())
+        checked += 1
+    assert checked
+    assert result.turnover[0, 0] == 1.0
+    summary = result.summary().iloc[0]
+    assert np.isclose(summary['total_return'], np.prod(1 + result.returns[0]) - 1)
+
+def test_sweep_matches_single_backtests():
+    panel = PointInTimePanel(build_universe(synthetic_universe(300, seed=9)))
+    grid = weight_grid(1.0)
+    swept = sweep(panel, grid, top_n=5, chunk_size=7)
+    assert len(swept) == len(grid)
+    assert swept['cagr'].is_monotonic_decreasing
+    for _, row in swept.iterrows():
+        weights = row[['w_rps', 'w_rvs', 'w_sds']].to_numpy(np.float64)
+        assert np.isclose(row['cagr'], backtest(panel, weights, top_n=5).summary()['cagr'].iat[0])
+    default = swept[(swept[['w_rps', 'w_rvs', 'w_sds']] == 1).all(axis=1)]
+    assert np.isclose(default['cagr'].iat[0], backtest(panel, top_n=5).summary()['cagr'].iat[0])
+
+def test_a_single_year_store_is_rejected():
+    stats = np.zeros((3, 1, 4))
+    stats[:, 0, 1] = 0.1
+    store = score_store(CompanyStore.from_arrays(['A', 'B', 'C'], ['X'] * 3, [[1.0], [2.0], [3.0]], stats,
+                                                 ['2022-23'], expected_return=np.zeros(3)))
+    with pytest.raises(ValueError, match='two financial years'):
+        backtest(PointInTimePanel(store))
+
+def test_bucket_returns_put_nan_scores_in_the_last_bucket():
+    panel = PointInTimePanel(build_universe(synthetic_universe(300, seed=9)))
+    panel.total = panel.total.copy()
+    panel.total[0, panel.eligible[0]] = np.nan
+    first = bucket_returns(panel).query('year == @panel.years[0]')
+    assert first['companies'].iat[-1] == panel.eligible[0].sum()
+    assert first['companies'].iloc[:-1].sum() == 0
@@ -0,0 +1,66 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pennystock.backtest import PointInTimePanel, sweep, weight_grid
+from pennystock.cli import main
+from pennystock.export import universe_chunks
+from pennystock.rules import SPEC_DIR
+from pennystock.scoring import SCORE_COLUMNS, risk_profiles, score_batch
+from pennystock.snapshot import load_snapshot, write_snapshot
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+@pytest.fixture(scope='module')
+def store():
+    return build_universe(synthetic_universe(200, seed=4))
+
+@pytest.fixture
+def universe_csv(store, tmp_path):
+    path = str(tmp_path / 'universe.csv')
+    store.table[['company', 'sector', *SCORE_COLUMNS]].to_csv(path, index=False)
+    return path
+
+def test_score_writes_psr_scores_and_profiles(universe_csv, tmp_path, capsys):
+    output = str(tmp_path / 'scores.csv')
+    assert main(['score', '--input', universe_csv, '--output', output, '--workers', '1']) == 0
+    assert 'Scored 200 companies' in capsys.readouterr().out
+    result = pd.read_csv(output)
+    expected = score_batch(pd.read_csv(universe_csv))
+    np.testing.assert_array_equal(result['psr_score'], expected['total_score'])
+    for component in ('rps', 'rvs', 'sds'):
+        np.testing.assert_array_equal(result[component], expected[component])
+    assert result['risk_profile'].tolist() == risk_profiles(expected['total_score'])['profile'].tolist()
+
+def test_score_with_the_psr_spec_matches_the_builtin_score(universe_csv, tmp_path):
+    builtin, spec = str(tmp_path / 'builtin.csv'), str(tmp_path / 'spec.csv')
+    main(['score', '--input', universe_csv, '--output', builtin, '--workers', '1'])
+    main(['score', '--input', universe_csv, '--output', spec, '--workers', '1',
+          '--spec', f'{SPEC_DIR}/psr.yaml'])
+    pd.testing.assert_frame_equal(pd.read_csv(spec)[['company', 'psr_score', 'risk_profile']],
+                                  pd.read_csv(builtin)[['company', 'psr_score', 'risk_profile']])
+
+def test_backtest_sweep_matches_the_library(store, tmp_path):
+    snapshot = write_snapshot(store, str(tmp_path / 'universe.arrow'))
+    output = str(tmp_path / 'sweep.parquet')
+    main(['backtest', '--input', snapshot, '--output', output, '--sweep', '1', '--top-n', '5', '--workers', '1'])
+    expected = sweep(PointInTimePanel(load_snapshot(snapshot)), weight_grid(1.0), top_n=5)
+    pd.testing.assert_frame_equal(pd.read_parquet(output), expected)
+
+def test_export_writes_the_scored_universe(store, tmp_path):
+    snapshot = write_snapshot(store, str(tmp_path / 'universe.arrow'))
+    output = str(tmp_path / 'universe_export.csv')
+    main(['export', '--input', snapshot, '--output', output, '--per-year', '--chunk-size', '64'])
+    expected = pd.concat(universe_chunks(load_snapshot(snapshot), per_year=True), ignore_index=True)
+    with open(output, encoding='utf-8') as handle:
+        assert handle.read() == expected.to_csv(index=False)
+
+def test_cli_import_defers_optional_modules():
+    deferred = ['pennystock.snapshot', 'pennystock.export', 'pennystock.quotes', 'pennystock.rules']
+    code = f"import sys, pennystock.cli; print([m for m in {deferred!r} if m in sys.modules])"
+    assert subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                          cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip() == '[]'
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from pennystock.cube import PERCENTILES, SECTOR_FIELDS, SectorCube
+from pennystock.store import CompanyStore
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import score_store
+
+def universe(n=1_500, seed=6):
+    return score_store(CompanyStore.from_sectors(synthetic_universe(n, seed=seed)))
+
+def expected_sector_frame(store):
+    table = store.table.assign(sector=store.table['sector'].astype(str))
+    groups = table.groupby('sector', sort=False)
+    frame = groups.size().rename('companies').to_frame()
+    for field in SECTOR_FIELDS:
+        frame[f'mean_{field}'] = groups[field].mean()
+    for field in ('psr_score', 'expected_return'):
+        for q in PERCENTILES:
+            frame[f'median_{field}' if q == 50 else f'p{q}_{field}'] = groups[field].quantile(q / 100)
+    return frame
+
+def check_cube(cube, store):
+    actual = cube.sector_frame().set_index('sector')
+    expected = expected_sector_frame(store).loc[actual.index]
+    assert sorted(actual.index) == sorted(expected.index)
+    pd.testing.assert_frame_equal(actual, expected[actual.columns], check_dtype=False, check_names=False)
+
+    prices = pd.DataFrame(np.asarray(store.prices, dtype=np.float64), columns=store.years)
+    by_year = prices.groupby(store.table['sector'].astype(str).to_numpy()).mean()
+    pd.testing.assert_frame_equal(cube.year_frame('price'), by_year.loc[cube.year_frame('price').index],
+                                  check_names=False)
+
+def test_cube_matches_groupby():
+    store = universe()
+    check_cube(SectorCube(store), store)
+
+def test_cube_updates_match_a_rebuild():
+    store = universe()
+    cube = SectorCube(store)
+    cube.sector_frame()
+    rng = np.random.default_rng(0)
+    table = store.table
+    rows = rng.choice(len(table), 100, replace=False)
+    table.iloc[rows, table.columns.get_loc('psr_score')] = np.round(rng.uniform(0, 100, len(rows)), 1)
+    store.prices[rows, -1] = rng.uniform(1, 50, len(rows))
+    cube.update(rows, store)
+    check_cube(cube, store)
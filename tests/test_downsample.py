@@ -0,0 +1,9 @@
+import numpy as np
+
+from pennystock.downsample import lttb
+
+def test_lttb_keeps_endpoints_and_threshold():
+    prices = 20 * np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.02, 50_000)))
+    keep = lttb(prices, 2_000)
+    assert keep[0] == 0 and keep[-1] == len(prices) - 1 and len(keep) == 2_000
+    assert np.all(np.diff(keep) > 0)
@@ -0,0 +1,79 @@
+import io
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from pennystock.export import ExportCache, universe_chunks, write_csv, write_parquet, write_xlsx
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+@pytest.fixture(scope='module')
+def store():
+    return build_universe(synthetic_universe(120, seed=12))
+
+def whole(store, per_year=True):
+    return pd.concat(universe_chunks(store, per_year=per_year), ignore_index=True)
+
+def written(writer, chunks, **options):
+    sink = io.BytesIO()
+    writer(chunks, sink, **options)
+    sink.seek(0)
+    return sink
+
+def test_chunks_cover_the_universe_in_order(store):
+    chunks = list(universe_chunks(store, per_year=True, chunk_size=37))
+    assert [len(chunk) for chunk in chunks] == [37, 37, 37, 9]
+    assert whole(store)['company'].tolist() == store.table['company'].astype(str).tolist()
+    empty = list(universe_chunks(store, rows=[], per_year=True))
+    assert len(empty) == 1 and empty[0].empty and list(empty[0].columns) == list(chunks[0].columns)
+
+def test_chunked_csv_matches_to_csv(store):
+    expected = whole(store).to_csv(index=False)
+    assert written(write_csv, universe_chunks(store, per_year=True, chunk_size=37)).read().decode() == expected
+
+def test_chunked_parquet_matches_to_parquet(store):
+    reference = io.BytesIO()
+    whole(store).to_parquet(reference, index=False)
+    reference.seek(0)
+    actual = pd.read_parquet(written(write_parquet, universe_chunks(store, per_year=True, chunk_size=37)))
+    pd.testing.assert_frame_equal(actual, pd.read_parquet(reference))
+
+def test_chunked_xlsx_matches_to_excel(store):
+    pytest.importorskip('openpyxl')
+    reference = io.BytesIO()
+    whole(store).to_excel(reference, index=False, sheet_name='Export')
+    reference.seek(0)
+    actual = pd.read_excel(written(write_xlsx, universe_chunks(store, per_year=True, chunk_size=37)))
+    pd.testing.assert_frame_equal(actual, pd.read_excel(reference))
+
+def test_cache_reuses_stored_exports_and_evicts_old_ones(store, tmp_path):
+    cache = ExportCache(str(tmp_path), max_files=2)
+    calls = []
+
+    def chunks():
+        calls.append(1)
+        return universe_chunks(store, chunk_size=37)
+
+    first = cache.get('a', 'csv', chunks)
+    assert cache.get('a', 'csv', chunks) == first and len(calls) == 1
+    with open(first, encoding='utf-8') as handle:
+        assert handle.read() == whole(store, per_year=False).to_csv(index=False)
+
+    for key in ('b', 'c'):
+        time.sleep(0.01)
+        cache.get(key, 'csv', chunks)
+    assert not os.path.exists(first)
+    assert sorted(os.listdir(tmp_path)) == ['b.csv', 'c.csv']
+
+def test_a_failed_export_leaves_nothing_behind(store, tmp_path):
+    cache = ExportCache(str(tmp_path))
+
+    def broken():
+        yield next(universe_chunks(store))
+        raise RuntimeError("source failed")
+
+    with pytest.raises(RuntimeError):
+        cache.get('broken', 'csv', broken)
+    assert os.listdir(tmp_path) == []
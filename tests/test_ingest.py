@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from pennystock.ingest import BhavcopyIngestor
+from pennystock.parallel import build_store_from_closes, close_matrix
+from pennystock.universe import build_universe
+
+def daily_bars(seed=0):
+    """Normalized bhavcopy rows for three financial years; DELIST stops trading after the second"""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2020-04-01', '2023-03-31')
+    frames = []
+    for code in ('ALPHA', 'BETA', 'DELIST'):
+        days = dates[dates < '2022-04-01'] if code == 'DELIST' else dates
+        days = days[rng.random(len(days)) < 0.8]
+        closes = np.round(10 * np.exp(np.cumsum(rng.normal(0, 0.02, len(days)))), 2)
+        frames.append(pd.DataFrame({'code': code, 'name': code, 'close': closes,
+                                    'volume': rng.integers(100, 10_000, len(days)).astype(float),
+                                    'date': days}))
+    return pd.concat(frames, ignore_index=True)
+
+def test_ingest_matches_parallel_store_for_delisted_scrip():
+    bars = daily_bars()
+    ingestor = BhavcopyIngestor()
+    ingestor.add(bars)
+    ingested = build_universe(ingestor.to_sectors_data())
+
+    codes, dates, closes = close_matrix(bars)
+    parallel = build_store_from_closes(list(codes), ['Unclassified'] * len(codes), closes, dates, workers=1)
+
+    assert ingested.years == parallel.years
+    for code in codes:
+        i, j = ingested.row(code), parallel.row(code)
+        np.testing.assert_array_equal(ingested.prices[i], parallel.prices[j])
+        np.testing.assert_allclose(ingested.stats[i], parallel.stats[j], equal_nan=True)
+        for column in ('expected_return', 'sd', 'psr_score'):
+            assert np.isclose(ingested.table[column].iat[i], parallel.table[column].iat[j]), (code, column)
+
+    delisted = ingested.prices[ingested.row('DELIST')]
+    assert not np.isnan(delisted[:2]).any() and np.isnan(delisted[2])
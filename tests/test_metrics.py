@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from pennystock.metrics import WINDOWS, StatsEngine, daily_returns, max_drawdown, window_moments
+
+def daily_closes(n=20, days=600, seed=0):
+    rng = np.random.default_rng(seed)
+    closes = 10 * np.exp(np.cumsum(rng.normal(0, 0.03, (n, days)), axis=1))
+    closes[rng.random(closes.shape) < 0.2] = np.nan
+    index = 1_000 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+    return closes, index, pd.bdate_range('2021-04-01', periods=days)
+
+def test_window_moments_match_pandas():
+    closes, _, _ = daily_closes()
+    returns = daily_returns(closes)
+    moments = window_moments(returns, 63)
+    for row, series in enumerate(returns):
+        window = pd.Series(series[-63:])
+        assert np.isclose(moments['mean'][row], window.mean())
+        assert np.isclose(moments['sd'][row], window.std())
+        assert np.isclose(moments['skewness'][row], window.skew())
+        assert np.isclose(moments['kurtosis'][row], window.kurt())
+
+def test_rolling_matches_pandas_rolling():
+    closes, index, dates = daily_closes()
+    engine = StatsEngine(closes, dates, index=index)
+    rolling = engine.rolling(3, '3M')
+    returns = pd.Series(engine.returns[3])
+    expected = returns.rolling(WINDOWS['3M'], min_periods=2).std() * np.sqrt(WINDOWS['1Y'])
+    np.testing.assert_allclose(rolling['volatility'].to_numpy(), expected.to_numpy(), equal_nan=True)
+
+    market = pd.Series(engine.index_returns)
+    beta = returns.rolling(WINDOWS['3M'], min_periods=2).cov(market) / market.where(
+        returns.notna()).rolling(WINDOWS['3M'], min_periods=2).var()
+    np.testing.assert_allclose(rolling['beta'].to_numpy()[100:], beta.to_numpy()[100:], equal_nan=True)
+
+def test_max_drawdown_matches_a_running_peak():
+    closes, _, _ = daily_closes()
+    filled = pd.DataFrame(closes).T.ffill()
+    expected = (filled / filled.cummax() - 1).min().fillna(0.0).to_numpy()
+    np.testing.assert_allclose(max_drawdown(closes), expected)
@@ -0,0 +1,15 @@
+import numpy as np
+import pandas as pd
+
+from pennystock.ingest import financial_year
+from pennystock.parallel import year_moments
+
+def test_sharded_year_moments_match_one_worker():
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range('2019-04-01', periods=750)
+    closes = 10 * np.exp(np.cumsum(rng.normal(0, 0.03, (200, len(dates))), axis=1))
+    closes[rng.random(closes.shape) < 0.05] = np.nan
+    years, single = year_moments(closes, financial_year(dates), workers=1)
+    sharded_years, sharded = year_moments(closes, financial_year(dates), workers=3)
+    assert list(years) == list(sharded_years)
+    np.testing.assert_allclose(sharded, single, equal_nan=True)
@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from pennystock.persistence import UserDataStore
+
+@pytest.fixture
+def data(tmp_path):
+    store = UserDataStore(tmp_path / 'users.db')
+    yield store
+    store.close()
+
+def test_database_runs_in_wal_mode_and_survives_reopening(tmp_path, data):
+    with data._connection() as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    data.add_lot('alice', 'ACME', 'Tech', 10, 2.5, '2024-01-02')
+    data.add_to_watchlist('alice', [('BETA', 'Pharma', '2024-01-03')])
+    data.close()
+
+    reopened = UserDataStore(tmp_path / 'users.db')
+    try:
+        lots = reopened.load_lots('alice')
+        assert lots[['company', 'quantity', 'buy_price', 'date_added']].values.tolist() == [
+            ['ACME', 10.0, 2.5, '2024-01-02']]
+        assert reopened.load_watchlist('alice')['company'].tolist() == ['BETA']
+    finally:
+        reopened.close()
+
+def test_watchlist_ignores_duplicates_but_lots_accumulate(data):
+    assert data.add_to_watchlist('alice', [('ACME', 'Tech'), ('BETA', 'Pharma'), ('ACME', 'Tech')]) == 2
+    assert data.add_to_watchlist('alice', [('ACME', 'Tech')]) == 0
+    assert data.add_to_watchlist('bob', [('ACME', 'Tech')]) == 1
+    assert data.in_watchlist('alice', 'BETA')
+    data.remove_from_watchlist('alice', ['BETA'])
+    assert data.load_watchlist('alice')['company'].tolist() == ['ACME']
+
+    first, second = data.add_lots('alice', [('ACME', 'Tech', 5, 1.0), ('ACME', 'Tech', 5, 1.2)])
+    assert second > first
+    assert data.load_lots('alice', 'ACME')['id'].tolist() == [first, second]
+
+def test_close_lots_only_closes_the_users_own_lots(data):
+    mine = data.add_lots('alice', [('ACME', 'Tech', 5, 1.0), ('BETA', 'Pharma', 3, 2.0)])
+    theirs = data.add_lot('bob', 'ACME', 'Tech', 7, 1.1)
+    data.close_lots('alice', [mine[0], theirs])
+    assert data.load_lots('alice')['id'].tolist() == [mine[1]]
+    assert data.load_lots('bob')['id'].tolist() == [theirs]
+
+def test_a_failed_transaction_rolls_back(data):
+    with pytest.raises(RuntimeError):
+        with data._transaction() as connection:
+            connection.execute("INSERT INTO lots (user, company, sector, quantity, buy_price, date_added) "
+                               "VALUES ('alice', 'ACME', 'Tech', 1, 1, '2024-01-02')")
+            raise RuntimeError("abort")
+    assert data.load_lots('alice').empty
+
+def test_concurrent_writers_do_not_lose_rows(data):
+    errors = []
+
+    def write(user):
+        try:
+            for i in range(50):
+                data.add_lots(user, [(f'C{i}', 'Tech', 1, 1.0), (f'C{i}', 'Tech', 2, 1.5)])
+                data.add_to_watchlist(user, [(f'C{i % 10}', 'Tech')])
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=write, args=(user,)) for user in ('alice', 'bob')]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    ids = []
+    for user in ('alice', 'bob'):
+        lots = data.load_lots(user)
+        assert len(lots) == 100
+        assert len(data.load_watchlist(user)) == 10
+        ids += lots['id'].tolist()
+    assert len(set(ids)) == 200
+
+def test_readers_are_not_blocked_by_an_open_write(data):
+    data.add_lot('alice', 'ACME', 'Tech', 1, 1.0)
+    with data._transaction() as connection:
+        connection.execute("UPDATE lots SET quantity = 99")
+        # Another pooled connection still reads the last committed state
+        assert data.load_lots('alice')['quantity'].tolist() == [1.0]
+    assert data.load_lots('alice')['quantity'].tolist() == [99.0]
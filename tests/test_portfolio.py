@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from pennystock.portfolio import PortfolioBook
+from pennystock.quotes import QuoteSnapshot
+from pennystock.store import CompanyStore
+
+def small_store(companies, sectors, prices, version):
+    prices = np.column_stack([np.ones(len(prices)), prices])
+    store = CompanyStore.from_arrays(companies, sectors, prices, np.zeros((len(companies), 2, 4)),
+                                     ['2021-22', '2022-23'])
+    store.version = version
+    return store
+
+def test_positions_pnl_and_weights():
+    book = PortfolioBook(small_store(['A', 'B', 'C'], ['Tech', 'Tech', 'Bank'], [10.0, 20.0, 5.0], 'v1'))
+    book.add('A', 10, 8.0, date='2024-01-02')
+    book.add('B', 5, 25.0)
+    book.add('C', 100, 4.0)
+    second = book.add('A', 10, 12.0)
+    assert len(book) == 4
+    np.testing.assert_array_equal(book.quantity, [20, 5, 100])
+    assert book.total_cost == 725.0 and book.market_value == 800.0 and book.unrealized_pnl == 75.0
+    pd.testing.assert_series_equal(book.weights(), pd.Series([0.25, 0.125, 0.625], index=['A', 'B', 'C']))
+    assert book.sector_exposure().to_dict() == {'Tech': 300.0, 'Bank': 500.0}
+
+    book.remove(second)
+    assert len(book) == 3 and book.total_cost == 605.0 and book.market_value == 700.0
+    lots = book.lots_frame()
+    assert lots['unrealized_pnl'].tolist() == [20.0, -25.0, 100.0]
+    assert lots['date_added'].iat[0] == '2024-01-02'
+
+def test_mark_with_live_quotes():
+    store = small_store(['A', 'B', 'C'], ['Tech', 'Tech', 'Bank'], [10.0, 20.0, 5.0], 'v1')
+    book = PortfolioBook(store)
+    for company, quantity in (('A', 10), ('B', 5), ('C', 100)):
+        book.add(company, quantity, 1.0)
+    quotes = QuoteSnapshot(np.array([11.0, np.nan, 6.0]), np.array([1.0, 0.0, 1.0]))
+    # B has no quote, so it keeps its last close
+    book.mark(quotes.merged(store.table['current_price'].to_numpy(np.float64)))
+    np.testing.assert_array_equal(book.value, [110.0, 100.0, 600.0])
+    assert book.market_value == 810.0 and book.unrealized_pnl == 695.0
+    assert book.sector_exposure().to_dict() == {'Tech': 210.0, 'Bank': 600.0}
+
+def test_bind_carries_lots_to_a_new_store_version():
+    book = PortfolioBook(small_store(['A', 'B', 'C'], ['Tech', 'Tech', 'Bank'], [10.0, 20.0, 5.0], 'v1'))
+    book.add('A', 10, 8.0)
+    book.add('B', 5, 25.0)
+    book.add('C', 100, 4.0)
+
+    # Rows reordered, B delisted and D listed
+    book.bind(small_store(['C', 'A', 'D'], ['Bank', 'Tech', 'Pharma'], [7.0, 9.0, 3.0], 'v2'))
+    assert book.version == 'v2' and len(book) == 2
+    np.testing.assert_array_equal(book.quantity, [100, 10, 0])
+    assert book.total_cost == 480.0 and book.market_value == 790.0
+    assert sorted(book.lots_frame()['company']) == ['A', 'C']
+    assert book.sector_exposure().to_dict() == {'Bank': 700.0, 'Tech': 90.0}
+
+    book.add('D', 10, 2.0)
+    assert book.weights().to_dict() == {'C': 700 / 820, 'A': 90 / 820, 'D': 30 / 820}
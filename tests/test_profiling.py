@@ -0,0 +1,30 @@
+import math
+import tracemalloc
+
+from pennystock.profiling import RenderProfiler
+
+def profiled_run(profiler):
+    profiler.begin('page')
+    with profiler.span('outer'):
+        with profiler.span('inner'):
+            block = bytearray(1 << 20)
+        del block
+    return profiler.finish()
+
+def test_enabling_without_memory_does_not_trace_the_process():
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+    run = profiled_run(RenderProfiler(enabled=True))
+    assert not tracemalloc.is_tracing()
+    assert [span['depth'] for span in run['spans']] == [0, 1]
+    assert all(math.isnan(span['peak_kb']) for span in run['spans'])
+
+def test_memory_profiling_measures_span_peaks():
+    profiler = RenderProfiler(enabled=True, memory=True)
+    try:
+        run = profiled_run(profiler)
+    finally:
+        tracemalloc.stop()
+    outer, inner = run['spans']
+    assert inner['peak_kb'] >= 1024 and outer['peak_kb'] >= inner['peak_kb']
+    assert [outer['depth'], inner['depth']] == [0, 1]
@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from pennystock.quotes import HTTPFeed, MockQuoteServer, QuoteRefresher
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+@pytest.fixture(scope='module')
+def store():
+    return build_universe(synthetic_universe(50, seed=11))
+
+@pytest.fixture
+def server(store):
+    prices = dict(zip(store.table['company'].astype(str), store.table['current_price'].astype(float)))
+    server = MockQuoteServer(prices, seed=0).start()
+    yield server
+    server.stop()
+
+def test_failing_batches_are_retried_with_backoff_then_counted(store, server):
+    server.failure_rate = 1.0
+    refresher = QuoteRefresher(store, HTTPFeed(server.url), batch_size=20, retries=2, backoff=0.05)
+    start = time.perf_counter()
+    snapshot = asyncio.run(refresher.refresh())
+    elapsed = time.perf_counter() - start
+    refresher.stop()
+
+    batches = 3
+    assert server.requests == batches * (refresher.retries + 1)
+    assert snapshot.failed_batches == batches and snapshot.quoted == 0
+    # Two backoffs of at least half of 0.05 s and 0.1 s
+    assert elapsed >= 0.5 * (0.05 + 0.1)
+    assert '503' in refresher.last_error
+
+def test_refresh_publishes_a_new_snapshot_and_keeps_failed_rows(store, server):
+    refresher = QuoteRefresher(store, HTTPFeed(server.url), batch_size=20, retries=0)
+    first = asyncio.run(refresher.refresh())
+    assert first.version == 1 and first.quoted == len(store) and first.failed_batches == 0
+    prices = first.prices.copy()
+
+    second = asyncio.run(refresher.refresh())
+    assert second is refresher.snapshot and second.version == 2
+    np.testing.assert_array_equal(first.prices, prices)
+    assert not first.prices.flags.writeable and not second.prices.flags.writeable
+    assert not np.array_equal(second.prices, first.prices)
+
+    server.failure_rate = 1.0
+    third = asyncio.run(refresher.refresh())
+    refresher.stop()
+    assert third.version == 3 and third.failed_batches == 3
+    np.testing.assert_array_equal(third.prices, second.prices)
+    np.testing.assert_array_equal(third.updated, second.updated)
+
+def test_stop_returns_promptly_and_closes_the_feed(store, server):
+    feed = HTTPFeed(server.url)
+    refresher = QuoteRefresher(store, feed, interval=60.0).start()
+    deadline = time.monotonic() + 10
+    while refresher.snapshot.version == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert refresher.snapshot.version == 1
+
+    start = time.perf_counter()
+    refresher.stop()
+    refresher._thread.join(5)
+    assert not refresher._thread.is_alive()
+    assert time.perf_counter() - start < 1.0
+    with pytest.raises(RuntimeError):
+        asyncio.run(feed.fetch(['anything']))
+
+def test_stop_before_start_closes_the_feed(store, server):
+    feed = HTTPFeed(server.url)
+    QuoteRefresher(store, feed).stop()
+    with pytest.raises(RuntimeError):
+        asyncio.run(feed.fetch(['anything']))
@@ -0,0 +1,23 @@
+import numpy as np
+
+from pennystock.rankings import RankingBook
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+def test_rankings_match_a_rescan_after_updates():
+    store = build_universe(synthetic_universe(2_000, seed=4))
+    table = store.table
+    book = RankingBook(store)
+    rng = np.random.default_rng(0)
+    column = table.columns.get_loc('psr_score')
+    for _ in range(20):
+        rows = rng.choice(len(table), 50, replace=False)
+        table.iloc[rows, column] = np.round(rng.uniform(0, 100, len(rows)), 1)
+        book.update(rows)
+
+    scores = table['psr_score'].reset_index(drop=True)
+    returns = table['expected_return'].reset_index(drop=True)
+    assert list(book.top('top_rated', 10)) == list(scores.nlargest(10).index)
+    assert list(book.top('top_opportunities', 10)) == list(returns.nlargest(10).index)
+    assert list(book.top('safest', 3)) == list(scores[scores >= 75].nlargest(3).index)
+    assert list(book.top('high_risk', 3)) == list(scores[scores < 40].nsmallest(3).index)
@@ -0,0 +1,24 @@
+import numpy as np
+
+from pennystock.risk import RiskModel
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+def dense_volatility(model, values):
+    held = np.flatnonzero(values)
+    v = values[held]
+    return np.sqrt(v @ np.cov(model.returns(held)) @ v) / v.sum()
+
+def test_tracked_volatility_matches_the_dense_covariance():
+    store = build_universe(synthetic_universe(2_000, seed=1))
+    model = RiskModel(store)
+    rng = np.random.default_rng(0)
+    values = np.zeros(len(store))
+    values[rng.choice(len(store), 200, replace=False)] = rng.uniform(1e3, 1e5, 200)
+    state = model.track(values)
+    assert np.isclose(state.volatility, dense_volatility(model, values))
+
+    row = int(rng.choice(np.flatnonzero(values)))
+    state.shift(row, 5_000.0)
+    values[row] += 5_000.0
+    assert np.isclose(state.volatility, dense_volatility(model, values))
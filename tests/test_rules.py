@@ -0,0 +1,31 @@
+import os
+
+import numpy as np
+import pytest
+
+from pennystock.rules import SPEC_DIR, ScoringPlan, compile_spec
+from pennystock.scoring import risk_profile_labels, score_batch, universe_table
+from pennystock.synthetic import synthetic_universe
+
+from test_scoring import blank_some_inputs
+
+def plan(expression):
+    return ScoringPlan({'name': 'test', 'terms': {'total_score': expression}})
+
+@pytest.mark.parametrize('expression', ['9**9**9', '2**sd', 'sd**9', 'sd**(sd - 1)'])
+def test_rejects_large_or_variable_exponents(expression):
+    with pytest.raises(ValueError, match='exponents'):
+        plan(expression)
+
+@pytest.mark.parametrize('expression', ['sd**2', 'sd**-0.5', '(sd + 1)**3'])
+def test_accepts_small_constant_exponents(expression):
+    plan(expression)
+
+def test_psr_spec_matches_score_batch_with_blank_inputs():
+    table = universe_table(blank_some_inputs(synthetic_universe(2_000, seed=3)))
+    plan = compile_spec(os.path.join(SPEC_DIR, 'psr.yaml'))
+    expected, actual = score_batch(table), plan.evaluate(table)
+    for key in ('total_score', 'rps', 'rvs', 'sds'):
+        np.testing.assert_array_equal(actual[key], expected[key])
+    scores = np.append(expected['total_score'], np.nan)
+    np.testing.assert_array_equal(plan.risk_labels(scores), risk_profile_labels(scores).to_numpy())
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from pennystock.scoring import calculate_psr_score, get_risk_profile, risk_profile_labels, score_batch, universe_table
+from pennystock.synthetic import synthetic_universe
+
+def blank_some_inputs(sectors_data, seed=0):
+    # Blank stats and returns, as a CSV with empty cells hands them to the CLI
+    rng = np.random.default_rng(seed)
+    for sector_data in sectors_data.values():
+        for company_data in sector_data['companies'].values():
+            latest = company_data['stats'][max(company_data['stats'])]
+            for field in ('mean', 'sd', 'skewness', 'kurtosis'):
+                if rng.random() < 0.2:
+                    latest[field] = np.nan
+            if rng.random() < 0.2:
+                company_data['expected_return'] = np.nan
+    return sectors_data
+
+@pytest.mark.parametrize('blanks', [False, True])
+def test_score_batch_matches_calculate_psr_score(blanks):
+    sectors_data = synthetic_universe(2_000, seed=3)
+    if blanks:
+        blank_some_inputs(sectors_data)
+    companies = [company_data for sector_data in sectors_data.values()
+                 for company_data in sector_data['companies'].values()]
+    expected = [calculate_psr_score(company_data) for company_data in companies]
+    batch = score_batch(universe_table(sectors_data))
+
+    np.testing.assert_array_equal(batch['total_score'], [score['total_score'] for score in expected])
+    for key in ('rps', 'rvs', 'sds'):
+        np.testing.assert_array_equal(batch[key], [score['components'][key] for score in expected])
+
+def test_risk_profile_labels_match_get_risk_profile():
+    scores = np.append(np.round(np.linspace(0, 100, 1_001), 1), np.nan)
+    expected = [f"{symbol} {profile}" for profile, symbol, _, _ in map(get_risk_profile, scores)]
+    assert list(risk_profile_labels(scores)) == expected
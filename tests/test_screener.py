@@ -0,0 +1,32 @@
+import numpy as np
+
+from pennystock.screener import Screener
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+def naive_query(store, filters):
+    table = store.table
+    rows = []
+    for sector in filters['sectors']:
+        for i in store.sector_rows(sector):
+            market_cap = table['market_cap'].iat[i]
+            if (table['psr_score'].iat[i] >= filters['min_psr'] and
+                    table['expected_return'].iat[i] >= filters['min_return'] and
+                    table['sd'].iat[i] <= filters['max_volatility'] and
+                    (0 if np.isnan(market_cap) else market_cap) >= filters['market_cap_min'] and
+                    (filters['risk_filter'] == "All" or
+                     table['risk_profile'].iat[i].split(' ', 1)[1].startswith(filters['risk_filter']))):
+                rows.append(i)
+    return np.array(rows, dtype=np.intp)
+
+def test_screener_matches_a_row_by_row_filter():
+    store = build_universe(synthetic_universe(3_000, seed=5))
+    screener = Screener(store)
+    rng = np.random.default_rng(0)
+    risks = ["All", "Green", "High", "Balanced", "Speculative", "Avoid"]
+    for _ in range(30):
+        sectors = list(rng.permutation(store.sectors)[:rng.integers(1, len(store.sectors) + 1)])
+        filters = dict(min_psr=int(rng.integers(0, 80)), min_return=int(rng.integers(0, 300)) / 100,
+                       max_volatility=float(rng.uniform(10, 40)), market_cap_min=int(rng.integers(0, 1000)),
+                       sectors=sectors, risk_filter=str(rng.choice(risks)))
+        np.testing.assert_array_equal(screener.query(**filters), naive_query(store, filters))
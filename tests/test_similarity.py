@@ -0,0 +1,13 @@
+import numpy as np
+
+from pennystock.similarity import SimilarityIndex, feature_matrix
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+def test_blocked_top_k_matches_the_full_correlation_matrix():
+    store = build_universe(synthetic_universe(1_000, seed=4))
+    index = SimilarityIndex(store, k=20, block_size=128)
+    features = feature_matrix(store)
+    full = features @ features.T
+    np.fill_diagonal(full, -np.inf)
+    np.testing.assert_allclose(index.scores, np.sort(full, axis=1)[:, ::-1][:, :20], atol=1e-5)
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from pennystock.simulation import simulate, simulation_params
+from pennystock.store import CompanyStore
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+def test_results_do_not_depend_on_workers():
+    store = build_universe(synthetic_universe(200, seed=2))
+    rows = np.arange(20)
+    a = simulate(store, rows, paths=8_000, seed=7, chunk_paths=2_000, workers=1)
+    b = simulate(store, rows, paths=8_000, seed=7, chunk_paths=2_000, workers=2)
+    np.testing.assert_array_equal(a.portfolio_returns, b.portfolio_returns)
+
+def growth_store():
+    # Strong growers with symmetric stats, so the median log growth is the drift
+    prices = np.array([[1.0, 3.0, 9.5, 30.0], [10.0, 12.0, 11.0, 15.0], [5.0, 4.0, 3.5, 3.0]])
+    stats = np.zeros((3, 4, 4))
+    stats[:, :, 0], stats[:, :, 1] = 0.01, 0.05
+    return CompanyStore.from_arrays(['GROW', 'FLAT', 'FALL'], ['A'] * 3, prices, stats,
+                                    ['2019-20', '2020-21', '2021-22', '2022-23'], beta=np.zeros(3))
+
+@pytest.mark.parametrize('path_stats', [False, True])
+def test_median_log_growth_is_the_drift(path_stats):
+    store = growth_store()
+    rows = np.arange(3)
+    params = simulation_params(store, rows)
+    paths, horizon = 20_000, 2.0
+    result = simulate(store, rows, paths=paths, horizon=horizon, steps=50, seed=3, path_stats=path_stats,
+                      keep_terminal=True)
+    median = np.median(np.log1p(result.terminal.astype(np.float64)), axis=0)
+    # Standard error of a normal median is about 1.25 sigma / sqrt(n)
+    tolerance = 4 * 1.25 * params['vol'] * np.sqrt(horizon) / np.sqrt(paths)
+    assert params['drift'][0] > 1
+    np.testing.assert_array_less(np.abs(median - params['drift'] * horizon), tolerance)
@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pennystock.snapshot import load_snapshot, snapshot_version, write_snapshot
+from pennystock.synthetic import synthetic_universe
+from pennystock.universe import build_universe
+
+@pytest.mark.parametrize('suffix', ['.arrow', '.parquet'])
+def test_snapshot_round_trip(tmp_path, suffix):
+    store = build_universe(synthetic_universe(150, seed=8))
+    path = str(tmp_path / f'universe{suffix}')
+    write_snapshot(store, path)
+    loaded = load_snapshot(path)
+
+    pd.testing.assert_frame_equal(loaded.table, store.table.reset_index(drop=True))
+    np.testing.assert_array_equal(loaded.prices, np.asarray(store.prices, dtype=np.float32))
+    np.testing.assert_array_equal(loaded.stats, store.stats)
+    assert loaded.years == store.years
+    assert loaded.version == snapshot_version(path) == store.version
+    assert not loaded.prices.flags.writeable and not loaded.stats.flags.writeable
+
+    # An unversioned store is recorded under a hash of its contents
+    store.version = None
+    write_snapshot(store, path)
+    write_snapshot(store, str(tmp_path / f'again{suffix}'))
+    assert load_snapshot(path).version == snapshot_version(str(tmp_path / f'again{suffix}')) is not None
@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from pennystock.data import create_comprehensive_data
+from pennystock.store import CompanyStore
+from pennystock.synthetic import synthetic_universe
+
+def test_sectors_view_reproduces_sectors_data():
+    sectors_data = create_comprehensive_data()
+    view = CompanyStore.from_sectors(sectors_data).sectors_view()
+    assert list(view) == list(sectors_data)
+    for sector, sector_data in sectors_data.items():
+        assert list(view[sector]['companies']) == list(sector_data['companies'])
+        for company, company_data in sector_data['companies'].items():
+            stored = view[sector]['companies'][company]
+            assert stored['prices'] == company_data['prices']
+            assert stored['stats'] == company_data['stats']
+            for key in ('expected_return', 'beta', 'sharpe_ratio', 'market_cap', 'volume'):
+                assert stored.get(key) == company_data.get(key), (company, key)
+
+def test_sector_rows_follow_the_sector_column():
+    store = CompanyStore.from_sectors(synthetic_universe(500, seed=8))
+    sectors = store.table['sector'].astype(str).to_numpy()
+    for sector in store.sectors:
+        np.testing.assert_array_equal(store.sector_rows(sector), np.flatnonzero(sectors == sector))
+        assert store.companies_in(sector) == list(store.table['company'].astype(str)[sectors == sector])
+
+def test_duplicate_company_names_are_rejected():
+    sectors_data = synthetic_universe(10, seed=8)
+    first, second = list(sectors_data)[:2]
+    name = next(iter(sectors_data[first]['companies']))
+    sectors_data[second]['companies'][name] = sectors_data[first]['companies'][name]
+    with pytest.raises(ValueError, match='unique'):
+        CompanyStore.from_sectors(sectors_data)
@@ -0,0 +1,29 @@
+import numpy as np
+
+from pennystock.ingest import BhavcopyIngestor
+from pennystock.store import CompanyStore
+from pennystock.universe import build_universe, refresh_companies, score_store
+
+from test_ingest import daily_bars
+
+def test_incremental_refresh_matches_full_rebuild():
+    bars = daily_bars(seed=1)
+    cutoff = bars['date'].sort_values().unique()[-10]
+    ingestor = BhavcopyIngestor()
+    ingestor.add(bars[bars['date'] < cutoff])
+    store = score_store(CompanyStore.from_sectors(ingestor.to_sectors_data()))
+    for _, day in bars[bars['date'] >= cutoff].groupby('date'):
+        assert refresh_companies(store, ingestor, ingestor.add_day(day))
+
+    full = BhavcopyIngestor()
+    full.add(bars)
+    rebuilt = build_universe(full.to_sectors_data())
+    assert store.years == rebuilt.years
+    for company in rebuilt.table['company']:
+        i, j = store.row(company), rebuilt.row(company)
+        np.testing.assert_array_equal(store.prices[i], rebuilt.prices[j])
+        np.testing.assert_allclose(store.stats[i], rebuilt.stats[j], equal_nan=True)
+        for column in ('expected_return', 'volume', 'sd', 'current_price', 'psr_score'):
+            assert np.isclose(store.table[column].iat[i], rebuilt.table[column].iat[j], equal_nan=True), (
+                company, column)
+        assert store.table['risk_profile'].iat[i] == rebuilt.table['risk_profile'].iat[j]